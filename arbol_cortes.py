@@ -0,0 +1,158 @@
+"""Arbol de Gomory–Hu (algoritmo de Gusfield) para consultas repetidas de corte minimo.
+
+Caso simetrico: cada arco u→v de capacidad c se toma como una arista no dirigida (u→v y v→u
+con c). Con n−1 resoluciones de flujo maximo se arma un arbol con pesos en el que el flujo
+maximo entre cualquier par es el menor peso del camino que los une, asi que cada consulta
+cuesta O(V) en vez de una resolucion completa. Las n−1 resoluciones se reparten en un pool de
+procesos; cada proceso arma el residual una vez y lo reusa entre pares.
+"""
+import csv
+import os
+from array import array
+
+from motor_flujo import MAX_ENTERO, _enteras, crear_motor
+
+MIN_NODOS_POOL = 200     # por debajo, el arranque del pool cuesta mas que las resoluciones
+
+_motor_proceso = None    # motor de cada proceso del pool (se arma en _iniciar_proceso)
+
+
+def _motor_simetrico(n, us, vs, cs, motor):
+    mo = crear_motor(motor, n, 2*len(us), registro="no")
+    mo.cargar_arreglos(us + vs, vs + us, cs + cs)
+    return mo
+
+
+def _iniciar_proceso(n, us, vs, cs, motor):
+    global _motor_proceso
+    _motor_proceso = _motor_simetrico(n, us, vs, cs, motor)
+
+
+def _resolver_par(s, t, mo=None):
+    """(s, t, valor, lado de s del corte minimo)."""
+    mo = mo or _motor_proceso
+    valor, _, _ = mo.maximo_flujo(s, t)
+    return s, t, valor, mo.lado_fuente()
+
+
+class ArbolGomoryHu:
+    """Arbol de cortes de n nodos: padre[v] < v (la raiz es 0) y peso[v] = corte minimo v–padre[v].
+
+    arcos: iterable de (u, v, capacidad), p. ej. ModeloGrafo.arcos. procesos=None elige segun
+    el tamano (MIN_NODOS_POOL); con 1 todo corre en este proceso.
+    """
+
+    def __init__(self, n, arcos, motor="auto", procesos=None):
+        self.n = n
+        self.padre = array("i", bytes(4*n))
+        self.resoluciones = 0           # incluye las hechas con un padre que luego cambio
+        us = array("i"); vs = array("i"); cs = []
+        for u, v, c in arcos:
+            us.append(u); vs.append(v); cs.append(c)
+        # con capacidades enteras los pesos (cortes, a lo sumo el doble de la suma) quedan en i64 exactos
+        tc = "q" if _enteras(cs) and 2*sum(cs) < MAX_ENTERO else "d"
+        cs = array(tc, map(int, cs) if tc == "q" else cs)
+        self.peso = array(tc, bytes(8*n))
+        if procesos is None:
+            procesos = 1 if n < MIN_NODOS_POOL else (os.cpu_count() or 1)
+        if n > 1:
+            if procesos <= 1:
+                mo = _motor_simetrico(n, us, vs, cs, motor)
+                for s in range(1, n):
+                    self._aplicar(*_resolver_par(s, self.padre[s], mo))
+            else:
+                self._construir_en_pool(us, vs, cs, motor, procesos)
+        self.profundidad = array("i", bytes(4*n))
+        for v in range(1, n):
+            self.profundidad[v] = self.profundidad[self.padre[v]] + 1
+        self._vecinos = None
+
+    @classmethod
+    def desde_modelo(cls, modelo, motor="auto", procesos=None):
+        return cls(len(modelo.nodos), modelo.arcos, motor, procesos)
+
+    def _aplicar(self, s, t, valor, lado):
+        """Paso de Gusfield: fija peso[s] y cuelga de s los nodos posteriores de su lado con el mismo padre."""
+        padre = self.padre
+        self.peso[s] = valor
+        self.resoluciones += 1
+        movidos = [v for v in lado if v > s and padre[v] == t]
+        for v in movidos: padre[v] = s
+        return movidos
+
+    def _construir_en_pool(self, us, vs, cs, motor, procesos):
+        # cada paso s necesita padre[s] final, que solo cambian los pasos anteriores: se resuelven
+        # por adelantado con el padre vigente y se repiten los que quedaron con un padre viejo
+        from concurrent.futures import ProcessPoolExecutor     # solo aqui: importa multiprocessing
+        padre = self.padre; n = self.n
+        adelanto = 2*procesos
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso,
+                                 initargs=(n, us, vs, cs, motor)) as pool:
+            futuros = {}
+            sig = 1
+            for s in range(1, n):
+                while sig < n and sig < s + adelanto:
+                    futuros[sig] = pool.submit(_resolver_par, sig, padre[sig]); sig += 1
+                res = futuros.pop(s).result()
+                while res[1] != padre[s]:
+                    self.resoluciones += 1
+                    res = pool.submit(_resolver_par, s, padre[s]).result()
+                for v in self._aplicar(*res):
+                    if v in futuros:
+                        if not futuros[v].cancel(): self.resoluciones += 1   # ya corrio o esta corriendo
+                        futuros[v] = pool.submit(_resolver_par, v, padre[v])
+
+    # consultas
+    def corte(self, u, v):
+        """Flujo maximo (= corte minimo) entre u y v: menor peso del camino del arbol, O(V)."""
+        padre, peso, prof = self.padre, self.peso, self.profundidad
+        if u == v:
+            return 0
+        minimo = float("inf")
+        while u != v:
+            if prof[u] < prof[v]: u, v = v, u
+            if peso[u] < minimo: minimo = peso[u]
+            u = padre[u]
+        return minimo
+
+    def fila(self, u):
+        """Cortes de u contra todos los nodos (array del tipo de `peso`, 0 en la diagonal) en un recorrido O(V)."""
+        if self._vecinos is None:
+            self._vecinos = [[] for _ in range(self.n)]
+            for v in range(1, self.n):
+                p = self.padre[v]; w = self.peso[v]
+                self._vecinos[v].append((p, w)); self._vecinos[p].append((v, w))
+        res = array(self.peso.typecode, bytes(8*self.n))
+        visto = bytearray(self.n); visto[u] = 1
+        pila = [(u, float("inf"))]
+        while pila:
+            x, m = pila.pop()
+            for y, w in self._vecinos[x]:
+                if not visto[y]:
+                    visto[y] = 1
+                    res[y] = m if m < w else w
+                    pila.append((y, res[y]))
+        return res
+
+    def consultas(self, pares):
+        """Lista de cortes para [(u, v), ...]; los pares que comparten u usan una sola fila."""
+        por_origen = {}
+        for u, v in pares:
+            por_origen[u] = por_origen.get(u, 0) + 1
+        filas = {u: self.fila(u) for u, k in por_origen.items() if k > 1}
+        return [filas[u][v] if u in filas else self.corte(u, v) for u, v in pares]
+
+    def matriz(self):
+        """Matriz n×n de cortes (lista de filas); O(V²)."""
+        return [self.fila(u) for u in range(self.n)]
+
+    def exportar_matriz_csv(self, path, nombres=None):
+        """CSV con cabecera de nombres; se escribe fila por fila (memoria O(V)). Diagonal vacia; los
+        valores van sin formatear, asi que los enteros grandes no se redondean."""
+        nombres = nombres or [str(i) for i in range(self.n)]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["", *nombres])
+            for u in range(self.n):
+                fila = self.fila(u)
+                w.writerow([nombres[u], *("" if v == u else fila[v] for v in range(self.n))])
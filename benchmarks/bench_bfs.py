@@ -0,0 +1,78 @@
+"""Microbenchmark del kernel BFS: costo por busqueda en grafos de 1k a 1M nodos.
+
+Compara KernelBFS (frontera + buffers reutilizables) con la BFS anterior basada en
+list.pop(0) y buffers nuevos por busqueda. Uso:
+
+    python benchmarks/bench_bfs.py --tamanos 1000 10000 100000 1000000 --grado 4
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flujo_maximo_logistica import GrafoResidual, KernelBFS
+
+
+def grafo_aleatorio(n, grado, semilla):
+    r = random.Random(semilla)
+    g = GrafoResidual(n)
+    # un camino 0→1→…→n-1 garantiza que t sea alcanzable y la BFS recorra todo
+    for u in range(n - 1):
+        g.agregar_arco(u, u + 1, 1.0)
+    for _ in range(n * (grado - 1)):
+        g.agregar_arco(r.randrange(n), r.randrange(n), float(r.randint(1, 100)))
+    g.construir()
+    return g
+
+
+def bfs_pop0(g, s, t):
+    # version anterior: cola con list.pop(0) y buffers asignados en cada llamada
+    padre = [-1]*g.n
+    q = [s]; padre[s] = s
+    while q:
+        u = q.pop(0)
+        for e in range(g.inicio[u], g.inicio[u + 1]):
+            v = g.destino[e]
+            if padre[v] == -1 and g.cap[e] > 1e-12:
+                padre[v] = e
+                if v == t:
+                    return True
+                q.append(v)
+    return False
+
+
+def medir(fn, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter(); fn(); mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tamanos", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    ap.add_argument("--grado", type=int, default=4, help="arcos por nodo")
+    ap.add_argument("--repeticiones", type=int, default=3)
+    ap.add_argument("--limite-pop0", type=int, default=100000,
+                    help="no medir la version pop(0) por encima de este tamano (es cuadratica)")
+    ap.add_argument("--semilla", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    print(f"{'nodos':>9} {'arcos':>9} {'camino s→t':>12} {'alcanzables':>12} {'pop(0) todo':>12}")
+    for n in args.tamanos:
+        g = grafo_aleatorio(n, args.grado, args.semilla)
+        k = KernelBFS(g)
+        t_camino = medir(lambda: k.camino(0, n - 1), args.repeticiones)
+        t_alc = medir(lambda: k.alcanzables(0), args.repeticiones)
+        if n <= args.limite_pop0:
+            t_pop = f"{medir(lambda: bfs_pop0(g, 0, -1), args.repeticiones)*1e3:10.2f}ms"
+        else:
+            t_pop = f"{'—':>12}"
+        print(f"{n:>9} {g.m:>9} {t_camino*1e3:10.2f}ms {t_alc*1e3:10.2f}ms {t_pop}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark del motor de costo minimo frente a los motores de flujo maximo puro.
+
+Redes aleatorias con un camino 0→…→n-1 (t siempre alcanzable), capacidades 1..100 y costos
+1..50. Reporta el tiempo de cada motor, las fases (Dijkstra) y los aumentos del de costo
+minimo, y comprueba que todos den el mismo flujo. Uso:
+
+    python benchmarks/bench_costo.py --arcos 5000 20000 50000 --grado 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flujo_maximo_logistica import crear_motor
+
+
+def red_aleatoria(n, m, semilla):
+    r = random.Random(semilla)
+    arcos = [(u, u + 1, float(r.randint(1, 100)), float(r.randint(1, 50))) for u in range(n - 1)]
+    while len(arcos) < m:
+        u, v = r.randrange(n), r.randrange(n)
+        if u != v:
+            arcos.append((u, v, float(r.randint(1, 100)), float(r.randint(1, 50))))
+    return arcos
+
+
+def resolver(nombre, n, arcos):
+    mo = crear_motor(nombre, n, len(arcos), registro="resumen")
+    for u, v, c, w in arcos:
+        if nombre == "costo_minimo": mo.agregar_arco(u, v, c, w)
+        else: mo.agregar_arco(u, v, c)
+    t0 = time.perf_counter()
+    valor, _, iteraciones = mo.maximo_flujo(0, n - 1)
+    return time.perf_counter() - t0, valor, mo, iteraciones
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--arcos", type=int, nargs="+", default=[5000, 20000, 50000])
+    ap.add_argument("--grado", type=int, default=5, help="arcos por nodo (n = arcos / grado)")
+    ap.add_argument("--motores", nargs="+", default=["dinic", "push_relabel"])
+    ap.add_argument("--semilla", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    print(f"{'nodos':>7} {'arcos':>7} {'flujo':>9} " + " ".join(f"{m:>13}" for m in args.motores)
+          + f" {'costo_minimo':>13} {'fases':>6} {'aumentos':>9} {'costo':>12}")
+    for m in args.arcos:
+        n = max(2, m // args.grado)
+        arcos = red_aleatoria(n, m, args.semilla)
+        tiempos = []
+        for nombre in args.motores:
+            t, valor, _, _ = resolver(nombre, n, arcos)
+            tiempos.append(t)
+        t, valor_c, mo, iteraciones = resolver("costo_minimo", n, arcos)
+        if abs(valor_c - valor) > 1e-6 * max(1.0, valor):
+            raise SystemExit(f"flujos distintos: {valor} vs {valor_c}")
+        print(f"{n:>7} {m:>7} {valor:>9g} " + " ".join(f"{x*1e3:11.1f}ms" for x in tiempos)
+              + f" {t*1e3:11.1f}ms {mo.fases:>6} {iteraciones.cantidad:>9} {mo.costo_total:>12g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark de los motores de flujo maximo sobre redes sinteticas (benchmarks/generadores.py).
+
+Para cada generador, tamano y motor reporta el tiempo de construccion del CSR y de resolucion,
+los aumentos, las visitas de BFS (KernelBFS.visitas) y la memoria pico. Cada caso corre en un
+proceso aparte: la memoria pico (ru_maxrss) es la de ese caso y un caso que supera --limite
+se corta sin frenar al resto. Los resultados se guardan en JSON; con --comparar se contrastan
+con los de una corrida anterior y se marcan las regresiones de tiempo. Uso:
+
+    python benchmarks/bench_motores.py --salida actual.json
+    python benchmarks/bench_motores.py --arcos 1000000 4000000 --motores dinic push_relabel --limite 900
+    python benchmarks/bench_motores.py --generadores peor_ek bipartito --motores ek dinic
+    python benchmarks/bench_motores.py --salida nuevo.json --comparar actual.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generadores import GENERADORES
+from io_grafo import guardar_binario
+
+try:
+    import resource
+except ImportError:      # Windows: sin ru_maxrss, la memoria queda en null
+    resource = None
+
+MOTORES_POR_DEFECTO = ["ek", "escalado", "dinic", "push_relabel"]
+PISO_RUIDO_S = 0.05      # por debajo, una diferencia de tiempo no cuenta como regresion
+
+
+def _memoria_pico_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(pico / (1 << 20) if sys.platform == "darwin" else pico / 1024, 1)   # bytes en macOS, KiB en Linux
+
+
+def _medir(generador, m, semilla, motor, cola):
+    """Un caso completo en el proceso hijo; el resultado (o el error) vuelve por `cola`."""
+    try:
+        base = _memoria_pico_mb()
+        t0 = time.perf_counter()
+        g, s, t = GENERADORES[generador](m, semilla)
+        t_gen = time.perf_counter() - t0
+        mo = g.a_motor(motor, registro="resumen")
+        t0 = time.perf_counter()
+        mo._preparar()          # CSR y kernel fuera de la medicion de la resolucion
+        t_csr = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        valor, _, iteraciones = mo.maximo_flujo(s, t)
+        t_res = time.perf_counter() - t0
+        cola.put({"estado": "ok", "nodos": g.n, "arcos": g.m, "flujo": valor,
+                  "aritmetica": "entera" if mo.grafo.entero else "flotante",
+                  "generacion_s": round(t_gen, 4), "construccion_s": round(t_csr, 4), "tiempo_s": round(t_res, 4),
+                  "aumentos": iteraciones.cantidad if motor != "push_relabel" else None,
+                  "visitas_bfs": mo.kernel.visitas,
+                  "memoria_base_mb": base, "memoria_pico_mb": _memoria_pico_mb()})
+    except Exception as ex:
+        cola.put({"estado": "error", "error": f"{type(ex).__name__}: {ex}"})
+
+
+def correr_caso(generador, m, semilla, motor, limite):
+    cola = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_medir, args=(generador, m, semilla, motor, cola), daemon=True)
+    p.start()
+    try:
+        res = cola.get(timeout=limite)
+    except queue.Empty:
+        res = {"estado": "limite", "error": f"más de {limite:g} s"}
+        p.terminate()
+    p.join()
+    return {"generador": generador, "arcos_pedidos": m, "semilla": semilla, "motor": motor, **res}
+
+
+def _entorno():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": platform.python_version(),
+            "plataforma": platform.platform(), "cpus": os.cpu_count()}
+
+
+def _clave(caso):
+    return caso["generador"], caso["arcos_pedidos"], caso["semilla"], caso["motor"]
+
+
+def comparar(casos, path_base, umbral):
+    """Imprime la razon de tiempos contra una corrida anterior; devuelve la cantidad de regresiones."""
+    with open(path_base, encoding="utf-8") as f:
+        base = {_clave(c): c for c in json.load(f)["casos"]}
+    regresiones = 0
+    print(f"\ncomparación con {path_base} (regresión: > {1 + umbral:.2f}× y > {PISO_RUIDO_S:g} s)")
+    for c in casos:
+        b = base.get(_clave(c))
+        if b is None or c["estado"] != "ok" or b["estado"] != "ok":
+            if b is not None and b["estado"] != c["estado"]:
+                print(f"  {c['generador']:>10} {c['arcos_pedidos']:>9} {c['motor']:>13}: {b['estado']} → {c['estado']}")
+            continue
+        razon = c["tiempo_s"] / b["tiempo_s"] if b["tiempo_s"] else float("inf")
+        marca = ""
+        if razon > 1 + umbral and c["tiempo_s"] > PISO_RUIDO_S:
+            marca = "  ← REGRESIÓN"; regresiones += 1
+        if c["aumentos"] != b["aumentos"] or c["flujo"] != b["flujo"]:
+            marca += f"  (aumentos {b['aumentos']}→{c['aumentos']}, flujo {b['flujo']:g}→{c['flujo']:g})"
+        print(f"  {c['generador']:>10} {c['arcos_pedidos']:>9} {c['motor']:>13}: "
+              f"{b['tiempo_s']*1e3:10.1f}ms → {c['tiempo_s']*1e3:10.1f}ms  {razon:5.2f}×{marca}")
+    return regresiones
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--generadores", nargs="+", default=list(GENERADORES), choices=list(GENERADORES))
+    ap.add_argument("--arcos", type=int, nargs="+", default=[10000, 100000])
+    ap.add_argument("--motores", nargs="+", default=MOTORES_POR_DEFECTO)
+    ap.add_argument("--semilla", type=int, default=1)
+    ap.add_argument("--limite", type=float, default=120.0, help="segundos por caso (generacion + resolucion)")
+    ap.add_argument("--salida", default="bench_motores.json", help="archivo JSON de resultados")
+    ap.add_argument("--comparar", help="JSON de una corrida anterior para detectar regresiones")
+    ap.add_argument("--umbral", type=float, default=0.25, help="aumento de tiempo relativo que cuenta como regresion")
+    ap.add_argument("--guardar-grafos", metavar="DIR", help="escribir cada red generada como .mfb en DIR")
+    args = ap.parse_args(argv)
+
+    print(f"{'generador':>10} {'arcos':>9} {'motor':>13} {'nodos':>9} {'flujo':>10} {'csr':>9} "
+          f"{'resolver':>11} {'aumentos':>9} {'visitas BFS':>13} {'pico MB':>8}")
+    casos = []
+    for generador in args.generadores:
+        for m in args.arcos:
+            if args.guardar_grafos:
+                os.makedirs(args.guardar_grafos, exist_ok=True)
+                guardar_binario(GENERADORES[generador](m, args.semilla)[0],
+                                os.path.join(args.guardar_grafos, f"{generador}_{m}_{args.semilla}.mfb"))
+            flujos = set()
+            for motor in args.motores:
+                c = correr_caso(generador, m, args.semilla, motor, args.limite)
+                casos.append(c)
+                if c["estado"] != "ok":
+                    print(f"{generador:>10} {m:>9} {motor:>13}  [{c['estado']}] {c['error']}")
+                    continue
+                flujos.add(c["flujo"])
+                aum = "—" if c["aumentos"] is None else c["aumentos"]
+                pico = "—" if c["memoria_pico_mb"] is None else f"{c['memoria_pico_mb']:.0f}"
+                print(f"{generador:>10} {c['arcos']:>9} {motor:>13} {c['nodos']:>9} {c['flujo']:>10g} "
+                      f"{c['construccion_s']*1e3:7.0f}ms {c['tiempo_s']*1e3:9.1f}ms {aum:>9} {c['visitas_bfs']:>13} {pico:>8}")
+            if len(flujos) > 1:
+                print(f"{generador:>10} {m:>9}  [ERROR] los motores dan flujos distintos: {sorted(flujos)}")
+
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump({"entorno": _entorno(), "parametros": vars(args), "casos": casos}, f, indent=2, ensure_ascii=False)
+    print(f"\nresultados en {args.salida}")
+    if args.comparar:
+        return 1 if comparar(casos, args.comparar, args.umbral) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Generadores sinteticos con semilla para los benchmarks de los motores.
+
+Cada generador recibe la cantidad de arcos pedida `m` y una semilla, y devuelve
+(GrafoCompacto, s, t): arreglos planos que el motor adopta sin copiar (GrafoCompacto.a_motor)
+y que io_grafo.guardar_binario puede escribir para abrirlos en la interfaz o en cli_flujo.
+La cantidad final de arcos es aproximada: los duplicados se acumulan y los opuestos se
+descartan, igual que al cargar un archivo.
+"""
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from io_grafo import GrafoCompacto
+
+
+def _etiqueta(k):
+    # A, B, …, Z, AA, AB, … (niveles de la red logistica, como en test.json)
+    txt = ""
+    k += 1
+    while k:
+        k, r = divmod(k - 1, 26)
+        txt = chr(65 + r) + txt
+    return txt
+
+
+def capas(m, semilla=1, grado=3):
+    """Red logistica por niveles como test.json: Fuente → A1..Aw → B1..Bw → … → Destino.
+
+    Cada nodo se conecta con `grado` nodos cercanos (en altura) del nivel siguiente; hay unos
+    log2(m) niveles, asi que la red es ancha y poco profunda como una cadena de distribucion."""
+    r = random.Random(semilla)
+    niveles = max(3, int(math.log2(max(m, 2))))
+    ancho = max(1, m // (grado*(niveles - 1) + 2))
+    g = GrafoCompacto()
+    s = g.agregar_nodo("Fuente", 80.0, 80.0 + 20.0*ancho)
+    filas = []
+    for k in range(niveles):
+        et = _etiqueta(k)
+        filas.append([g.agregar_nodo(f"{et}{i + 1}", 280.0 + 200.0*k, 80.0 + 40.0*i) for i in range(ancho)])
+    t = g.agregar_nodo("Destino", 280.0 + 200.0*niveles, 80.0 + 20.0*ancho)
+    for u in filas[0]:
+        g.agregar_arco(s, u, r.randint(20, 40))
+    for a, b in zip(filas, filas[1:]):
+        for i, u in enumerate(a):
+            for j in r.sample(range(max(0, i - grado), min(ancho, i + grado + 1)), min(grado, ancho)):
+                g.agregar_arco(u, b[j], r.randint(5, 25))
+    for u in filas[-1]:
+        g.agregar_arco(u, t, r.randint(20, 40))
+    return g.terminar(), s, t
+
+
+def rejilla(m, semilla=1):
+    """Rejilla filas×columnas: arcos hacia la derecha y verticales alternando el sentido por
+    columna (serpentina, sin arcos opuestos). La fuente alimenta la primera columna y la
+    ultima desagua en el sumidero. Caminos largos: muchas fases de BFS."""
+    r = random.Random(semilla)
+    lado = max(2, int(math.sqrt(m / 2)))
+    g = GrafoCompacto()
+    s = g.agregar_nodo("Fuente", 40.0, 40.0 + 30.0*lado)
+    ids = [[g.agregar_nodo(f"R{f}_{c}", 80.0 + 60.0*c, 40.0 + 60.0*f) for c in range(lado)] for f in range(lado)]
+    t = g.agregar_nodo("Destino", 120.0 + 60.0*lado, 40.0 + 30.0*lado)
+    for f in range(lado):
+        g.agregar_arco(s, ids[f][0], 100)
+        g.agregar_arco(ids[f][-1], t, 100)
+        for c in range(lado):
+            if c + 1 < lado:
+                g.agregar_arco(ids[f][c], ids[f][c + 1], r.randint(1, 20))
+            if f + 1 < lado:
+                a, b = (ids[f][c], ids[f + 1][c]) if c % 2 == 0 else (ids[f + 1][c], ids[f][c])
+                g.agregar_arco(a, b, r.randint(1, 20))
+    return g.terminar(), s, t
+
+
+def _aleatorio(m, n, r):
+    g = GrafoCompacto()
+    cols = max(1, math.ceil(math.sqrt(n)))
+    for i in range(n):
+        g.agregar_nodo(f"N{i}", 80.0 + (i % cols)*120.0, 80.0 + (i // cols)*100.0)
+    # camino oculto 0→1→…→n-1: t siempre alcanzable
+    for u in range(n - 1):
+        g.agregar_arco(u, u + 1, r.randint(1, 100))
+    intentos = 0
+    while g.m < m and intentos < 4*m:
+        intentos += 1
+        u = r.randrange(n); v = r.randrange(n)
+        if u != v:
+            g.agregar_arco(u, v, r.randint(1, 100))
+    return g.terminar(), 0, n - 1
+
+
+def disperso(m, semilla=1, grado=4):
+    """Grafo aleatorio con `grado` arcos por nodo (n = m / grado)."""
+    return _aleatorio(m, max(2, m // grado), random.Random(semilla))
+
+
+def denso(m, semilla=1):
+    """Grafo aleatorio con la mitad de los pares posibles (n ≈ 2·√m)."""
+    return _aleatorio(m, max(2, int(2*math.sqrt(m))), random.Random(semilla))
+
+
+def bipartito(m, semilla=1, grado=8):
+    """Asignacion con capacidades unitarias: fuente → izquierda → derecha → sumidero. Cada
+    aumento mueve una unidad, asi que EK hace ~n aumentos de BFS completa (O(V·E))."""
+    r = random.Random(semilla)
+    k = max(1, m // (grado + 2))
+    g = GrafoCompacto()
+    s = g.agregar_nodo("Fuente", 40.0, 40.0 + 20.0*k)
+    izq = [g.agregar_nodo(f"I{i}", 240.0, 40.0 + 40.0*i) for i in range(k)]
+    der = [g.agregar_nodo(f"D{i}", 640.0, 40.0 + 40.0*i) for i in range(k)]
+    t = g.agregar_nodo("Destino", 840.0, 40.0 + 20.0*k)
+    for i in range(k):
+        g.agregar_arco(s, izq[i], 1); g.agregar_arco(der[i], t, 1)
+        for j in r.sample(range(k), min(grado, k)):
+            g.agregar_arco(izq[i], der[j], 1)
+    return g.terminar(), s, t
+
+
+def peor_ek(m, semilla=1, grado=4):
+    """Caso adverso para Edmonds–Karp: k ≈ √m/2 caminos disjuntos s→t del mismo largo con
+    capacidad 1 y una "nube" sin salida colgada de la fuente (arbol de aridad `grado` mas arcos
+    al azar), menos profunda que los caminos. Cada BFS de EK recorre la nube entera antes de
+    llegar a t, asi que hace k recorridos de O(m); Dinic resuelve todo en una fase."""
+    r = random.Random(semilla)
+    largo = max(3, int(math.log2(max(m, 2))) + 2)
+    k = max(1, int(math.sqrt(m)) // 2)
+    nube = max(1, (m - k*(largo + 1)) // grado)
+    g = GrafoCompacto()
+    s = g.agregar_nodo("Fuente", 40.0, 40.0 + 20.0*k)
+    t = g.agregar_nodo("Destino", 120.0 + 60.0*largo, 40.0 + 20.0*k)
+    for c in range(k):
+        nodos = [g.agregar_nodo(f"P{c}_{i}", 80.0 + 60.0*i, 40.0 + 40.0*c) for i in range(largo)]
+        for a, b in zip([s] + nodos, nodos + [t]):
+            g.agregar_arco(a, b, 1)
+    cols = max(1, math.ceil(math.sqrt(nube)))
+    base = g.n
+    for i in range(nube):
+        g.agregar_nodo(f"X{i}", 80.0 + (i % cols)*60.0, 80.0 + 40.0*k + (i // cols)*60.0)
+    g.agregar_arco(s, base, 1000)
+    for i in range(1, nube):
+        g.agregar_arco(base + (i - 1)//grado, base + i, 1000)     # profundidad log_grado(nube) < largo
+    for _ in range((grado - 1)*nube):
+        u = r.randrange(nube); v = r.randrange(nube)
+        if u != v:
+            g.agregar_arco(base + u, base + v, 1000)
+    return g.terminar(), s, t
+
+
+GENERADORES = {
+    "capas": capas,
+    "rejilla": rejilla,
+    "disperso": disperso,
+    "denso": denso,
+    "bipartito": bipartito,
+    "peor_ek": peor_ek,
+}
@@ -0,0 +1,240 @@
+"""Modo por linea de comandos: resuelve el flujo maximo de archivos de grafo sin abrir la interfaz.
+
+Ejemplos:
+    python cli_flujo.py test.json --origen Fuente --destino Destino
+    python cli_flujo.py escenarios/ --origen Fuente --destino Destino --salida resultados/ --formato csv --procesos 8
+    python cli_flujo.py red.json --origen Almacen1 Almacen2=50 --destino Tienda1=20 Tienda2 Tienda3
+
+--origen y --destino aceptan varios nodos; `nombre=tope` limita la oferta o demanda del nodo
+(sin tope: lo que permitan sus arcos). Con mas de uno o con topes se resuelve con una
+super-fuente y un super-sumidero internos (MotorFlujo.maximo_flujo_multiple).
+
+Cada archivo de entrada usa el formato de ModeloGrafo.exportar_json, el binario compacto (.mfb,
+cargado por mmap) o una lista de arcos `u v capacidad` (.txt/.tsv/.edges/.el); se leen en
+streaming (io_grafo). Con --salida se escribe
+un resultado por entrada (<nombre>.flujo.json o .csv); sin --salida, los resultados JSON se
+imprimen uno por linea.
+
+    python cli_flujo.py red.json --convertir mfb        # red.mfb junto a red.json (o en --salida)
+
+Con capacidades enteras los motores calculan en aritmetica entera exacta ("aritmetica":
+"entera" en el resultado); con capacidades reales, --tolerancia fija la tolerancia relativa
+con la que un residual se considera nulo.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from io_grafo import EXTENSION_BINARIA, EXTENSIONES_LISTA, cargar_grafo, convertir
+from motor_flujo import TOLERANCIA, FlujoCostoMinimo, descomponer_flujo
+
+
+def leer_extremos(valores):
+    """["A", "B=50"] -> {"A": None, "B": 50.0}; un sufijo =numero es el tope de oferta/demanda."""
+    extremos = {}
+    for txt in ([valores] if isinstance(valores, str) else valores):
+        nombre, igual, tope = txt.rpartition("=")
+        if igual:
+            try:
+                extremos[nombre] = float(tope); continue
+            except ValueError:
+                pass
+        extremos[txt] = None
+    return extremos
+
+
+def resolver_grafo(g, origen, destino, motor="auto", rutas=False, tolerancia=TOLERANCIA):
+    """Resuelve s-t (por nombre) sobre un io_grafo.GrafoCompacto y devuelve un dict serializable.
+    origen y destino pueden ser un nombre o varios (con tope `nombre=tope`, ver leer_extremos).
+    Con rutas=True agrega la descomposicion del flujo en caminos y ciclos (motor_flujo.descomponer_flujo)."""
+    ids = {nombre: i for i, nombre in enumerate(g.nombres)}
+    fuentes = leer_extremos(origen); sumideros = leer_extremos(destino)
+    for nombre in (*fuentes, *sumideros):
+        if nombre not in ids:
+            raise ValueError(f"No existe el nodo '{nombre}'")
+    F = {ids[x]: tope for x, tope in fuentes.items()}
+    D = {ids[x]: tope for x, tope in sumideros.items()}
+    multiple = len(F) > 1 or len(D) > 1 or any(t is not None for t in (*F.values(), *D.values()))
+    nombres = g.nombres
+    t0 = time.perf_counter()
+    mo = g.a_motor(motor, registro="resumen", tolerancia=tolerancia)   # en lotes basta con contar los aumentos
+    if multiple:
+        valor, mapa_flujo, iteraciones = mo.maximo_flujo_multiple(F, D)
+    else:
+        s, = F; t, = D
+        valor, mapa_flujo, iteraciones = mo.maximo_flujo(s, t)
+    corte = mo.corte_minimo()
+    tiempo = time.perf_counter() - t0
+    res = {
+        "origen": list(fuentes) if multiple else next(iter(fuentes)),
+        "destino": list(sumideros) if multiple else next(iter(sumideros)),
+        "motor": mo.nombre,
+        "aritmetica": "entera" if mo.grafo.entero else "flotante",
+        "flujo_maximo": valor,
+        "iteraciones": iteraciones.cantidad,
+        "tiempo_s": round(tiempo, 6),
+        "opuestos_eliminados": g.opuestos_eliminados,
+        "arcos": [{"u": nombres[u], "v": nombres[v], "capacidad": c, "flujo": mapa_flujo.get((u, v), 0)}
+                  for u, v, c in zip(g.u, g.v, g.cap)],
+        "corte_minimo": {
+            "S": sorted(nombres[i] for i in corte.S),
+            "arcos": [{"u": nombres[u], "v": nombres[v], "capacidad": c} for u, v, c, _ in corte.arcos],
+            "capacidad": corte.capacidad,
+            "consistente": corte.consistente(),
+        },
+    }
+    if isinstance(mo, FlujoCostoMinimo):
+        res["costo_total"] = mo.costo_total
+    if multiple:
+        # neto enviado por cada fuente y recibido por cada sumidero
+        neto = dict.fromkeys((*F, *D), 0)
+        for (u, v), f in mapa_flujo.items():
+            if u in neto: neto[u] -= f
+            if v in neto: neto[v] += f
+        res["envios"] = {nombres[x]: -neto[x] for x in F}
+        res["recepciones"] = {nombres[x]: neto[x] for x in D}
+        # topes cortados (arcos auxiliares saturados); corte.capacidad ya los incluye
+        cm = res["corte_minimo"]
+        cm["ofertas_saturadas"] = [{"nodo": nombres[x], "tope": c} for tipo, x, c in corte.topes if tipo == "oferta"]
+        cm["demandas_saturadas"] = [{"nodo": nombres[x], "tope": c} for tipo, x, c in corte.topes if tipo == "demanda"]
+    if rutas:
+        res["rutas"] = [{"tipo": r["tipo"], "nodos": [nombres[v] for v in r["nodos"]], "flujo": r["flujo"]}
+                        for r in descomponer_flujo(mapa_flujo, set(F), set(D), mo.umbral)]
+    return res
+
+
+def resultado_a_csv(res):
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(["u", "v", "capacidad", "flujo"])
+    for a in res["arcos"]:
+        w.writerow([a["u"], a["v"], a["capacidad"], a["flujo"]])
+    w.writerow([]); w.writerow(["Flujo máximo total", res["flujo_maximo"]])
+    if "costo_total" in res: w.writerow(["Costo total", res["costo_total"]])
+    w.writerow([]); w.writerow(["Corte mínimo:"])
+    for a in res["corte_minimo"]["arcos"]:
+        w.writerow([a["u"], a["v"], a["capacidad"]])
+    for clave, txt in (("ofertas_saturadas", "oferta"), ("demandas_saturadas", "demanda")):
+        for a in res["corte_minimo"].get(clave, ()):
+            w.writerow([a["nodo"], f"({txt})", a["tope"]])
+    w.writerow(["Capacidad del corte", res["corte_minimo"]["capacidad"]])
+    w.writerow(["Corte consistente", "sí" if res["corte_minimo"]["consistente"] else "no"])
+    if "envios" in res:
+        w.writerow([]); w.writerow(["Envíos:"])
+        for nombre, f in res["envios"].items(): w.writerow([nombre, f])
+        w.writerow(["Recepciones:"])
+        for nombre, f in res["recepciones"].items(): w.writerow([nombre, f])
+    if "rutas" in res:
+        w.writerow([]); w.writerow(["Rutas (descomposición):"])
+        for r in res["rutas"]:
+            w.writerow([r["tipo"], " → ".join(r["nodos"]), r["flujo"]])
+    return buf.getvalue()
+
+
+def procesar_archivo(path, origen, destino, motor="auto", salida=None, formato="json", rutas=False,
+                     tolerancia=TOLERANCIA):
+    """Trabajo de un proceso del pool: carga, resuelve y (si hay salida) escribe el resultado."""
+    try:
+        res = resolver_grafo(cargar_grafo(path), origen, destino, motor, rutas, tolerancia)
+    except Exception as ex:
+        return {"archivo": path, "error": str(ex)}
+    res = {"archivo": path, **res}
+    if salida:
+        base = os.path.splitext(os.path.basename(path))[0]
+        destino_path = os.path.join(salida, f"{base}.flujo.{formato}")
+        with open(destino_path, "w", newline="", encoding="utf-8") as f:
+            if formato == "csv": f.write(resultado_a_csv(res))
+            else: json.dump(res, f, indent=2, ensure_ascii=False)
+        # al proceso principal solo vuelve el resumen
+        return {"archivo": path, "salida": destino_path, "flujo_maximo": res["flujo_maximo"],
+                "tiempo_s": res["tiempo_s"]}
+    return res
+
+
+def expandir_entradas(entradas):
+    archivos = []
+    for e in entradas:
+        if os.path.isdir(e):
+            archivos.extend(sorted(os.path.join(e, f) for f in os.listdir(e)
+                                   if f.lower().endswith((".json", EXTENSION_BINARIA) + EXTENSIONES_LISTA)))
+        else:
+            archivos.append(e)
+    return archivos
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="cli_flujo", description="Flujo maximo por lotes sobre grafos JSON (sin interfaz grafica).")
+    ap.add_argument("entradas", nargs="+", help="archivos (.json, .mfb o listas de arcos .txt/.tsv/.edges) o directorios")
+    ap.add_argument("--origen", nargs="+", help="nodo(s) inicio; `nombre=tope` limita su oferta")
+    ap.add_argument("--destino", nargs="+", help="nodo(s) destino; `nombre=tope` limita su demanda")
+    ap.add_argument("--motor", default="auto", help="auto, ek, escalado, dinic, push_relabel o costo_minimo")
+    ap.add_argument("--salida", help="directorio donde escribir un resultado por entrada")
+    ap.add_argument("--formato", choices=["json", "csv"], default="json")
+    ap.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--rutas", action="store_true", help="incluir la descomposicion del flujo en caminos y ciclos")
+    ap.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                    help="tolerancia relativa a la capacidad maxima con capacidades reales (por defecto 1e-12)")
+    ap.add_argument("--convertir", choices=["json", "mfb"],
+                    help="solo convertir cada entrada a JSON o al binario compacto (sin resolver)")
+    args = ap.parse_args(argv)
+
+    archivos = expandir_entradas(args.entradas)
+    if not archivos:
+        ap.error("no se encontraron archivos de grafo")
+    if not args.convertir and (not args.origen or not args.destino):
+        ap.error("se requieren --origen y --destino")
+    if args.salida:
+        os.makedirs(args.salida, exist_ok=True)
+    if args.convertir:
+        return convertir_archivos(archivos, args.convertir, args.salida)
+    tarea = (args.origen, args.destino, args.motor, args.salida, args.formato, args.rutas, args.tolerancia)
+
+    if args.procesos <= 1 or len(archivos) == 1:
+        resultados = (procesar_archivo(p, *tarea) for p in archivos)
+        return _informar(resultados, args)
+    with ProcessPoolExecutor(max_workers=args.procesos) as pool:
+        futuros = [pool.submit(procesar_archivo, p, *tarea) for p in archivos]
+        return _informar((f.result() for f in futuros), args)
+
+
+def convertir_archivos(archivos, formato, salida=None):
+    errores = 0
+    for path in archivos:
+        base = os.path.splitext(path)[0]
+        if salida: base = os.path.join(salida, os.path.basename(base))
+        destino = f"{base}.{formato}"
+        if os.path.abspath(destino) == os.path.abspath(path):
+            print(f"[ERROR] {path}: ya está en formato {formato}", file=sys.stderr); errores += 1; continue
+        try:
+            t0 = time.perf_counter()
+            g = convertir(path, destino)
+        except Exception as ex:
+            errores += 1
+            print(f"[ERROR] {path}: {ex}", file=sys.stderr)
+            continue
+        print(f"{path} → {destino} ({g.n} nodos, {g.m} arcos, {time.perf_counter() - t0:.2f} s)", file=sys.stderr)
+    return 1 if errores else 0
+
+
+def _informar(resultados, args):
+    errores = 0
+    for res in resultados:
+        if "error" in res:
+            errores += 1
+            print(f"[ERROR] {res['archivo']}: {res['error']}", file=sys.stderr)
+        elif args.salida:
+            print(f"{res['archivo']}: flujo máximo {res['flujo_maximo']:g} → {res['salida']}", file=sys.stderr)
+        elif args.formato == "csv":
+            sys.stdout.write(f"# {res['archivo']}\n{resultado_a_csv(res)}\n")
+        else:
+            print(json.dumps(res, ensure_ascii=False))
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
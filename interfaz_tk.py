@@ -0,0 +1,1478 @@
+"""Interfaz Tk de la aplicacion. Es el unico modulo que importa tkinter."""
+import math
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+from arbol_cortes import ArbolGomoryHu
+from io_grafo import exportar_flujo
+from motor_flujo import (CalculoCancelado, ControlCalculo, FlujoCostoMinimo, IndiceAcumulado, MOTORES,
+                         RegistroIteraciones, descomponer_flujo)
+from modelo_grafo import ModeloGrafo, RADIO_NODO, _capacidad
+from tabla_virtual import TablaVirtual
+
+# culling y nivel de detalle del lienzo
+MARGEN_VISTA = 0.5          # la escena cubre la vista mas este margen (fraccion por lado)
+LOD_ZOOM_DETALLE = 0.6      # por debajo: sin etiquetas, emojis ni anotaciones
+LOD_MAX_DETALLE = 3000      # nodos+arcos visibles maximos en detalle completo
+LOD_MAX_NODOS = 4000        # por encima: nodos agregados por celda de pantalla
+CELDA_MASIVO = 12           # px por celda en el nivel masivo
+LOD_MAX_SEGMENTOS = 6000    # segmentos celda→celda dibujados en el nivel masivo
+INTERVALO_CUADRO_MS = 16    # tope de ~60 redibujos por segundo
+MAX_PESOS_ETIQUETA = 12     # pesos listados en la etiqueta "Pesos" (el resto se resume)
+
+# calculo en segundo plano
+SONDEO_MS = 100             # cada cuanto se lee el progreso del hilo del motor
+ESPERA_INICIAL_S = 0.05     # los calculos chicos terminan sin pasar por el sondeo
+
+
+class _Calculo:
+    """Un calculo de flujo en un hilo aparte. El hilo solo toca el motor y estos campos;
+    la interfaz lee `control` y, al terminar, `resultado` / `error` / `cancelado`."""
+
+    def __init__(self, modelo, motor, fuentes, sumideros, multiple, incremental):
+        self.modelo = modelo; self.version = modelo.version
+        self.motor = motor                  # nombre, o el motor a reusar en modo incremental
+        self.fuentes, self.sumideros = fuentes, sumideros
+        self.multiple, self.incremental = multiple, incremental
+        self.instantanea = None if incremental else modelo.instantanea()
+        self.registro = "completo"
+        self.control = ControlCalculo()
+        self.resultado = None; self.error = None; self.cancelado = False
+        self.hilo = None
+
+    def correr(self):
+        try:
+            ek = self.motor if self.incremental else self.instantanea.a_motor(self.motor, self.registro)
+            ek.registro = self.registro; ek.control = self.control
+            try:
+                if self.multiple:
+                    res = ek.maximo_flujo_multiple(self.fuentes, self.sumideros)
+                else:
+                    (s,), (t,) = self.fuentes, self.sumideros
+                    res = ek.maximo_flujo(s, t)
+                self.resultado = (ek, *res, ek.corte_minimo())
+            finally:
+                ek.control = None
+        except CalculoCancelado:
+            self.cancelado = True
+        except Exception as ex:
+            self.error = ex
+
+class _Exportacion:
+    """Exportacion del flujo (io_grafo.exportar_flujo) en un hilo aparte. Ocupa el lugar de un
+    _Calculo: mientras corre no se calcula y Esc la cancela (se borra el archivo a medio escribir)."""
+
+    def __init__(self, modelo, motor, path, solo_con_flujo, resumen, reusable, acumulados=None, rutas=None):
+        self.modelo = modelo; self.version = modelo.version
+        self.motor = motor; self.path = path
+        self.nombres = [nd[2] for nd in modelo.nodos]
+        self.solo_con_flujo = solo_con_flujo; self.resumen = resumen
+        self.acumulados = acumulados; self.rutas = rutas
+        self.reusable = reusable            # motor incremental a devolver a la interfaz al terminar
+        self.control = ControlCalculo()
+        self.escritas = 0; self.error = None; self.cancelado = False
+        self.hilo = None
+
+    def _progreso(self, escritas):
+        self.escritas = escritas
+        if self.control.cancelado:
+            raise CalculoCancelado()
+
+    def correr(self):
+        try:
+            self.escritas = exportar_flujo(self.path, self.motor, self.nombres, solo_con_flujo=self.solo_con_flujo,
+                                           resumen=self.resumen, progreso=self._progreso,
+                                           acumulados=self.acumulados, rutas=self.rutas)
+        except CalculoCancelado:
+            self.cancelado = True
+        except Exception as ex:
+            # cancelada mientras se limpiaban los resultados que leia: no es un error
+            if self.control.cancelado: self.cancelado = True
+            else: self.error = ex
+
+# interfaz tkinter
+class Aplicacion(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title("MaxFlow App")
+        self.geometry("1920x1080")
+        self.configure(bg="#F5F7FB")
+
+        self.modelo = ModeloGrafo(avisar=messagebox.showwarning)
+        self.id_inicio = None
+        self.id_destino = None
+        # fuentes y sumideros adicionales: nid -> tope de oferta/demanda (None = sin tope)
+        self.fuentes = {}
+        self.sumideros = {}
+
+        self.ultimo_flujo = {}
+        self.ultimo_valor = 0.0
+        self.ultimo_costo = None      # costo total del flujo (solo con el motor de costo minimo)
+        self.umbral_flujo = 1e-12     # flujo minimo que cuenta como > 0 (umbral del ultimo motor)
+        self.iteraciones = RegistroIteraciones()
+        self.acumulados = IndiceAcumulado()   # acumulado por arco de las iteraciones
+        self._descomposicion = None           # caminos/ciclos de ultimo_flujo (se calcula al pedirla)
+        self.corte_S = set()
+        self.corte = None        # CorteMinimo del ultimo calculo
+        self._pares_corte = set()  # (u,v) de los arcos del corte, resaltados en el lienzo
+        self.corte_linea = None
+        self.motor = None        # motor del ultimo calculo, reutilizable en modo incremental
+        self._calculo = None     # _Calculo o _Exportacion en curso (hilo aparte)
+        self._motor_resultado = None  # motor del ultimo resultado (fuente de la exportacion del flujo)
+        self._version_resultado = 0   # sube con cada resultado nuevo o limpiado (tablas virtuales)
+        self._indices_arcos = {}      # posiciones y saturados de la tabla de arcos, por version
+
+        self.arco_pendiente_desde = None
+
+        # transformaciones y navegacion
+        self.zoom = 1.0
+        self.offset = [0.0, 0.0]
+        self.paneando = False
+        self.pan_origen = (0, 0)
+        self.offset_ini = (0.0, 0.0)
+        self.nodo_arrastre = None
+        self.offset_arrastre_world = (0.0, 0.0)
+
+        # estado para paneo con espacio
+        self.space_down = False
+
+        # escena retenida: ids de items del lienzo por nodo y por arco
+        self._items_nodo = {}    # nid -> (halo, circulo, icono, nombre)
+        self._items_arco = {}    # (u,v) -> (linea, rect, texto, ancho_rect, [(item, dx, dy)])
+        self._item_corte = None  # (linea, texto) del corte minimo
+        self._estrellas = {}     # u -> [(item, [v...])]: arcos de u en una polilinea (nivel simple)
+        self._nivel_lod = "detalle"
+        self._rect_dibujado = None  # rectangulo de mundo cubierto por la escena actual
+
+        # planificador de redibujo: los eventos marcan partes sucias y un solo cuadro las atiende
+        self._sucio = set()      # "cuadricula", "arcos", "nodos", "panel" (+ "vista" tras zoom)
+        self._pan_pendiente = [0.0, 0.0]
+        self._nodos_movidos = set()
+        self._id_redibujo = None
+        self._ultimo_cuadro = 0.0
+        self.redibujos_pedidos = 0
+        self.redibujos_ejecutados = 0
+
+        self._construir_ui()
+        self._vincular_eventos()
+        self.redibujar()
+
+    # util transformacion mundo↔pantalla
+    def w2s(self, x, y):
+        return x * self.zoom + self.offset[0], y * self.zoom + self.offset[1]
+
+    def s2w(self, sx, sy):
+        return (sx - self.offset[0]) / self.zoom, (sy - self.offset[1]) / self.zoom
+
+    def _construir_ui(self):
+        estilo = ttk.Style(self)
+        try: estilo.theme_use("clam")
+        except: pass
+        estilo.configure("TButton", padding=8, font=("Segoe UI", 10))
+        estilo.configure("Titulo.TLabel", font=("Segoe UI", 13, "bold"))
+        estilo.configure("Resultado.TLabel", font=("Segoe UI", 11, "bold"))
+        estilo.configure("Rojo.TLabel", foreground="#DC3545", font=("Segoe UI", 10, "bold"))
+        estilo.configure("Tag.TLabel", foreground="#555")
+        estilo.configure("TFrame", background="#F5F7FB")
+
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=0)
+        self.rowconfigure(0, weight=1)
+
+        self.lienzo = tk.Canvas(self, bg="#ffffff", highlightthickness=0)
+        self.lienzo.grid(row=0, column=0, sticky="nsew")
+        self.lienzo.bind("<Configure>", lambda e: self._pedir_redibujo("cuadricula"))
+
+        lateral = ttk.Frame(self, padding=(12,10)); lateral.grid(row=0, column=1, sticky="ns")
+        lateral.columnconfigure(0, weight=1)
+
+        # Cabecera
+        ttk.Label(lateral, text="Controles", style="Titulo.TLabel").grid(row=0, column=0, sticky="w", pady=(0,8))
+
+        # Estado y tip
+        self.lbl_estado = ttk.Label(lateral, text="Listo.", style="Resultado.TLabel")
+        self.lbl_estado.grid(row=1, column=0, sticky="w", pady=(0,6))
+
+        self.lbl_tip = ttk.Label(lateral, text="", style="Tag.TLabel")
+        self.lbl_tip.grid(row=2, column=0, sticky="w", pady=(0,2))
+
+        # Modos
+        self.modo_var = tk.StringVar(value="agregar_nodo")
+        for i,(txt,val) in enumerate([
+            ("➕ Añadir nodo (click lienzo)", "agregar_nodo"),
+            ("✋ Mover nodo (arrastrar)", "mover_nodo"),
+            ("➡️ Añadir arco (inicio→destino)", "agregar_arco"),
+            ("🗑️ Eliminar (nodo/arco)", "eliminar"),
+            ("✏️ Renombrar nodo", "renombrar"),
+        ], start=3):
+            ttk.Radiobutton(lateral, text=txt, value=val, variable=self.modo_var, command=self._on_modo_cambiado).grid(row=i, column=0, sticky="w")
+
+        ttk.Separator(lateral).grid(row=8, column=0, sticky="ew", pady=8)
+
+        cap_fr = ttk.Frame(lateral); cap_fr.grid(row=9, column=0, sticky="ew", pady=(0,6))
+        ttk.Label(cap_fr, text="Capacidad por defecto:").grid(row=0, column=0, sticky="w")
+        self.entrada_capacidad = ttk.Entry(cap_fr, width=10)
+        self.entrada_capacidad.grid(row=0, column=1, padx=(6,0))
+        self.entrada_capacidad.insert(0, "10")
+        ttk.Label(cap_fr, text="Costo por defecto:").grid(row=1, column=0, sticky="w", pady=(4,0))
+        self.entrada_costo = ttk.Entry(cap_fr, width=10)
+        self.entrada_costo.grid(row=1, column=1, padx=(6,0), pady=(4,0))
+        self.entrada_costo.insert(0, "0")
+
+        ttk.Separator(lateral).grid(row=10, column=0, sticky="ew", pady=8)
+
+        ttk.Label(lateral, text="Inicio / Destino", style="Titulo.TLabel").grid(row=11, column=0, sticky="w")
+        r1 = ttk.Frame(lateral); r1.grid(row=12, column=0, sticky="ew", pady=2)
+        self.combo_inicio = ttk.Combobox(r1, state="readonly"); self.combo_inicio.grid(row=0, column=0, padx=(0,6))
+        ttk.Button(r1, text="🚩 Establecer Inicio", command=self.establecer_inicio).grid(row=0, column=1)
+        ttk.Button(r1, text="＋ Fuente", command=self.agregar_fuente).grid(row=0, column=2, padx=(4,0))
+        r2 = ttk.Frame(lateral); r2.grid(row=13, column=0, sticky="ew", pady=2)
+        self.combo_destino = ttk.Combobox(r2, state="readonly"); self.combo_destino.grid(row=0, column=0, padx=(0,6))
+        ttk.Button(r2, text="🏁 Establecer Destino", command=self.establecer_destino).grid(row=0, column=1)
+        ttk.Button(r2, text="＋ Sumidero", command=self.agregar_sumidero).grid(row=0, column=2, padx=(4,0))
+        # tope de oferta/demanda para las fuentes y sumideros que se agregan con ＋
+        r3 = ttk.Frame(r2); r3.grid(row=1, column=0, columnspan=3, sticky="w", pady=(4,0))
+        ttk.Label(r3, text="Oferta/demanda (vacío = sin tope):").grid(row=0, column=0, sticky="w")
+        self.entrada_tope = ttk.Entry(r3, width=8); self.entrada_tope.grid(row=0, column=1, padx=(6,6))
+        ttk.Button(r3, text="✖ Quitar extras", command=self.quitar_extremos_extra).grid(row=0, column=2)
+
+        fm = ttk.Frame(lateral); fm.grid(row=14, column=0, sticky="ew", pady=(8,4))
+        fm.columnconfigure(2, weight=1)
+        ttk.Label(fm, text="Motor:").grid(row=0, column=0, sticky="w")
+        self.combo_motor = ttk.Combobox(fm, state="readonly", width=12, values=["auto", *MOTORES.keys()])
+        self.combo_motor.grid(row=0, column=1, padx=(6,6)); self.combo_motor.set("auto")
+        ttk.Button(fm, text="▶ Calcular Flujo Máximo", command=self.calcular_flujo_maximo).grid(row=0, column=2, sticky="ew")
+        self.btn_cancelar = ttk.Button(fm, text="■ Cancelar", command=self.cancelar_calculo, state="disabled")
+        self.btn_cancelar.grid(row=0, column=3, padx=(6,0))
+        self.var_incremental = tk.BooleanVar(value=False)
+        ttk.Checkbutton(fm, text="Re-cálculo incremental (reusar flujo previo)", variable=self.var_incremental).grid(row=1, column=0, columnspan=3, sticky="w", pady=(4,0))
+        # politica de bitacora: en grafos grandes "ultimas"/"resumen" evitan guardar cada camino
+        ttk.Label(fm, text="Bitácora:").grid(row=2, column=0, sticky="w", pady=(4,0))
+        self.combo_registro = ttk.Combobox(fm, state="readonly", width=12, values=list(RegistroIteraciones.MODOS))
+        self.combo_registro.grid(row=2, column=1, padx=(6,6), pady=(4,0)); self.combo_registro.set("completo")
+        self.lbl_resultado = ttk.Label(lateral, text="Flujo máximo: —", style="Resultado.TLabel")
+        self.lbl_resultado.grid(row=15, column=0, sticky="w", pady=(0,4))
+
+        ttk.Label(lateral, text="Pesos:", style="Tag.TLabel").grid(row=16, column=0, sticky="w")
+        self.lbl_pesos = ttk.Label(lateral, text="—", style="Tag.TLabel")
+        self.lbl_pesos.grid(row=17, column=0, sticky="w")
+        self.lbl_total = ttk.Label(lateral, text="", style="Rojo.TLabel")
+        self.lbl_total.grid(row=18, column=0, sticky="w", pady=(0,6))
+
+        # NUEVO: Rutas debajo de Pesos
+        fr = ttk.Frame(lateral); fr.grid(row=19, column=0, sticky="ew")
+        ttk.Label(fr, text="Rutas:", style="Tag.TLabel").grid(row=0, column=0, sticky="w")
+        # fuente de las rutas: bitacora de aumentos o descomposicion del flujo final en caminos/ciclos
+        self.combo_rutas = ttk.Combobox(fr, state="readonly", width=16, values=["iteraciones", "descomposición"])
+        self.combo_rutas.grid(row=0, column=1, padx=(6,0)); self.combo_rutas.set("iteraciones")
+        self.combo_rutas.bind("<<ComboboxSelected>>", lambda e: self._actualizar_desglose_panel())
+        # tablas virtuales: el Treeview solo tiene las filas visibles (ver tabla_virtual)
+        ftr = ttk.Frame(lateral); ftr.grid(row=20, column=0, sticky="ew", pady=(2,6))
+        ftr.columnconfigure(0, weight=1)
+        self.tabla_rutas = ttk.Treeview(ftr, columns=("ruta","peso"), show="headings", height=6)
+        self.tabla_rutas.heading("ruta", text="Ruta")
+        self.tabla_rutas.heading("peso", text="Peso")
+        self.tabla_rutas.column("ruta", width=360, anchor="w")
+        self.tabla_rutas.column("peso", width=90, anchor="e")
+        self.tabla_rutas.grid(row=0, column=0, sticky="ew")
+        barra = ttk.Scrollbar(ftr, orient="vertical"); barra.grid(row=0, column=1, sticky="ns")
+        self.vista_rutas = TablaVirtual(self.tabla_rutas, barra)
+
+        ttk.Label(lateral, text="Arcos (u → v, capacidad, costo, flujo)", style="Titulo.TLabel").grid(row=21, column=0, sticky="w", pady=(8,2))
+        fta = ttk.Frame(lateral); fta.grid(row=22, column=0, sticky="ew")
+        fta.columnconfigure(0, weight=1)
+        ff = ttk.Frame(fta); ff.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0,4))
+        ttk.Label(ff, text="Filtrar por nodo:").grid(row=0, column=0, sticky="w")
+        self.entrada_filtro = ttk.Entry(ff, width=14); self.entrada_filtro.grid(row=0, column=1, padx=(6,8))
+        self.entrada_filtro.bind("<KeyRelease>", lambda e: self._refrescar_tabla_arcos())
+        self.var_saturados = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ff, text="Solo saturados", variable=self.var_saturados,
+                        command=self._refrescar_tabla_arcos).grid(row=0, column=2, sticky="w")
+        self.tabla = ttk.Treeview(fta, columns=("u","v","cap","costo","flujo"), show="headings", height=10)
+        for col,txt,w in [("u","u",90),("v","v",90),("cap","Capacidad",90),("costo","Costo",70),("flujo","Flujo",80)]:
+            self.tabla.heading(col, text=txt); self.tabla.column(col, width=w, anchor="center" if col in ("u","v") else "e")
+        self.tabla.grid(row=1, column=0, sticky="ew")
+        barra = ttk.Scrollbar(fta, orient="vertical"); barra.grid(row=1, column=1, sticky="ns")
+        self.vista_arcos = TablaVirtual(self.tabla, barra)
+        self.tabla.bind("<Double-1>", self._editar_capacidad_dialogo)
+
+        ttk.Separator(lateral).grid(row=23, column=0, sticky="ew", pady=8)
+
+        f = ttk.Frame(lateral); f.grid(row=24, column=0, sticky="ew")
+        ttk.Button(f, text="🆕 Nuevo", command=self.nuevo_grafo).grid(row=0, column=0, padx=2)
+        ttk.Button(f, text="📂 Abrir JSON", command=self.abrir_json).grid(row=0, column=1, padx=2)
+        ttk.Button(f, text="💾 Guardar JSON", command=self.guardar_json).grid(row=0, column=2, padx=2)
+        ttk.Button(f, text="📤 Exportar flujo", command=self.exportar_csv).grid(row=0, column=3, padx=2)
+        # NUEVO: Limpiar lienzo (resultados/zoom)
+        ttk.Button(f, text="🧹 Limpiar lienzo", command=self.limpiar_lienzo).grid(row=0, column=4, padx=2)
+        # cortes minimos entre todos los pares (arbol de Gomory–Hu, arcos como no dirigidos)
+        ttk.Button(f, text="🔗 Matriz de cortes (CSV)", command=self.exportar_matriz_cortes).grid(row=1, column=0, columnspan=2, padx=2, pady=(4,0), sticky="w")
+        self.var_solo_flujo = tk.BooleanVar(value=False)
+        ttk.Checkbutton(f, text="Exportar solo arcos con flujo", variable=self.var_solo_flujo).grid(row=1, column=2, columnspan=3, padx=2, pady=(4,0), sticky="w")
+        self.var_detalle_export = tk.BooleanVar(value=True)
+        ttk.Checkbutton(f, text="Incluir aumentos y rutas", variable=self.var_detalle_export).grid(row=2, column=2, columnspan=3, padx=2, pady=(2,0), sticky="w")
+
+        ley = ttk.Frame(lateral); ley.grid(row=25, column=0, sticky="ew", pady=(8,0))
+        ttk.Label(ley, text="🚩 Inicio/fuente   🏁 Destino/sumidero   📦 Intermedio", style="Tag.TLabel").grid(row=0, column=0, sticky="w")
+        ttk.Label(ley, text="naranja: con flujo  •  gris: sin flujo  •  rojo discontinuo: arco del corte minimo  •  linea punteada: corte aproximado  •  rueda: zoom  •  medio/derecho o espacio+izquierdo: pan", style="Tag.TLabel").grid(row=1, column=0, sticky="w")
+
+        ttk.Button(lateral, text="🔎 Ver todas las rutas (resumen)", command=self.mostrar_rutas).grid(row=26, column=0, sticky="w", pady=(10,0))
+
+    def _vincular_eventos(self):
+        # click izquierdo habitual
+        self.lienzo.bind("<Button-1>", self._click_lienzo)
+        self.lienzo.bind("<B1-Motion>", self._arrastrar_lienzo)
+        self.lienzo.bind("<ButtonRelease-1>", self._soltar_lienzo)
+
+        # paneo con boton medio o derecho
+        self.lienzo.bind("<Button-2>", self._pan_inicio)
+        self.lienzo.bind("<B2-Motion>", self._pan_mover)
+        self.lienzo.bind("<ButtonRelease-2>", self._pan_fin)
+        self.lienzo.bind("<Button-3>", self._pan_inicio)
+        self.lienzo.bind("<B3-Motion>", self._pan_mover)
+        self.lienzo.bind("<ButtonRelease-3>", self._pan_fin)
+
+        # zoom rueda
+        self.lienzo.bind("<MouseWheel>", self._on_mousewheel)
+        self.lienzo.bind("<Button-4>", lambda e: self._zoom_en_cursor(e, +1))
+        self.lienzo.bind("<Button-5>", lambda e: self._zoom_en_cursor(e, -1))
+
+        # atajos de teclado
+        self.bind("+", lambda e: self._zoom_centrado(+1))
+        self.bind("-", lambda e: self._zoom_centrado(-1))
+        self.bind("=", lambda e: self._zoom_centrado(+1))
+
+        # paneo con espacio: presionar y soltar
+        self.bind("<KeyPress-space>", self._space_press)
+        self.bind("<KeyRelease-space>", self._space_release)
+        self.bind("<Escape>", lambda e: self.cancelar_calculo())
+
+    # Helpers de feedback
+    def _estado(self, msg):
+        if hasattr(self, "lbl_estado"):
+            self.lbl_estado.config(text=msg)
+
+    def _tip(self, msg=""):
+        if hasattr(self, "lbl_tip"):
+            self.lbl_tip.config(text=msg)
+
+    def _on_modo_cambiado(self):
+        m = self.modo_var.get()
+        self.arco_pendiente_desde = None
+        if m == "agregar_nodo":
+            self._estado("Modo: Añadir nodo")
+            self._tip("Click en el lienzo para crear un nodo.")
+        elif m == "mover_nodo":
+            self._estado("Modo: Mover nodo")
+            self._tip("Arrastra un nodo para reposicionarlo.")
+        elif m == "agregar_arco":
+            self._estado("Modo: Añadir arco")
+            self._tip("Click en el nodo origen y luego en el nodo destino.")
+        elif m == "eliminar":
+            self._estado("Modo: Eliminar")
+            self._tip("Click sobre un nodo o sobre una arista para eliminar.")
+        elif m == "renombrar":
+            self._estado("Modo: Renombrar")
+            self._tip("Click sobre un nodo para renombrarlo.")
+
+    # grafico
+    def _dibujar_cuadricula(self):
+        self.lienzo.delete("grid")
+        w = self.lienzo.winfo_width(); h = self.lienzo.winfo_height()
+        paso_world = 24
+        paso = max(8, int(paso_world * self.zoom))
+        if paso <= 0: paso = 8
+        ox = int(self.offset[0]) % paso
+        oy = int(self.offset[1]) % paso
+        for x in range(ox, w, paso):
+            self.lienzo.create_line(x,0,x,h, fill="#f0f2f6", tags="grid")
+        for y in range(oy, h, paso):
+            self.lienzo.create_line(0,y,w,y, fill="#f0f2f6", tags="grid")
+        self.lienzo.tag_lower("grid")
+
+    def redibujar(self):
+        """Pide reconstruir la escena completa y el panel. Solo para cambios de estructura o de
+        resultados; mover nodos, pan y zoom actualizan los items existentes (ver _reubicar_*)."""
+        self._pedir_redibujo("cuadricula", "arcos", "nodos", "panel")
+
+    # planificador de redibujo
+    def _pedir_redibujo(self, *partes):
+        """Marca partes sucias y agenda un unico cuadro (after_idle, o after si el ultimo fue hace
+        menos de INTERVALO_CUADRO_MS). Los pedidos que llegan antes de ese cuadro se combinan."""
+        self.redibujos_pedidos += 1
+        self._sucio.update(partes)
+        if self._id_redibujo is not None: return
+        espera = INTERVALO_CUADRO_MS - (time.perf_counter() - self._ultimo_cuadro) * 1000.0
+        if espera <= 0:
+            self._id_redibujo = self.after_idle(self._ejecutar_redibujo)
+        else:
+            self._id_redibujo = self.after(int(espera) + 1, self._ejecutar_redibujo)
+
+    def _ejecutar_redibujo(self):
+        self._id_redibujo = None
+        self._ultimo_cuadro = time.perf_counter()
+        self.redibujos_ejecutados += 1
+        sucio, self._sucio = self._sucio, set()
+        dx, dy = self._pan_pendiente; self._pan_pendiente = [0.0, 0.0]
+        movidos, self._nodos_movidos = self._nodos_movidos, set()
+
+        if sucio & {"cuadricula", "vista"} or dx or dy:
+            self._dibujar_cuadricula()
+        if "arcos" in sucio:
+            # arcos y nodos se reconstruyen juntos (los nodos van encima de los arcos)
+            self._dibujar_escena()
+        else:
+            if "vista" in sucio: self._reubicar_escena()
+            elif dx or dy: self._desplazar_escena(dx, dy)
+            elif not self._escena_cubre_vista(): self._dibujar_escena()
+            for nid in movidos:
+                if nid < len(self.modelo.nodos): self._reubicar_nodo_y_arcos(nid)
+            if "nodos" in sucio: self._redibujar_capa_nodos()
+        if "panel" in sucio:
+            self._refrescar_combos_nodo()
+            self._refrescar_tabla_arcos()
+
+    # culling: solo lo que cae en la vista (con margen), con nivel de detalle segun zoom y cantidad
+    def _rect_visible(self, margen=0.0):
+        w = self.lienzo.winfo_width(); h = self.lienzo.winfo_height()
+        x0, y0 = self.s2w(-margen*w, -margen*h)
+        x1, y1 = self.s2w(w*(1+margen), h*(1+margen))
+        return x0, y0, x1, y1
+
+    def _visibles(self, rect):
+        ie = self.modelo.indice_espacial()
+        return ie.nodos_en(*rect), ie.arcos_en(*rect)
+
+    def _elegir_lod(self, n_vis, m_vis):
+        if n_vis > LOD_MAX_NODOS: return "masivo"
+        if self.zoom < LOD_ZOOM_DETALLE or n_vis + m_vis > LOD_MAX_DETALLE: return "simple"
+        return "detalle"
+
+    def _escena_cubre_vista(self):
+        if self._rect_dibujado is None: return False
+        x0, y0, x1, y1 = self._rect_visible()
+        d0, e0, d1, e1 = self._rect_dibujado
+        return d0 <= x0 and e0 <= y0 and x1 <= d1 and y1 <= e1
+
+    def _dibujar_escena(self):
+        self.lienzo.delete("escena")
+        self._items_nodo = {}; self._items_arco = {}; self._item_corte = None; self._estrellas = {}
+        rect = self._rect_dibujado = self._rect_visible(MARGEN_VISTA)
+        nodos, arcos = self._visibles(rect)
+        self._nivel_lod = nivel = self._elegir_lod(len(nodos), len(arcos))
+
+        if nivel == "masivo":
+            self._dibujar_masivo(nodos, arcos)
+        elif nivel == "simple":
+            self._dibujar_estrellas(arcos)
+        else:
+            cap = self.modelo.capacidad
+            for (u,v) in sorted(arcos):
+                self._dibujar_arco(u,v,cap(u,v))
+
+        if self.corte_S and len(self.corte_S) < len(self.modelo.nodos):
+            p1, p2 = self._linea_corte_mediatriz(self.corte_S)
+            if p1 and p2:
+                p1s = self.w2s(*p1); p2s = self.w2s(*p2)
+                linea = self.lienzo.create_line(p1s[0], p1s[1], p2s[0], p2s[1],
+                                                dash=(6,4), width=2, fill="#6C757D", tags="escena")
+                mx = (p1s[0]+p2s[0])/2; my = (p1s[1]+p2s[1])/2
+                texto = self.lienzo.create_text(mx+8, my-8, text="Corte mínimo", tags="escena",
+                                                anchor="w", fill="#6C757D", font=("Segoe UI", 9, "bold"))
+                self._item_corte = (linea, texto)
+
+        if nivel != "masivo":
+            self._dibujar_nodos(nodos)
+
+    def _dibujar_nodos(self, nodos):
+        nodos_m = self.modelo.nodos
+        for i in sorted(nodos):
+            x, y, nombre = nodos_m[i]
+            self._dibujar_nodo(i, x, y, nombre, simple=(self._nivel_lod == "simple"))
+
+    def _redibujar_capa_nodos(self):
+        """Solo cambian nodos (color, nombre, icono): se recrea su capa, que ya va encima de los arcos."""
+        if self._nivel_lod == "masivo" or self._rect_dibujado is None:
+            self._dibujar_escena(); return
+        self.lienzo.delete("capa_nodos")
+        self._items_nodo = {}
+        self._dibujar_nodos(self.modelo.indice_espacial().nodos_en(*self._rect_dibujado))
+
+    def _color_nodo(self, nid):
+        if nid == self.id_inicio or nid in self.fuentes: return "#198754"
+        if nid == self.id_destino or nid in self.sumideros: return "#DC3545"
+        return "#0D6EFD"
+
+    def _dibujar_estrellas(self, arcos):
+        """Nivel simple: los arcos de cada nodo origen en una polilinea por color (sin flechas ni textos)."""
+        grupos = {}
+        corte = self._pares_corte
+        for (u,v) in arcos:
+            # 2: arco del corte, 1: con flujo, 0: sin flujo
+            estado = 2 if (u,v) in corte else int(self.ultimo_flujo.get((u,v), 0.0) > self.umbral_flujo)
+            grupos.setdefault((u, estado), []).append(v)
+        for (u, estado), vs in sorted(grupos.items()):
+            item = self.lienzo.create_line(*self._puntos_estrella(u, vs), width=(1, 2, 2)[estado],
+                                           fill=("#9aa0a6", "#FF8C00", "#DC3545")[estado], tags="escena")
+            self._estrellas.setdefault(u, []).append((item, vs))
+
+    def _puntos_estrella(self, u, vs):
+        nodos = self.modelo.nodos
+        ux, uy = self.w2s(nodos[u][0], nodos[u][1])
+        pts = [ux, uy]
+        for v in vs:
+            pts.extend(self.w2s(nodos[v][0], nodos[v][1])); pts.append(ux); pts.append(uy)
+        return pts
+
+    def _dibujar_masivo(self, nodos, arcos):
+        """Nivel masivo: nodos agregados por celda de pantalla y arcos como segmentos celda→celda."""
+        c = CELDA_MASIVO
+        nodos_m = self.modelo.nodos
+        celda_de = {}
+        cuenta = {}
+        for i in nodos:
+            sx, sy = self.w2s(nodos_m[i][0], nodos_m[i][1])
+            k = (int(sx // c), int(sy // c))
+            celda_de[i] = k; cuenta[k] = cuenta.get(k, 0) + 1
+        segmentos = {}
+        for (u,v) in arcos:
+            ku = celda_de.get(u); kv = celda_de.get(v)
+            if ku is None or kv is None or ku == kv: continue
+            con_flujo = self.ultimo_flujo.get((u,v), 0.0) > self.umbral_flujo
+            segmentos[(ku, kv)] = segmentos.get((ku, kv), False) or con_flujo
+        # con demasiados segmentos se conservan primero los que llevan flujo
+        orden = sorted(segmentos.items(), key=lambda kv: not kv[1])[:LOD_MAX_SEGMENTOS]
+        grupos = {}
+        for (ku, kv), con_flujo in orden:
+            grupos.setdefault((ku, con_flujo), []).append(kv)
+        for (ku, con_flujo), kvs in grupos.items():
+            cx, cy = ku[0]*c + c/2, ku[1]*c + c/2
+            pts = [cx, cy]
+            for kv in kvs: pts += [kv[0]*c + c/2, kv[1]*c + c/2, cx, cy]
+            self.lienzo.create_line(*pts, width=1, fill="#FF8C00" if con_flujo else "#c4c7cc", tags="escena")
+        maximo = max(cuenta.values(), default=1)
+        for (i, j), k in cuenta.items():
+            tono = int(200 - 150 * k / maximo)
+            self.lienzo.create_rectangle(i*c+1, j*c+1, (i+1)*c-1, (j+1)*c-1, outline="",
+                                         fill=f"#{tono:02x}{tono+30:02x}ff", tags="escena")
+        for nid in (self.id_inicio, self.id_destino, *self.fuentes, *self.sumideros):
+            if nid is not None and nid in celda_de:
+                sx, sy = self.w2s(nodos_m[nid][0], nodos_m[nid][1])
+                self.lienzo.create_oval(sx-6, sy-6, sx+6, sy+6, fill=self._color_nodo(nid),
+                                        outline="#1b1b1b", tags="escena")
+
+    # escena retenida: actualizar coordenadas sin recrear items
+    def _reubicar_nodo(self, nid):
+        items = self._items_nodo.get(nid)
+        if items is None: return
+        x, y, _ = self.modelo.nodos[nid]
+        sx, sy = self.w2s(x, y)
+        r = max(6, RADIO_NODO * self.zoom)
+        halo, circulo, icono, nombre = items
+        c = self.lienzo
+        c.coords(circulo, sx-r, sy-r, sx+r, sy+r)
+        if halo is None: return
+        c.coords(halo, sx-r-2, sy-r-2, sx+r+2, sy+r+2)
+        c.coords(icono, sx, sy-2)
+        c.coords(nombre, sx, sy+12)
+
+    def _reubicar_arco(self, u, v, con_flecha=False):
+        items = self._items_arco.get((u,v))
+        if items is None: return
+        linea, rect, texto, ancho, anotaciones = items
+        sx,sy,ex,ey,_ = self._coords_arco(u,v)
+        ssx, ssy = self.w2s(sx, sy)
+        eex, eey = self.w2s(ex, ey)
+        c = self.lienzo
+        c.coords(linea, ssx, ssy, eex, eey)
+        if con_flecha:
+            c.itemconfigure(linea, arrowshape=(12*self.zoom, 14*self.zoom, 5*self.zoom))
+        midx, midy = (ssx+eex)/2, (ssy+eey)/2
+        c.coords(rect, midx-4, midy-18, midx+ancho, midy-2)
+        c.coords(texto, midx+2, midy-10)
+        for item, dx, dy in anotaciones:
+            c.coords(item, midx+dx, midy+dy)
+
+    def _reubicar_estrella(self, u):
+        for item, vs in self._estrellas.get(u, ()):
+            self.lienzo.coords(item, *self._puntos_estrella(u, vs))
+
+    def _reubicar_corte(self):
+        if self._item_corte is None: return
+        p1, p2 = self._linea_corte_mediatriz(self.corte_S)
+        if not (p1 and p2): return
+        p1s = self.w2s(*p1); p2s = self.w2s(*p2)
+        linea, texto = self._item_corte
+        self.lienzo.coords(linea, p1s[0], p1s[1], p2s[0], p2s[1])
+        self.lienzo.coords(texto, (p1s[0]+p2s[0])/2+8, (p1s[1]+p2s[1])/2-8)
+
+    def _reubicar_nodo_y_arcos(self, nid):
+        """Tras mover un nodo: solo sus items, los de sus arcos incidentes y la linea de corte."""
+        if self._nivel_lod == "masivo":
+            self._dibujar_escena(); return
+        self._reubicar_nodo(nid)
+        if self._nivel_lod == "simple":
+            self._reubicar_estrella(nid)
+            for u, _ in self.modelo.entrantes(nid): self._reubicar_estrella(u)
+        else:
+            for v, _ in self.modelo.salientes(nid): self._reubicar_arco(nid, v)
+            for u, _ in self.modelo.entrantes(nid): self._reubicar_arco(u, nid)
+        self._reubicar_corte()
+
+    def _reubicar_escena(self):
+        """Tras un zoom: si la escena sigue cubriendo la vista con el mismo nivel de detalle se
+        reubican los items existentes; si no, se regenera solo la parte visible."""
+        if self._escena_cubre_vista():
+            nodos, arcos = self._visibles(self._rect_visible(MARGEN_VISTA))
+            mismo_nivel = self._elegir_lod(len(nodos), len(arcos)) == self._nivel_lod
+        else:
+            mismo_nivel = False
+        if not mismo_nivel or self._nivel_lod == "masivo":
+            self._dibujar_escena(); return
+        for (u, v) in self._items_arco: self._reubicar_arco(u, v, con_flecha=True)
+        for u in self._estrellas: self._reubicar_estrella(u)
+        self._reubicar_corte()
+        for nid in self._items_nodo: self._reubicar_nodo(nid)
+
+    def _desplazar_escena(self, dx, dy):
+        """Pan: traslada todos los items de la escena de una vez. Si la vista sale del area
+        ya dibujada, se regenera la escena visible."""
+        self.lienzo.move("escena", dx, dy)
+        if not self._escena_cubre_vista():
+            self._dibujar_escena()
+
+    def _icono_nodo(self, nid):
+        if nid == self.id_inicio or nid in self.fuentes: return "🚩"
+        if nid == self.id_destino or nid in self.sumideros: return "🏁"
+        return "📦"
+
+    def _dibujar_nodo(self, nid, x, y, nombre, simple=False):
+        sx, sy = self.w2s(x, y)
+        r = max(6, RADIO_NODO * self.zoom)
+        tags = (f"nodo_{nid}", "escena", "capa_nodos")
+        if simple:
+            # nivel simple: solo el circulo, sin halo, emoji ni nombre
+            circulo = self.lienzo.create_oval(sx-r, sy-r, sx+r, sy+r, fill=self._color_nodo(nid), outline="", tags=tags)
+            self._items_nodo[nid] = (None, circulo, None, None)
+            return
+        halo = self.lienzo.create_oval(sx-r-2, sy-r-2, sx+r+2, sy+r+2,
+                                       fill="#E9F2FF", outline="", tags=tags)
+        circulo = self.lienzo.create_oval(sx-r, sy-r, sx+r, sy+r, fill=self._color_nodo(nid), outline="#1b1b1b",
+                                          width=1.5, tags=tags)
+        icono = self.lienzo.create_text(sx, sy-2, text=self._icono_nodo(nid), font=("Segoe UI Emoji", 12), fill="white", tags=tags)
+        texto = self.lienzo.create_text(sx, sy+12, text=nombre, fill="white", font=("Segoe UI", 9, "bold"), tags=tags)
+        self._items_nodo[nid] = (halo, circulo, icono, texto)
+
+    def _coords_arco(self, u, v):
+        x1,y1,_ = self.modelo.nodos[u]; x2,y2,_ = self.modelo.nodos[v]
+        ang = math.atan2(y2-y1, x2-x1)
+        sx = x1 + RADIO_NODO*math.cos(ang); sy = y1 + RADIO_NODO*math.sin(ang)
+        ex = x2 - RADIO_NODO*math.cos(ang); ey = y2 - RADIO_NODO*math.sin(ang)
+        return sx,sy,ex,ey,ang
+
+    def _log_acumulado_arco(self, u, v):
+        return self.acumulados.de(u, v)
+
+    def _dibujar_arco(self, u, v, capacidad):
+        sx,sy,ex,ey,_ = self._coords_arco(u,v)
+        ssx, ssy = self.w2s(sx, sy)
+        eex, eey = self.w2s(ex, ey)
+        flujo = self.ultimo_flujo.get((u,v), 0.0)
+
+        color = "#FF8C00" if flujo > self.umbral_flujo else "#5f6368"
+        base = 2 + (math.log2(flujo+1)*4 if flujo > self.umbral_flujo else 0)
+        grosor = max(2, min(10, int(base)))
+        arrow = (12*self.zoom, 14*self.zoom, 5*self.zoom)
+        en_corte = (u,v) in self._pares_corte
+        if en_corte: color = "#DC3545"; grosor = max(grosor, 3)
+
+        tags = (f"arco_{u}_{v}", "escena")
+        linea = self.lienzo.create_line(ssx,ssy,eex,eey, arrow=tk.LAST, width=grosor, fill=color, smooth=True,
+                                        arrowshape=arrow, tags=tags, **({"dash": (8,4)} if en_corte else {}))
+
+        midx, midy = (ssx+eex)/2, (ssy+eey)/2
+        etiqueta = f"{capacidad:g}"
+        ancho = 4+7*len(etiqueta)/2
+        rect = self.lienzo.create_rectangle(midx-4, midy-18, midx+ancho, midy-2, fill="#ffffff", outline="", stipple="gray25", tags=tags)
+        texto = self.lienzo.create_text(midx+2, midy-10, text=etiqueta, fill="#111", font=("Segoe UI", 9), tags=tags)
+
+        # anotaciones: (item, dx, dy) relativos al punto medio para poder reubicarlas
+        anotaciones = []
+        def anotar(dx, dy, **kw):
+            anotaciones.append((self.lienzo.create_text(midx+dx, midy+dy, anchor="w", tags=tags, **kw), dx, dy))
+
+        palette = ["#6f42c1", "#0d6efd", "#198754", "#fd7e14", "#d63384", "#20c997", "#845ef7", "#12b886"]
+        totales = self._log_acumulado_arco(u, v)
+        if totales:
+            yoff = 10
+            nombre_u = self.modelo.nodos[u][2]
+            for i, total in enumerate(totales):
+                col = palette[i % len(palette)]
+                anotar(0, yoff, text="[", fill=col, font=("Consolas", 9))
+                x1 = 7*1
+                anotar(x1, yoff, text=nombre_u, fill="#444", font=("Consolas", 9))
+                x2 = x1 + 7*len(nombre_u)
+                anotar(x2, yoff, text=",", fill=col, font=("Consolas", 9))
+                x3 = x2 + 7*2
+                num_txt = f"{total:g}"
+                anotar(x3, yoff, text=num_txt, fill="#DC3545", font=("Consolas", 9, "bold"))
+                x4 = x3 + 7*len(num_txt)
+                anotar(x4, yoff, text="]", fill=col, font=("Consolas", 9))
+                yoff += 14
+        self._items_arco[(u,v)] = (linea, rect, texto, ancho, anotaciones)
+
+    def _refrescar_combos_nodo(self):
+        nombres = [n[2] for n in self.modelo.nodos]
+        if hasattr(self, "combo_inicio"):
+            self.combo_inicio["values"] = nombres
+            if self.id_inicio is not None and self.id_inicio < len(nombres):
+                self.combo_inicio.set(nombres[self.id_inicio])
+        if hasattr(self, "combo_destino"):
+            self.combo_destino["values"] = nombres
+            if self.id_destino is not None and self.id_destino < len(nombres):
+                self.combo_destino.set(nombres[self.id_destino])
+
+    def _refrescar_tabla_arcos(self):
+        """Tabla virtual de arcos: indices de orden y filtro por version del modelo y del resultado;
+        cada refresco solo reescribe las filas visibles que cambiaron."""
+        modelo = self.modelo
+        version = (id(modelo), modelo.version, self._version_resultado)
+        ind = self._indices_arcos
+        if ind.get("version") != version:
+            ind.clear(); ind["version"] = version
+            arcos, nodos, costos, flujo = modelo.arcos, modelo.nodos, modelo.costos, self.ultimo_flujo
+            def fila(i):
+                u, v, c = arcos[i]
+                f = flujo.get((u, v)) if flujo else None
+                return (nodos[u][2], nodos[v][2], f"{c:g}", f"{costos[i]:g}", "" if f is None else f"{f:g}")
+            claves = {"u": lambda i: nodos[arcos[i][0]][2], "v": lambda i: nodos[arcos[i][1]][2],
+                      "cap": lambda i: arcos[i][2], "costo": costos.__getitem__,
+                      "flujo": lambda i: flujo.get((arcos[i][0], arcos[i][1]), 0.0)}
+            self.vista_arcos.cargar(len(arcos), fila, version, claves)
+        texto = self.entrada_filtro.get().strip().lower() if hasattr(self, "entrada_filtro") else ""
+        saturados = self.var_saturados.get() if hasattr(self, "var_saturados") else False
+        if ind.get("filtro") != (texto, saturados):
+            ind["filtro"] = (texto, saturados)
+            self.vista_arcos.filtrar(self._filtro_arcos(texto, saturados))
+        else:
+            self.vista_arcos.refrescar()
+
+    def _filtro_arcos(self, texto, saturados):
+        """Filas de la tabla de arcos que pasan el filtro (None = todas), desde la adyacencia del
+        modelo y el conjunto de saturados, ambos armados una vez por version."""
+        ind = self._indices_arcos; modelo = self.modelo
+        filas = None
+        if texto:
+            pos = ind.get("pos")
+            if pos is None:
+                pos = ind["pos"] = {(u, v): i for i, (u, v, _) in enumerate(modelo.arcos)}
+            filas = set()
+            for nid, (_, _, nombre) in enumerate(modelo.nodos):
+                if texto in nombre.lower():
+                    filas.update(pos[(nid, v)] for v, _ in modelo.salientes(nid))
+                    filas.update(pos[(u, nid)] for u, _ in modelo.entrantes(nid))
+        if saturados:
+            sat = ind.get("saturados")
+            if sat is None:
+                flujo, eps = self.ultimo_flujo, self.umbral_flujo
+                sat = ind["saturados"] = {i for i, (u, v, c) in enumerate(modelo.arcos)
+                                          if flujo.get((u, v), 0.0) >= c - eps}
+            filas = sat if filas is None else filas & sat
+        return filas
+
+    # NUEVO: refrescar la tabla de rutas (iteraciones)
+    def _refrescar_tabla_rutas(self):
+        if not hasattr(self, "vista_rutas"):
+            return
+        # cada ruta (iteracion o camino/ciclo de la descomposicion) con su peso; el texto se arma
+        # solo para las filas visibles
+        n, texto, peso = self._fuente_rutas()
+        self.vista_rutas.cargar(n, lambda i: (texto(i), f"{peso(i):g}"),
+                                (self._version_resultado, self._usa_descomposicion()), {"peso": peso})
+
+    # corte minimo en mundo
+    def _linea_corte_mediatriz(self, Sset):
+        if not self.modelo.nodos: return None, None
+        Tset = [i for i in range(len(self.modelo.nodos)) if i not in Sset]
+        if not Sset or not Tset: return None, None
+        sx = sum(self.modelo.nodos[i][0] for i in Sset)/len(Sset)
+        sy = sum(self.modelo.nodos[i][1] for i in Sset)/len(Sset)
+        tx = sum(self.modelo.nodos[i][0] for i in Tset)/len(Tset)
+        ty = sum(self.modelo.nodos[i][1] for i in Tset)/len(Tset)
+        if abs(sx-tx) < 1e-6 and abs(sy-ty) < 1e-6:
+            w = self.lienzo.winfo_width(); h = self.lienzo.winfo_height()
+            xm, _ = self.s2w(sx, 0)
+            return (xm, 0), (xm, h)
+        vx, vy = tx - sx, ty - sy
+        mx, my = (sx+tx)/2, (sy+ty)/2
+        dx, dy = -vy, vx
+        norm = math.hypot(dx, dy)
+        if norm < 1e-9: dx, dy = 1.0, 0.0
+        else: dx, dy = dx/norm, dy/norm
+        w = self.lienzo.winfo_width(); h = self.lienzo.winfo_height()
+        L = max(w, h) / self.zoom * 2.0
+        return (mx - dx*L, my - dy*L), (mx + dx*L, my + dy*L)
+
+    # busquedas hit test
+    def _buscar_nodo_en(self, sx, sy):
+        x, y = self.s2w(sx, sy)
+        r2 = (RADIO_NODO + 2)**2
+        nodos = self.modelo.nodos
+        # candidatos de la rejilla espacial; gana el id menor como en el recorrido completo
+        for i in sorted(self.modelo.indice_espacial().nodos_cerca(x, y, RADIO_NODO + 2)):
+            nx, ny, _ = nodos[i]
+            if (nx-x)**2 + (ny-y)**2 <= r2:
+                return i
+        return None
+
+    def _buscar_arco_en(self, sx, sy):
+        mejor=None; mejor_d=8.0
+        x, y = self.s2w(sx, sy)
+        for (u,v) in self.modelo.indice_espacial().arcos_cerca(x, y, mejor_d / self.zoom):
+            wx1,wy1,wx2,wy2,_ = self._coords_arco(u,v)
+            x1,y1 = self.w2s(wx1,wy1); x2,y2 = self.w2s(wx2,wy2)
+            dx,dy = x2-x1, y2-y1
+            if abs(dx)<1e-9 and abs(dy)<1e-9: continue
+            t = max(0, min(1, ((sx-x1)*dx + (sy-y1)*dy)/(dx*dx+dy*dy)))
+            qx,qy = x1 + t*dx, y1 + t*dy
+            d = math.hypot(sx-qx, sy-qy)
+            if d < mejor_d: mejor_d=d; mejor=(u,v)
+        return mejor
+
+    # interaccion principal con soporte de espacio para pan
+    def _click_lienzo(self, e):
+        # si se mantiene espacio, iniciar paneo con izquierdo
+        if self.space_down:
+            self._pan_inicio(e)
+            return
+
+        modo = self.modo_var.get()
+        if modo == "agregar_nodo":
+            try:
+                wx, wy = self.s2w(e.x, e.y)
+                self.modelo.agregar_nodo(wx, wy, None)
+                self._sincronizar_motor("agregar_nodo")
+                self._limpiar_resultados(); self.redibujar()
+                self._estado("Nodo creado.")
+                self._tip("Cámbialo de posición con 'Mover nodo' si lo necesitas.")
+            except Exception as ex:
+                messagebox.showerror("Error", str(ex))
+                self._estado("No se pudo crear el nodo.")
+        elif modo == "agregar_arco":
+            nid = self._buscar_nodo_en(e.x, e.y)
+            if nid is None:
+                if self.arco_pendiente_desde is not None:
+                    self._estado("Selección de arco cancelada.")
+                    self._tip("Vuelve a elegir origen y destino.")
+                    self.arco_pendiente_desde = None
+                return
+            if self.arco_pendiente_desde is None:
+                self.arco_pendiente_desde = nid
+                self.lbl_resultado.config(text=f"Elige destino desde {self.modelo.nodos[nid][2]}")
+                self._estado(f"Origen: {self.modelo.nodos[nid][2]} seleccionado.")
+                self._tip("Ahora haz click en el nodo destino.")
+            else:
+                if nid == self.arco_pendiente_desde:
+                    self.arco_pendiente_desde = None
+                    self._estado("Selección de arco cancelada.")
+                    self._tip("Elige origen y un destino distinto.")
+                    return
+                # Validación amable de capacidad
+                try:
+                    cap_str = self.entrada_capacidad.get().strip()
+                    if not cap_str:
+                        raise ValueError("Ingrese una capacidad.")
+                    cap = _capacidad(cap_str)
+                    if cap <= 0:
+                        raise ValueError("La capacidad debe ser > 0")
+                    costo_str = self.entrada_costo.get().strip() if hasattr(self, "entrada_costo") else ""
+                    costo = float(costo_str) if costo_str else 0.0
+                    if costo < 0:
+                        raise ValueError("El costo debe ser >= 0")
+                except Exception as ex:
+                    messagebox.showerror("Capacidad o costo inválido", str(ex))
+                    self._estado("No se pudo crear el arco.")
+                    self.arco_pendiente_desde = None
+                    self._tip("Intenta nuevamente: elige origen y destino.")
+                    return
+                try:
+                    self.modelo.agregar_arco(self.arco_pendiente_desde, nid, cap, costo)
+                    self._sincronizar_motor("agregar_arco", self.arco_pendiente_desde, nid, cap)
+                    self._estado(f"Arco creado: {self.modelo.nodos[self.arco_pendiente_desde][2]} → {self.modelo.nodos[nid][2]} ({cap:g})")
+                    self._tip("Puedes crear otro arco o cambiar de modo.")
+                    self.arco_pendiente_desde = None
+                    self._limpiar_resultados(); self.redibujar()
+                except Exception as ex:
+                    messagebox.showerror("Error al crear arco", str(ex))
+                    self._estado("No se pudo crear el arco.")
+                    self.arco_pendiente_desde = None
+                    self._tip("Verifica que no exista un arco en sentido contrario.")
+        elif modo == "mover_nodo":
+            self.nodo_arrastre = self._buscar_nodo_en(e.x, e.y)
+            if self.nodo_arrastre is not None:
+                wx, wy = self.s2w(e.x, e.y)
+                nx, ny, _ = self.modelo.nodos[self.nodo_arrastre]
+                self.offset_arrastre_world = (wx - nx, wy - ny)
+        elif modo == "eliminar":
+            nid = self._buscar_nodo_en(e.x, e.y)
+            if nid is not None:
+                if messagebox.askyesno("Eliminar", f"¿Eliminar nodo {self.modelo.nodos[nid][2]} y sus arcos?"):
+                    movido = self.modelo.eliminar_nodo(nid)
+                    self.motor = None   # el ultimo nodo pasa a ocupar el id borrado
+                    if self.id_inicio == nid: self.id_inicio=None
+                    elif movido is not None and self.id_inicio == movido: self.id_inicio=nid
+                    if self.id_destino == nid: self.id_destino=None
+                    elif movido is not None and self.id_destino == movido: self.id_destino=nid
+                    for extra in (self.fuentes, self.sumideros):
+                        extra.pop(nid, None)
+                        if movido is not None and movido in extra: extra[nid] = extra.pop(movido)
+                    self._limpiar_resultados(); self.redibujar()
+                    self._estado("Elemento eliminado.")
+                    self._tip("")
+                return
+            ed = self._buscar_arco_en(e.x, e.y)
+            if ed:
+                u,v = ed
+                if messagebox.askyesno("Eliminar arco", f"¿Eliminar {self.modelo.nodos[u][2]} → {self.modelo.nodos[v][2]}?"):
+                    self.modelo.eliminar_arco(u,v)
+                    self._sincronizar_motor("eliminar_arco", u, v)
+                    self._limpiar_resultados(); self.redibujar()
+                    self._estado("Elemento eliminado.")
+                    self._tip("")
+        elif modo == "renombrar":
+            nid = self._buscar_nodo_en(e.x, e.y)
+            if nid is not None: self._dialogo_renombrar_nodo(nid)
+
+    def _arrastrar_lienzo(self, e):
+        # si espacio presionado, pan con izquierdo durante el arrastre
+        if self.space_down and self.paneando:
+            self._pan_mover(e)
+            return
+        if self.modo_var.get()=="mover_nodo" and self.nodo_arrastre is not None:
+            wx, wy = self.s2w(e.x, e.y)
+            dx, dy = self.offset_arrastre_world
+            nx = wx - dx
+            ny = wy - dy
+            sx, sy = self.w2s(nx, ny)
+            r = RADIO_NODO * self.zoom + 4
+            sx = max(r, min(self.lienzo.winfo_width()-r, sx))
+            sy = max(r, min(self.lienzo.winfo_height()-r, sy))
+            nx, ny = self.s2w(sx, sy)
+            self.modelo.mover_nodo(self.nodo_arrastre, nx, ny)
+            self._nodos_movidos.add(self.nodo_arrastre)
+            self._pedir_redibujo()
+
+    def _soltar_lienzo(self, e):
+        # terminar paneo si venia con espacio+izquierdo
+        if self.space_down and self.paneando:
+            self._pan_fin(e)
+            return
+        self.nodo_arrastre=None
+
+    # paneo comun (medio/derecho o espacio+izquierdo)
+    def _pan_inicio(self, e):
+        self.paneando = True
+        self.pan_origen = (e.x, e.y)
+        self.offset_ini = (self.offset[0], self.offset[1])
+        self.lienzo.configure(cursor="fleur")
+
+    def _pan_mover(self, e):
+        if not self.paneando: return
+        dx = e.x - self.pan_origen[0]
+        dy = e.y - self.pan_origen[1]
+        previo = tuple(self.offset)
+        self.offset[0] = self.offset_ini[0] + dx
+        self.offset[1] = self.offset_ini[1] + dy
+        # se acumula el desplazamiento hasta el proximo cuadro
+        self._pan_pendiente[0] += self.offset[0] - previo[0]
+        self._pan_pendiente[1] += self.offset[1] - previo[1]
+        self._pedir_redibujo()
+
+    def _pan_fin(self, _e):
+        self.paneando = False
+        self.lienzo.configure(cursor="")
+
+    # zoom
+    def _on_mousewheel(self, e):
+        direction = 1 if e.delta > 0 else -1
+        self._zoom_en_cursor(e, direction)
+
+    def _zoom_en_cursor(self, e, direction):
+        old_zoom = self.zoom
+        factor = 1.1 if direction > 0 else (1/1.1)
+        new_zoom = max(0.3, min(4.0, old_zoom * factor))
+        if abs(new_zoom - old_zoom) < 1e-6:
+            return
+        wx, wy = self.s2w(e.x, e.y)
+        self.zoom = new_zoom
+        self.offset[0] = e.x - wx * self.zoom
+        self.offset[1] = e.y - wy * self.zoom
+        self._pedir_redibujo("vista")
+
+    def _zoom_centrado(self, direction):
+        cx = self.lienzo.winfo_width()//2
+        cy = self.lienzo.winfo_height()//2
+        dummy = type("E", (), {"x": cx, "y": cy})
+        self._zoom_en_cursor(dummy, direction)
+
+    # teclado espacio para pan
+    def _space_press(self, _e):
+        self.space_down = True
+        self.lienzo.configure(cursor="fleur")
+
+    def _space_release(self, _e):
+        self.space_down = False
+        if not self.paneando:
+            self.lienzo.configure(cursor="")
+
+    # dialogos
+    def _dialogo_renombrar_nodo(self, nid):
+        win = tk.Toplevel(self); win.title("Renombrar nodo")
+        ttk.Label(win, text="Nuevo nombre:").grid(row=0, column=0, padx=8, pady=8)
+        e = ttk.Entry(win); e.grid(row=0, column=1, padx=8, pady=8); e.insert(0, self.modelo.nodos[nid][2])
+        def ok():
+            nuevo = e.get().strip()
+            if not nuevo: messagebox.showerror("Error", "Nombre vacío"); return
+            try:
+                self.modelo.renombrar_nodo(nid, nuevo)
+                # los nombres no cambian la version: orden y filtro por nombre se rehacen aparte
+                self._indices_arcos.pop("filtro", None); self.vista_arcos.invalidar()
+                self._pedir_redibujo("nodos", "panel"); win.destroy()
+                self._estado("Nodo renombrado.")
+                self._tip("")
+            except Exception as ex: messagebox.showerror("Error", str(ex))
+        ttk.Button(win, text="Guardar", command=ok).grid(row=1, column=0, columnspan=2, pady=8)
+
+    def _editar_capacidad_dialogo(self, event):
+        item = self.tabla.identify_row(event.y)
+        if not item: return
+        i = self.vista_arcos.fila_de_item(item)
+        if i is None: return
+        u, v, _ = self.modelo.arcos[i]
+        self._dialogo_capacidad(u, v)
+
+    def _dialogo_capacidad(self, u, v):
+        win = tk.Toplevel(self); win.title("Editar arco")
+        ttk.Label(win, text=f"Arco {self.modelo.nodos[u][2]} → {self.modelo.nodos[v][2]}").grid(row=0, column=0, columnspan=2, padx=8, pady=(8,4))
+        ttk.Label(win, text="Capacidad:").grid(row=1, column=0, padx=8, pady=8)
+        e = ttk.Entry(win); e.grid(row=1, column=1, padx=8, pady=8)
+        cap = self.modelo.capacidad(u, v); e.insert(0, str(cap))   # sin :g, que redondea a 6 cifras
+        ttk.Label(win, text="Costo:").grid(row=2, column=0, padx=8, pady=(0,8))
+        ec = ttk.Entry(win); ec.grid(row=2, column=1, padx=8, pady=(0,8))
+        ec.insert(0, f"{self.modelo.costo(u, v):g}")
+        def ok():
+            try:
+                nueva = _capacidad(e.get())
+                if nueva <= 0: raise ValueError("Capacidad > 0")
+                costo = float(ec.get() or 0)
+                if costo < 0: raise ValueError("Costo >= 0")
+                self.modelo.actualizar_capacidad(u, v, nueva)
+                self.modelo.actualizar_costo(u, v, costo)
+                self._sincronizar_motor("actualizar_capacidad", u, v, nueva)
+                self._limpiar_resultados(); self.redibujar(); win.destroy()
+                self._estado("Arco actualizado.")
+                self._tip("Vuelve a calcular si quieres ver el impacto en el flujo.")
+            except Exception as ex: messagebox.showerror("Error", str(ex))
+        ttk.Button(win, text="Guardar", command=ok).grid(row=3, column=0, columnspan=2, pady=8)
+
+    # acciones
+    def establecer_inicio(self):
+        nombre = self.combo_inicio.get()
+        if not nombre: return
+        nid = self.modelo.nombre_a_id.get(nombre)
+        if nid is None: messagebox.showerror("Error", "Nombre de inicio no válido."); return
+        self.id_inicio = nid; self._pedir_redibujo("nodos")
+        self._estado(f"Inicio: {nombre}")
+        self._tip("")
+
+    def establecer_destino(self):
+        nombre = self.combo_destino.get()
+        if not nombre: return
+        nid = self.modelo.nombre_a_id.get(nombre)
+        if nid is None: messagebox.showerror("Error", "Nombre de destino no válido."); return
+        self.id_destino = nid; self._pedir_redibujo("nodos")
+        self._estado(f"Destino: {nombre}")
+        self._tip("")
+
+    def _agregar_extremo(self, combo, extra, opuesto, texto):
+        nombre = combo.get()
+        if not nombre: return
+        nid = self.modelo.nombre_a_id.get(nombre)
+        if nid is None: messagebox.showerror("Error", f"Nombre de {texto} no válido."); return
+        crudo = self.entrada_tope.get().strip()
+        try:
+            tope = float(crudo) if crudo else None
+            if tope is not None and tope < 0: raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "La oferta/demanda debe ser un número ≥ 0 o quedar vacía."); return
+        opuesto.pop(nid, None)
+        if opuesto is self.sumideros and self.id_destino == nid: self.id_destino = None
+        if opuesto is self.fuentes and self.id_inicio == nid: self.id_inicio = None
+        extra[nid] = tope; self.motor = None; self._pedir_redibujo("nodos")
+        self._estado(f"{texto.capitalize()} agregado: {nombre}" + ("" if tope is None else f" (tope {tope:g})"))
+        self._tip("")
+
+    def agregar_fuente(self):
+        self._agregar_extremo(self.combo_inicio, self.fuentes, self.sumideros, "fuente")
+
+    def agregar_sumidero(self):
+        self._agregar_extremo(self.combo_destino, self.sumideros, self.fuentes, "sumidero")
+
+    def quitar_extremos_extra(self):
+        self.fuentes.clear(); self.sumideros.clear(); self.motor = None
+        self._pedir_redibujo("nodos")
+        self._estado("Fuentes y sumideros adicionales quitados.")
+        self._tip("")
+
+    def _extremos(self):
+        """({fuente: tope}, {sumidero: tope}) efectivos: inicio/destino sin tope mas los agregados con ＋."""
+        fuentes = {} if self.id_inicio is None else {self.id_inicio: None}
+        sumideros = {} if self.id_destino is None else {self.id_destino: None}
+        fuentes.update(self.fuentes); sumideros.update(self.sumideros)
+        return fuentes, sumideros
+
+    def _ruta_de_iteracion(self, it):
+        nombres = [self.modelo.nodos[u][2] for (u, _) in it["camino"]]
+        nombres.append(self.modelo.nodos[it["camino"][-1][1]][2])
+        return " → ".join(nombres)
+
+    def _usa_descomposicion(self):
+        # sin bitacora (p. ej. push-relabel) la descomposicion es la unica fuente de rutas
+        elegida = self.combo_rutas.get() if hasattr(self, "combo_rutas") else "iteraciones"
+        return elegida == "descomposición" or (not self.iteraciones and bool(self.ultimo_flujo))
+
+    def _fuente_rutas(self):
+        """(n, texto(i), peso(i)) de la fuente elegida, sin armar los textos por adelantado; los
+        ciclos de la descomposicion van marcados con ↻."""
+        nodos = self.modelo.nodos
+        if not self._usa_descomposicion():
+            it = self.iteraciones
+            return len(it), lambda i: " → ".join(nodos[v][2] for v in it.nodos(i)), it.cuello
+        if self._descomposicion is None:
+            fuentes, sumideros = self._extremos()
+            if not fuentes or not sumideros: return 0, None, None
+            self._descomposicion = descomponer_flujo(self.ultimo_flujo, set(fuentes), set(sumideros), self.umbral_flujo)
+        d = self._descomposicion
+        return (len(d), lambda i: ("↻ " if d[i]["tipo"] == "ciclo" else "") + " → ".join(nodos[v][2] for v in d[i]["nodos"]),
+                lambda i: d[i]["flujo"])
+
+    def _rutas(self):
+        """[(texto, peso)] de todas las rutas de la fuente elegida."""
+        n, texto, peso = self._fuente_rutas()
+        return [(texto(i), peso(i)) for i in range(n)]
+
+    def _registros_rutas(self):
+        """Rutas de la fuente elegida como registros de descomponer_flujo, para exportar_flujo. Es
+        un generador: se recorre en el hilo de la exportacion, y ahi se calcula la descomposicion
+        si todavia no se pidio."""
+        if not self._usa_descomposicion():
+            return ({"tipo": "camino", "nodos": nodos, "flujo": cuello} for nodos, cuello in self.iteraciones.entradas())
+        if self._descomposicion is not None:
+            return iter(self._descomposicion)
+        fuentes, sumideros = self._extremos()
+        if not fuentes or not sumideros: return iter(())
+        flujo, umbral = self.ultimo_flujo, self.umbral_flujo
+
+        def diferida():
+            yield from descomponer_flujo(flujo, set(fuentes), set(sumideros), umbral)
+        return diferida()
+
+    def _total_rutas(self):
+        if not self._usa_descomposicion(): return self.acumulados.total
+        return sum(r["flujo"] for r in self._descomposicion or () if r["tipo"] == "camino")
+
+    def _actualizar_desglose_panel(self):
+        n, _, peso = self._fuente_rutas()
+        if not n:
+            self.lbl_pesos.config(text="—"); self.lbl_total.config(text="")
+            self._refrescar_tabla_rutas()
+            return
+        partes = " + ".join(f"{peso(i):g}" for i in range(min(n, MAX_PESOS_ETIQUETA)))
+        if n > MAX_PESOS_ETIQUETA: partes += f" + … ({n} rutas)"
+        total = self._total_rutas()
+        self.lbl_pesos.config(text=partes)
+        self.lbl_total.config(text=f"Total: {total:g}")
+        # NUEVO: también refrescar “Rutas”
+        self._refrescar_tabla_rutas()
+
+    def mostrar_rutas(self):
+        rutas = self._rutas()
+        if not rutas:
+            messagebox.showinfo("Rutas", "Primero calcula el flujo máximo."); return
+        win = tk.Toplevel(self); win.title("Rutas encontradas"); win.geometry("760x420")
+        total_flujo = self._total_rutas()
+        resumen = {}
+        for ruta, peso in rutas:
+            d = resumen.setdefault(ruta, {"flujo": 0.0, "count": 0})
+            d["flujo"] += peso; d["count"] += 1
+        ttk.Label(win, text="Resumen por ruta", font=("Segoe UI", 11, "bold")).pack(anchor="w", padx=10, pady=(10,4))
+        tree_res = ttk.Treeview(win, columns=("ruta","flujo","iters"), show="headings", height=12)
+        tree_res.heading("ruta", text="Ruta")
+        tree_res.heading("flujo", text="Flujo (pesos)")
+        tree_res.heading("iters", text="Veces")
+        tree_res.column("ruta", width=520, anchor="w")
+        tree_res.column("flujo", width=130, anchor="e")
+        self.lienzo.update_idletasks()
+        tree_res.column("iters", width=90, anchor="center")
+        barra = ttk.Scrollbar(win, orient="vertical"); barra.pack(side="right", fill="y", padx=(0,10))
+        tree_res.pack(fill="both", expand=True, padx=(10,0))
+        filas = list(resumen.items())
+        TablaVirtual(tree_res, barra).cargar(
+            len(filas), lambda i: (filas[i][0], f"{filas[i][1]['flujo']:g}", filas[i][1]["count"]),
+            claves={"ruta": lambda i: filas[i][0], "flujo": lambda i: filas[i][1]["flujo"],
+                    "iters": lambda i: filas[i][1]["count"]})
+        ttk.Label(win, text=f"Total de flujo: {total_flujo:g}", font=("Segoe UI", 10, "bold")).pack(anchor="e", padx=10, pady=8)
+
+    def _sincronizar_motor(self, metodo, *args):
+        """Reenvia una edicion del modelo al motor del ultimo calculo para re-resolver en caliente."""
+        if self.motor is None: return
+        if not self.var_incremental.get():
+            self.motor = None; return
+        try:
+            getattr(self.motor, metodo)(*args)
+        except Exception:
+            self.motor = None
+
+    def _limpiar_resultados(self):
+        self._version_resultado += 1
+        if isinstance(self._calculo, _Exportacion):
+            self._calculo.control.cancelar()     # exportaba justamente estos resultados
+        self.ultimo_flujo.clear(); self.iteraciones.clear(); self.ultimo_valor = 0.0; self.ultimo_costo = None
+        self.acumulados = IndiceAcumulado(); self._descomposicion = None
+        self.corte_S = set(); self.corte_linea = None
+        self.corte = None; self._pares_corte = set()
+        self._motor_resultado = None
+        self.lbl_resultado.config(text="Flujo máximo: —")
+        self.lbl_pesos.config(text="—"); self.lbl_total.config(text="")
+        self._refrescar_tabla_rutas()
+
+    def limpiar_lienzo(self):
+        """NUEVO: limpia resultados visuales y resetea vista (no borra el grafo)."""
+        self._limpiar_resultados()
+        # reset de zoom/pan
+        self.zoom = 1.0
+        self.offset = [0.0, 0.0]
+        self.redibujar()
+        self._estado("Lienzo limpiado (resultados y vista).")
+        self._tip("El grafo se mantiene. Usa 'Nuevo' para vaciarlo.")
+
+    def calcular_flujo_maximo(self, motor=None):
+        """motor: "ek", "escalado", "dinic", "push_relabel", "costo_minimo" o "auto" (por defecto, el elegido en el panel).
+
+        Resuelve en un hilo aparte sobre una instantanea del modelo; el progreso se lee con
+        after() (_sondear_calculo) y un resultado de un modelo que cambio se descarta."""
+        if self._calculo is not None:
+            self._estado("Ya hay un cálculo o una exportación en curso.")
+            self._tip("Espera a que termine o cancélalo (Esc).")
+            return
+        fuentes, sumideros = self._extremos()
+        if not fuentes or not sumideros:
+            messagebox.showwarning("Faltan datos", "Selecciona Inicio y Destino.")
+            self._estado("Selecciona inicio y destino para calcular.")
+            self._tip("Usa las listas desplegables del panel derecho.")
+            return
+        if motor is None:
+            motor = self.combo_motor.get() if hasattr(self, "combo_motor") else "auto"
+        # varias fuentes/sumideros o topes: super-fuente y super-sumidero en un motor nuevo
+        multiple = (len(fuentes) > 1 or len(sumideros) > 1
+                    or any(t is not None for t in (*fuentes.values(), *sumideros.values())))
+        incremental = (not multiple and self.motor is not None and self.var_incremental.get()
+                       and motor in ("auto", self.motor.nombre))
+        calc = _Calculo(self.modelo, self.motor if incremental else motor, fuentes, sumideros,
+                        multiple, incremental)
+        calc.registro = self.combo_registro.get() if hasattr(self, "combo_registro") else "completo"
+        # el hilo es dueño del motor hasta que termine: las ediciones no se le reenvian
+        self.motor = None
+        self._calculo = calc
+        self.btn_cancelar.state(["!disabled"])
+        calc.hilo = threading.Thread(target=calc.correr, daemon=True)
+        calc.hilo.start()
+        calc.hilo.join(ESPERA_INICIAL_S)
+        self._sondear_calculo()
+
+    def cancelar_calculo(self):
+        if self._calculo is not None:
+            self._calculo.control.cancelar()
+            self._estado("Cancelando…")
+
+    def _sondear_calculo(self):
+        calc = self._calculo
+        if calc is None:
+            return
+        obsoleto = calc.modelo is not self.modelo or calc.version != self.modelo.version
+        if obsoleto:
+            calc.control.cancelar()     # el resultado ya no sirve: que el hilo pare cuanto antes
+        if calc.hilo.is_alive():
+            c = calc.control
+            if not c.cancelado:
+                self._estado(f"Calculando… {c.aumentos} aumentos · flujo {c.valor:g} · {c.transcurrido():.1f} s")
+                self._tip("Esc o «■ Cancelar» detienen el cálculo.")
+            self.after(SONDEO_MS, self._sondear_calculo)
+            return
+        self._calculo = None
+        self.btn_cancelar.state(["disabled"])
+        if obsoleto or (calc.fuentes, calc.sumideros) != self._extremos():
+            self._estado("El grafo cambió durante el cálculo; se descartó el resultado.")
+            self._tip("Vuelve a calcular para ver el flujo del grafo actual.")
+        elif calc.cancelado:
+            self._estado("Cálculo cancelado.")
+            self._tip("El resultado anterior se mantiene.")
+        elif calc.error is not None:
+            messagebox.showerror("Error", str(calc.error))
+            self._estado("No se pudo calcular el flujo.")
+            self._tip("Revisa el grafo y vuelve a intentar.")
+        else:
+            self._aplicar_resultado(calc)
+
+    def _aplicar_resultado(self, calc):
+        ek, valor, mapa_flujo, iteraciones, corte = calc.resultado
+        con_costo = isinstance(ek, FlujoCostoMinimo)
+        # no se reusa con nodos auxiliares ni con costos (las ediciones no llevan costo)
+        self.motor = None if calc.multiple or con_costo else ek
+        self._version_resultado += 1
+        self.ultimo_flujo = mapa_flujo
+        self.ultimo_valor = valor
+        self.umbral_flujo = ek.umbral
+        self._motor_resultado = ek
+        self.iteraciones = iteraciones
+        self.acumulados = IndiceAcumulado(iteraciones)
+        self._descomposicion = None
+        self.ultimo_costo = ek.costo_total if con_costo else None
+        costo_txt = f"  ·  costo: {ek.costo_total:g}" if con_costo else ""
+        self.lbl_resultado.config(text=f"Flujo máximo: {valor:g}{costo_txt}")
+        self._actualizar_desglose_panel()
+        # corte desde el residual final del motor (sin otro recorrido)
+        self.corte = corte
+        self.corte_S = corte.S; self._pares_corte = corte.pares
+        self._pedir_redibujo("arcos", "panel")
+        if valor <= self.umbral_flujo:
+            self._estado("No existe camino s→t con capacidad disponible.")
+            self._tip("Añade arcos o revisa las capacidades.")
+        else:
+            modo = ", incremental" if calc.incremental else ""
+            if calc.multiple: modo = f", {len(calc.fuentes)} fuentes → {len(calc.sumideros)} sumideros"
+            self._estado(f"¡Flujo máximo calculado! (motor: {ek.nombre}{modo}, {calc.control.transcurrido():.2f} s)")
+            if corte.consistente():
+                self._tip(f"Corte mínimo: {len(corte.arcos)} arcos, capacidad {corte.capacidad:g} (= flujo).")
+            else:
+                self._tip(f"⚠ El corte ({corte.capacidad:g}) no coincide con el flujo ({valor:g}).")
+
+    def nuevo_grafo(self):
+        if not messagebox.askyesno("Nuevo", "¿Vaciar el grafo actual?"): return
+        self.modelo = ModeloGrafo(avisar=messagebox.showwarning); self.id_inicio=None; self.id_destino=None; self.motor=None
+        self.fuentes.clear(); self.sumideros.clear()
+        self._limpiar_resultados(); self.redibujar()
+        self._estado("Grafo vacío creado.")
+        self._tip("Añade nodos con 'Añadir nodo'.")
+
+    def guardar_json(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", title="Guardar grafo",
+                                            filetypes=[("JSON","*.json"), ("Binario compacto","*.mfb")])
+        if not path: return
+        try:
+            if path.lower().endswith(".mfb"): self.modelo.exportar_binario(path)
+            else: self.modelo.exportar_json(path)
+            messagebox.showinfo("Guardado","Grafo guardado.")
+            self._estado("Grafo guardado correctamente.")
+            self._tip("")
+        except Exception as ex:
+            messagebox.showerror("Error", str(ex))
+            self._estado("No se pudo guardar el grafo.")
+
+    def abrir_json(self):
+        path = filedialog.askopenfilename(filetypes=[("Grafos","*.json *.mfb"), ("JSON","*.json"), ("Binario compacto","*.mfb")],
+                                          title="Abrir grafo")
+        if not path: return
+        try:
+            if path.lower().endswith(".mfb"): self.modelo.importar_binario(path)
+            else: self.modelo.importar_json(path)
+            self.id_inicio=None; self.id_destino=None; self.motor=None
+            self.fuentes.clear(); self.sumideros.clear()
+            self._limpiar_resultados(); self.redibujar()
+            self._estado("Grafo cargado.")
+            self._tip("Selecciona inicio y destino si quieres calcular el flujo.")
+        except Exception as ex:
+            messagebox.showerror("Error", str(ex))
+            self._estado("No se pudo abrir el archivo.")
+
+    def exportar_matriz_cortes(self):
+        n = len(self.modelo.nodos)
+        if n < 2:
+            messagebox.showwarning("Sin datos", "Se necesitan al menos dos nodos."); return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")], title="Exportar matriz de cortes")
+        if not path: return
+        try:
+            arbol = ArbolGomoryHu.desde_modelo(self.modelo)
+            arbol.exportar_matriz_csv(path, [nd[2] for nd in self.modelo.nodos])
+            messagebox.showinfo("Exportado", "Matriz de cortes exportada correctamente.")
+            self._estado(f"Matriz de cortes: {arbol.resoluciones} resoluciones para {n} nodos.")
+            self._tip("Los arcos se toman como no dirigidos (caso simétrico).")
+        except Exception as ex:
+            messagebox.showerror("Error", str(ex))
+            self._estado("No se pudo exportar la matriz de cortes.")
+
+    def exportar_csv(self):
+        """Exporta el flujo por arco (CSV o JSONL, .gz comprime) en un hilo aparte, leyendo los
+        arreglos del motor del ultimo resultado por bloques (io_grafo.exportar_flujo)."""
+        if self._motor_resultado is None:
+            messagebox.showwarning("Sin resultados","Primero calcula el flujo máximo.");
+            self._estado("No hay resultados para exportar.")
+            self._tip("Calcula el flujo y vuelve a intentar.")
+            return
+        if self._calculo is not None:
+            self._estado("Ya hay un cálculo o una exportación en curso.")
+            self._tip("Espera a que termine o cancélalo (Esc).")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", title="Exportar flujo",
+                                            filetypes=[("CSV","*.csv"), ("CSV comprimido","*.csv.gz"),
+                                                       ("JSON Lines","*.jsonl"), ("JSON Lines comprimido","*.jsonl.gz")])
+        if not path: return
+        nombres = [nd[2] for nd in self.modelo.nodos]
+        resumen = {"flujo_maximo": self.ultimo_valor}
+        if self.ultimo_costo is not None: resumen["costo_total"] = self.ultimo_costo
+        if self.corte is not None:
+            resumen["corte_minimo"] = [(nombres[u], nombres[v], c, f) for u, v, c, f in self.corte.arcos]
+            resumen["topes_corte"] = [(nombres[x], tipo, c) for tipo, x, c in self.corte.topes]
+            resumen["capacidad_corte"] = self.corte.capacidad
+            resumen["corte_consistente"] = self.corte.consistente()
+        solo = self.var_solo_flujo.get() if hasattr(self, "var_solo_flujo") else False
+        detalle = self.var_detalle_export.get() if hasattr(self, "var_detalle_export") else True
+        acumulados = self.acumulados if detalle and self.acumulados.posicion else None
+        rutas = self._registros_rutas() if detalle else None
+        exp = _Exportacion(self.modelo, self._motor_resultado, path, solo, resumen, self.motor, acumulados, rutas)
+        # el hilo lee los arreglos del motor: las ediciones no se le reenvian mientras tanto
+        self.motor = None
+        self._calculo = exp
+        self.btn_cancelar.state(["!disabled"])
+        exp.hilo = threading.Thread(target=exp.correr, daemon=True)
+        exp.hilo.start()
+        exp.hilo.join(ESPERA_INICIAL_S)
+        self._sondear_exportacion()
+
+    def _sondear_exportacion(self):
+        exp = self._calculo
+        if exp is None:
+            return
+        obsoleto = exp.modelo is not self.modelo or exp.version != self.modelo.version
+        if obsoleto:
+            exp.control.cancelar()
+        if exp.hilo.is_alive():
+            if not exp.control.cancelado:
+                self._estado(f"Exportando… {exp.escritas} arcos · {exp.control.transcurrido():.1f} s")
+                self._tip("Esc o «■ Cancelar» detienen la exportación.")
+            self.after(SONDEO_MS, self._sondear_exportacion)
+            return
+        self._calculo = None
+        self.btn_cancelar.state(["disabled"])
+        if not obsoleto: self.motor = exp.reusable
+        if exp.cancelado:
+            self._estado("El grafo cambió durante la exportación; se canceló." if obsoleto else "Exportación cancelada.")
+            self._tip("No se dejó el archivo a medio escribir.")
+        elif exp.error is not None:
+            messagebox.showerror("Error", str(exp.error))
+            self._estado("No se pudo exportar el flujo.")
+        else:
+            self._estado(f"Flujo exportado: {exp.escritas} arcos en {exp.control.transcurrido():.1f} s.")
+            self._tip("")
@@ -0,0 +1,454 @@
+"""Carga en streaming de grafos grandes (JSON de la app y listas de arcos `u v capacidad`),
+formato binario compacto (.mfb) que se carga por mmap sin copiar los arreglos, y exportacion
+del flujo por bloques (CSV o JSONL, opcionalmente gzip) leyendo los arreglos del motor.
+
+El resultado es un GrafoCompacto: nombres, coordenadas y arcos en arreglos planos
+(array('i')/array('d')), sin tuplas intermedias. Las capacidades se guardan en array('q')
+mientras todas sean enteras, asi los motores las toman exactas (modo entero). Los duplicados u→v se acumulan (con el
+costo del primero) y los
+arcos opuestos v→u se descartan con un indice hash en una sola pasada, igual que
+ModeloGrafo.importar_json.
+"""
+import csv
+import gzip
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import islice
+
+from modelo_grafo import ModeloGrafo, _capacidad
+from motor_flujo import MAX_ENTERO, TOLERANCIA, FlujoCostoMinimo, _enteras, _tipo, crear_motor
+
+EXTENSIONES_LISTA = (".txt", ".tsv", ".edges", ".el")
+EXTENSION_BINARIA = ".mfb"
+
+# formato binario (little-endian): cabecera, nombres UTF-8 separados por NUL (con relleno hasta
+# multiplo de 8) y despues x, y (f64 × n), u, v (i32 × m), capacidad (i64 o f64 × m), costo (f64 × m)
+MAGIA = b"MAXFLOW\0"
+VERSION_BINARIA = 1
+CABECERA = struct.Struct("<8sHHIQQQ")   # magia, version, banderas, reservado, n, m, bytes de nombres
+CAP_ENTERA = 1                          # bandera: capacidades en i64
+
+BLOQUE_EXPORTACION = 1 << 16            # arcos por bloque escrito al exportar el flujo
+NIVEL_GZIP = 6                          # el 9 por defecto de gzip cuesta el doble y comprime casi igual
+
+
+class GrafoCompacto:
+    def __init__(self):
+        self.nombres = []
+        self.x = array("d"); self.y = array("d")
+        self.u = array("i"); self.v = array("i"); self.cap = array("q")   # pasa a "d" con la primera no entera
+        self.costo = array("d")         # costo por unidad de flujo (0 si el archivo no lo trae)
+        self.opuestos_eliminados = 0
+        self.version = None             # version del ModeloGrafo copiado (ModeloGrafo.instantanea)
+        self.mapa = None                # mmap del archivo binario (los arreglos son vistas sobre el)
+        self._indice = {}               # (u << 32) | v -> posicion del arco
+
+    @property
+    def n(self):
+        return len(self.nombres)
+
+    @property
+    def m(self):
+        return len(self.u)
+
+    def agregar_nodo(self, nombre, x, y):
+        self.nombres.append(nombre); self.x.append(x); self.y.append(y)
+        return len(self.nombres) - 1
+
+    def agregar_arco(self, u, v, c, costo=0.0):
+        if self.cap.typecode == "q":
+            if float(c).is_integer() and c < MAX_ENTERO: c = int(c)
+            else: self.cap = array("d", self.cap)
+        clave = (u << 32) | v
+        i = self._indice.get(clave)
+        if i is not None:
+            if self.cap.typecode == "q" and self.cap[i] + c >= MAX_ENTERO: self.cap = array("d", self.cap)
+            self.cap[i] += c
+        elif ((v << 32) | u) in self._indice:
+            self.opuestos_eliminados += 1
+        else:
+            self._indice[clave] = len(self.u)
+            self.u.append(u); self.v.append(v); self.cap.append(c); self.costo.append(costo)
+
+    def terminar(self):
+        """Libera el indice de carga; el grafo ya no admite arcos nuevos."""
+        self._indice = None
+        return self
+
+    def a_motor(self, nombre="auto", registro="completo", tolerancia=TOLERANCIA):
+        """Motor con los arreglos de este grafo adoptados tal cual (sin copiarlos)."""
+        mo = crear_motor(nombre, self.n, self.m, registro, tolerancia=tolerancia)
+        if isinstance(mo, FlujoCostoMinimo):
+            mo.cargar_arreglos(self.u, self.v, self.cap, self.costo)
+        else:
+            mo.cargar_arreglos(self.u, self.v, self.cap)
+        return mo
+
+    def a_modelo(self, avisar=None):
+        modelo = ModeloGrafo(avisar=avisar)
+        modelo.cargar_compacto(self)
+        return modelo
+
+
+class _LectorJSON:
+    """Lector JSON incremental: decodifica un valor por vez sobre un buffer que se rellena por bloques."""
+
+    def __init__(self, f, bloque=1 << 16):
+        self.f = f; self.bloque = bloque
+        self.buf = ""; self.pos = 0; self.eof = False
+        self.dec = json.JSONDecoder()
+
+    def _rellenar(self):
+        trozo = self.f.read(self.bloque)
+        if not trozo:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + trozo
+        self.pos = 0
+        return True
+
+    def mirar(self):
+        while True:
+            buf = self.buf; pos = self.pos; n = len(buf)
+            while pos < n and buf[pos] in " \t\r\n":
+                pos += 1
+            self.pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self._rellenar():
+                return ""
+
+    def consumir(self, esperado):
+        ch = self.mirar()
+        if ch not in esperado:
+            raise ValueError(f"JSON inválido: se esperaba {esperado!r} y llegó {ch!r}")
+        self.pos += 1
+        return ch
+
+    def valor(self):
+        self.mirar()
+        while True:
+            try:
+                obj, fin = self.dec.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof or not self._rellenar():
+                    raise
+                continue
+            # un numero al final del buffer puede seguir en el proximo bloque
+            if fin == len(self.buf) and not self.eof and self._rellenar():
+                continue
+            self.pos = fin
+            return obj
+
+
+def iterar_json_grafo(f, claves=("nodos", "arcos")):
+    """Recorre el objeto raiz y produce (clave, elemento) de los arreglos pedidos sin cargar el archivo entero."""
+    lec = _LectorJSON(f)
+    lec.consumir("{")
+    if lec.mirar() == "}":
+        return
+    while True:
+        clave = lec.valor()
+        lec.consumir(":")
+        if clave in claves and lec.mirar() == "[":
+            lec.consumir("[")
+            if lec.mirar() == "]":
+                lec.consumir("]")
+            else:
+                while True:
+                    yield clave, lec.valor()
+                    if lec.consumir(",]") == "]":
+                        break
+        else:
+            lec.valor()
+        if lec.consumir(",}") == "}":
+            return
+
+
+def cargar_json_streaming(path):
+    g = GrafoCompacto()
+    pendientes = None
+    with open(path, "r", encoding="utf-8") as f:
+        for clave, el in iterar_json_grafo(f):
+            if clave == "nodos":
+                g.agregar_nodo(el["nombre"], float(el["x"]), float(el["y"]))
+            else:
+                u, v, c = int(el["u"]), int(el["v"]), _capacidad(el["capacidad"])
+                costo = float(el.get("costo", 0.0))
+                if u < 0 or v < 0:
+                    # un id negativo haria chocar las claves (u << 32) | v del indice
+                    raise ValueError(f"Arco con nodo {min(u, v)} inexistente (los ids van desde 0)")
+                if u >= g.n or v >= g.n:
+                    # arcos antes que nodos: se validan al final
+                    pendientes = max(pendientes or 0, u, v)
+                g.agregar_arco(u, v, c, costo)
+    if pendientes is not None and pendientes >= g.n:
+        raise ValueError(f"Arco con nodo {pendientes} inexistente (hay {g.n} nodos)")
+    return g.terminar()
+
+
+def cargar_lista_arcos(path):
+    """Lista de arcos `u v capacidad [costo]` (espacios o tabuladores, `#` comenta). Los nodos se crean por nombre."""
+    g = GrafoCompacto()
+    ids = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for num, linea in enumerate(f, 1):
+            linea = linea.strip()
+            if not linea or linea.startswith("#"):
+                continue
+            partes = linea.split()
+            if len(partes) not in (3, 4):
+                raise ValueError(f"{path}:{num}: se esperaban 3 o 4 columnas (u v capacidad [costo])")
+            u = ids.get(partes[0])
+            if u is None: u = ids[partes[0]] = g.agregar_nodo(partes[0], 0.0, 0.0)
+            v = ids.get(partes[1])
+            if v is None: v = ids[partes[1]] = g.agregar_nodo(partes[1], 0.0, 0.0)
+            c = _capacidad(partes[2])
+            costo = float(partes[3]) if len(partes) == 4 else 0.0
+            if u == v or c <= 0 or costo < 0:
+                raise ValueError(f"{path}:{num}: arco invalido (lazo, capacidad <= 0 o costo < 0)")
+            g.agregar_arco(u, v, c, costo)
+    # sin coordenadas en el archivo: rejilla simple para poder abrirlo en la interfaz
+    cols = max(1, math.ceil(math.sqrt(g.n)))
+    for i in range(g.n):
+        g.x[i] = 80.0 + (i % cols) * 120.0
+        g.y[i] = 80.0 + (i // cols) * 100.0
+    return g.terminar()
+
+
+def _relleno(k):
+    return -k % 8
+
+
+def _seccion(xs, tc):
+    """xs como arreglo little-endian de tipo tc; sin copia si ya lo es."""
+    if _tipo(xs) != tc or sys.byteorder != "little":
+        xs = array(tc, xs)
+        if sys.byteorder != "little": xs.byteswap()
+    return memoryview(xs)
+
+
+def guardar_binario(g, path):
+    """Escribe un GrafoCompacto en formato binario; las capacidades van en i64 si son todas enteras."""
+    if any("\0" in nm for nm in g.nombres):
+        raise ValueError("Los nombres de nodo no pueden contener NUL en el formato binario")
+    nombres = "\0".join(g.nombres).encode("utf-8")
+    cap = g.cap
+    entera = _tipo(cap) == "q" or _enteras(cap)
+    if entera and _tipo(cap) != "q": cap = array("q", map(int, cap))
+    secciones = [_seccion(g.x, "d"), _seccion(g.y, "d"), _seccion(g.u, "i"), _seccion(g.v, "i"),
+                 _seccion(cap, "q" if entera else "d"), _seccion(g.costo, "d")]
+    with open(path, "wb") as f:
+        f.write(CABECERA.pack(MAGIA, VERSION_BINARIA, CAP_ENTERA if entera else 0, 0, g.n, g.m, len(nombres)))
+        f.write(nombres); f.write(bytes(_relleno(len(nombres))))
+        for sec in secciones:
+            f.write(sec); f.write(bytes(_relleno(sec.nbytes)))
+
+
+def cargar_binario(path):
+    """GrafoCompacto sobre un mmap del archivo: x, y, u, v, cap y costo son memoryview de solo
+    lectura que el motor adopta tal cual (los copia recien al modificarlos). Solo los nombres se decodifican."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < CABECERA.size:
+            raise ValueError(f"{path}: no es un grafo binario")
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magia, version, banderas, _, n, m, largo = CABECERA.unpack_from(mapa)
+    if magia != MAGIA:
+        raise ValueError(f"{path}: no es un grafo binario")
+    if version != VERSION_BINARIA:
+        raise ValueError(f"{path}: version de formato {version} no soportada")
+    tc = "q" if banderas & CAP_ENTERA else "d"
+    pos = CABECERA.size + largo + _relleno(largo)
+    esperado = pos + 16*n + 2*(4*m + _relleno(4*m)) + 16*m     # x, y | u, v | cap, costo
+    if len(mapa) != esperado:
+        raise ValueError(f"{path}: tamaño {len(mapa)} distinto del esperado {esperado} (archivo truncado?)")
+    vista = memoryview(mapa)
+
+    def seccion(codigo, k):
+        nonlocal pos
+        ancho = struct.calcsize(codigo)
+        trozo = vista[pos:pos + k*ancho].cast(codigo)
+        pos += k*ancho + _relleno(k*ancho)
+        if sys.byteorder != "little":
+            trozo = array(codigo, trozo); trozo.byteswap()    # sin vista directa: se copia
+        return trozo
+
+    g = GrafoCompacto()
+    g.nombres = str(vista[CABECERA.size:CABECERA.size + largo], "utf-8").split("\0") if n else []
+    if len(g.nombres) != n:
+        raise ValueError(f"{path}: {len(g.nombres)} nombres para {n} nodos")
+    g.x = seccion("d", n); g.y = seccion("d", n)
+    g.u = seccion("i", m); g.v = seccion("i", m)
+    g.cap = seccion(tc, m); g.costo = seccion("d", m)
+    g.mapa = mapa
+    return g.terminar()
+
+
+def cargar_grafo(path):
+    """Carga por extension: .json (formato de la app), binario (.mfb) o lista de arcos (.txt, .tsv, .edges, .el)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in EXTENSIONES_LISTA:
+        return cargar_lista_arcos(path)
+    if ext == EXTENSION_BINARIA:
+        return cargar_binario(path)
+    return cargar_json_streaming(path)
+
+
+def _escribir_lista(f, items, bloque):
+    # cierra un arreglo JSON ya abierto: un elemento por linea, escritos de a `bloque`
+    sep = "\n    "
+    for trozo in iter(lambda: list(islice(items, bloque)), []):
+        f.write(sep + ",\n    ".join(trozo))
+        sep = ",\n    "
+    f.write("\n  ]")
+
+
+def guardar_json(g, path, bloque=BLOQUE_EXPORTACION):
+    """Escribe un GrafoCompacto en el JSON de la app (el de ModeloGrafo.exportar_json) directo de
+    los arreglos, por bloques. Las capacidades enteras quedan como int, asi que tambien las
+    mayores que 2**53 se escriben exactas."""
+    cap = g.cap
+    if _tipo(cap) != "q" and _enteras(cap): cap = array("q", map(int, cap))
+    volcar = json.JSONEncoder(ensure_ascii=False).encode
+    nodos = (volcar({"id": i, "nombre": nm, "x": x, "y": y}) for i, (nm, x, y) in enumerate(zip(g.nombres, g.x, g.y)))
+    arcos = (volcar({"u": u, "v": v, "capacidad": c, **({"costo": w} if w else {})})
+             for u, v, c, w in zip(g.u, g.v, cap, g.costo))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "nodos": [')
+        _escribir_lista(f, nodos, bloque)
+        f.write(',\n  "arcos": [')
+        _escribir_lista(f, arcos, bloque)
+        f.write("\n}\n")
+
+
+def convertir(origen, destino):
+    """Convierte entre formatos segun las extensiones: a .mfb en binario, a cualquier otra en JSON de la app."""
+    g = cargar_grafo(origen)
+    if os.path.splitext(destino)[1].lower() == EXTENSION_BINARIA:
+        guardar_binario(g, destino)
+    else:
+        guardar_json(g, destino)
+    return g
+
+
+def iterar_flujo(motor, nombres, solo_con_flujo=False, bloque=BLOQUE_EXPORTACION, acumulados=None):
+    """Bloques de hasta `bloque` filas (nombre u, nombre v, capacidad, flujo) leidas de los arreglos
+    del motor. Omite los arcos eliminados (capacidad 0) y los de nodos auxiliares (>= len(nombres));
+    con solo_con_flujo, tambien los de flujo <= motor.umbral. Con acumulados (IndiceAcumulado)
+    cada fila suma los aumentos que usaron el arco y su acumulado final."""
+    g = motor._preparar()
+    n = len(nombres); eps = motor.umbral
+    us, vs, cs, cap, ranura = g._u, g._v, g._c, g.cap, g.ranura
+    filas = []
+    for i in range(g.m):
+        u = us[i]; v = vs[i]; c = cs[i]
+        if c <= 0 or u >= n or v >= n:
+            continue
+        f = c - cap[ranura[i]]
+        if solo_con_flujo and f <= eps:
+            continue
+        if acumulados is None:
+            filas.append((nombres[u], nombres[v], c, f))
+        else:
+            filas.append((nombres[u], nombres[v], c, f, len(acumulados.de(u, v)), acumulados.acumulado(u, v)))
+        if len(filas) == bloque:
+            yield filas
+            filas = []
+    if filas:
+        yield filas
+
+
+def _iterar_rutas(rutas, nombres, bloque):
+    # bloques de (tipo, [nombres], flujo); los nodos auxiliares del modo multiple no se nombran
+    n = len(nombres)
+    while True:
+        trozo = [(r["tipo"], [nombres[v] for v in r["nodos"] if v < n], r["flujo"]) for r in islice(rutas, bloque)]
+        if not trozo:
+            return
+        yield trozo
+
+
+def _formato_salida(path, formato, comprimir):
+    base = path[:-3] if path.lower().endswith(".gz") else path
+    if comprimir is None:
+        comprimir = base != path
+    if formato is None:
+        formato = "jsonl" if base.lower().endswith((".jsonl", ".ndjson")) else "csv"
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"Formato de exportacion desconocido: {formato!r} (csv o jsonl)")
+    return formato, comprimir
+
+
+def exportar_flujo(path, motor, nombres, formato=None, comprimir=None, solo_con_flujo=False,
+                   resumen=None, progreso=None, bloque=BLOQUE_EXPORTACION, acumulados=None, rutas=None):
+    """Escribe el flujo por arco del motor en CSV (u,v,capacidad,flujo) o JSONL (un objeto por arco)
+    por bloques, en memoria O(V + bloque). formato y comprimir salen de la extension si no se dan
+    (.csv, .jsonl, .ndjson, con .gz opcional).
+
+    Secciones opcionales:
+    - acumulados (IndiceAcumulado): columnas `aumentos` y `acumulado_aumentos` por arco.
+    - rutas: iterable de registros como los de descomponer_flujo ({"tipo", "nodos", "flujo"}),
+      que se recorre por bloques despues de los arcos (CSV: fila vacia, `tipo,ruta,flujo` y una
+      fila por ruta; JSONL: una linea {"ruta": {...}} por ruta).
+    - resumen: dict que se agrega al final (CSV: fila vacia y filas `clave,valor`, o `clave` y
+      una fila por elemento si es una lista; JSONL: una linea {"resumen": ...}).
+
+    progreso(filas_escritas) se llama tras cada bloque; si lanza una excepcion (p. ej.
+    CalculoCancelado) se borra el archivo a medio escribir. Devuelve la cantidad de arcos escritos."""
+    formato, comprimir = _formato_salida(path, formato, comprimir)
+    abrir = (lambda p: gzip.open(p, "wt", NIVEL_GZIP, encoding="utf-8", newline="")) if comprimir else \
+            (lambda p: open(p, "w", encoding="utf-8", newline=""))
+    escritas = 0
+    try:
+        with abrir(path) as f:
+            if formato == "csv":
+                w = csv.writer(f)
+                w.writerow(["u", "v", "capacidad", "flujo"] + (["aumentos", "acumulado_aumentos"] if acumulados else []))
+                for filas in iterar_flujo(motor, nombres, solo_con_flujo, bloque, acumulados):
+                    w.writerows(filas)
+                    escritas += len(filas)
+                    if progreso: progreso(escritas)
+                if rutas is not None:
+                    w.writerow([]); w.writerow(["tipo", "ruta", "flujo"])
+                    for trozo in _iterar_rutas(iter(rutas), nombres, bloque):
+                        w.writerows((tipo, " → ".join(nms), fl) for tipo, nms, fl in trozo)
+                        if progreso: progreso(escritas)
+                if resumen:
+                    w.writerow([])
+                    for clave, valor in resumen.items():
+                        if isinstance(valor, (list, tuple)):
+                            w.writerow([clave]); w.writerows(valor)
+                        else:
+                            w.writerow([clave, valor])
+            else:
+                # nombres ya escapados una vez: cada linea se arma con un f-string
+                escapados = [json.dumps(nm, ensure_ascii=False) for nm in nombres]
+                for filas in iterar_flujo(motor, escapados, solo_con_flujo, bloque, acumulados):
+                    if acumulados is None:
+                        f.write("".join(f'{{"u": {u}, "v": {v}, "capacidad": {c!r}, "flujo": {fl!r}}}\n'
+                                        for u, v, c, fl in filas))
+                    else:
+                        f.write("".join(f'{{"u": {u}, "v": {v}, "capacidad": {c!r}, "flujo": {fl!r}, '
+                                        f'"aumentos": {k}, "acumulado_aumentos": {a!r}}}\n'
+                                        for u, v, c, fl, k, a in filas))
+                    escritas += len(filas)
+                    if progreso: progreso(escritas)
+                if rutas is not None:
+                    for trozo in _iterar_rutas(iter(rutas), escapados, bloque):
+                        f.write("".join(f'{{"ruta": {{"tipo": "{tipo}", "nodos": [{", ".join(nms)}], "flujo": {fl!r}}}}}\n'
+                                        for tipo, nms, fl in trozo))
+                        if progreso: progreso(escritas)
+                if resumen:
+                    f.write(json.dumps({"resumen": resumen}, ensure_ascii=False) + "\n")
+    except BaseException:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    return escritas
@@ -0,0 +1,419 @@
+"""Modelo de datos del grafo (nodos, arcos, JSON) sin dependencias de interfaz."""
+import json
+import math
+import sys
+from array import array
+
+# modelo de grafo
+RADIO_NODO = 20
+
+class IndiceEspacial:
+    """Rejilla uniforme en coordenadas de mundo con nodos (centros) y arcos (segmentos).
+
+    Un arco se registra en todas las celdas que cruza su segmento centro-centro; las
+    consultas devuelven candidatos de las celdas que tocan el area pedida y el llamador
+    hace la prueba exacta. Los arcos usan su propia rejilla (`celda_arcos`, del orden del
+    largo medio de los arcos) para que un arco largo no ocupe cientos de celdas.
+    """
+
+    def __init__(self, celda=4*RADIO_NODO, celda_arcos=None):
+        self.celda = float(celda)
+        self.celda_arcos = float(celda_arcos or celda)
+        self._nodos = {}            # celda -> {nid}
+        self._arcos = {}            # celda -> {(u,v)}
+        self._celda_nodo = {}       # nid -> celda
+        self._celdas_arco = {}      # (u,v) -> [celdas]
+
+    @staticmethod
+    def _clave(x, y, c):
+        return (math.floor(x / c), math.floor(y / c))
+
+    def _celdas_segmento(self, x1, y1, x2, y2):
+        # recorrido DDA (Amanatides-Woo) de las celdas que atraviesa el segmento
+        c = self.celda_arcos
+        cx, cy = self._clave(x1, y1, c); ex, ey = self._clave(x2, y2, c)
+        dx, dy = x2 - x1, y2 - y1
+        paso_x = 1 if dx > 0 else -1; paso_y = 1 if dy > 0 else -1
+        tx = ((cx + (dx > 0)) * c - x1) / dx if dx else math.inf
+        ty = ((cy + (dy > 0)) * c - y1) / dy if dy else math.inf
+        dtx = c / abs(dx) if dx else math.inf
+        dty = c / abs(dy) if dy else math.inf
+        celdas = [(cx, cy)]
+        for _ in range(abs(ex - cx) + abs(ey - cy)):
+            if tx < ty: cx += paso_x; tx += dtx
+            else: cy += paso_y; ty += dty
+            celdas.append((cx, cy))
+        return celdas
+
+    def poner_nodo(self, nid, x, y):
+        self.quitar_nodo(nid)
+        k = self._clave(x, y, self.celda)
+        self._nodos.setdefault(k, set()).add(nid)
+        self._celda_nodo[nid] = k
+
+    def quitar_nodo(self, nid):
+        k = self._celda_nodo.pop(nid, None)
+        if k is not None:
+            b = self._nodos[k]; b.discard(nid)
+            if not b: del self._nodos[k]
+
+    def poner_arco(self, u, v, x1, y1, x2, y2):
+        self.quitar_arco(u, v)
+        celdas = self._celdas_segmento(x1, y1, x2, y2)
+        for k in celdas:
+            self._arcos.setdefault(k, set()).add((u, v))
+        self._celdas_arco[(u, v)] = celdas
+
+    def quitar_arco(self, u, v):
+        for k in self._celdas_arco.pop((u, v), ()):
+            b = self._arcos[k]; b.discard((u, v))
+            if not b: del self._arcos[k]
+
+    def _reunir(self, cubos, c, x0, y0, x1, y1):
+        (i0, j0), (i1, j1) = self._clave(x0, y0, c), self._clave(x1, y1, c)
+        res = set()
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(cubos):
+            # area mas grande que la rejilla ocupada: recorrer solo las celdas con contenido
+            for (i, j), b in cubos.items():
+                if i0 <= i <= i1 and j0 <= j <= j1: res |= b
+            return res
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                b = cubos.get((i, j))
+                if b: res |= b
+        return res
+
+    def nodos_cerca(self, x, y, r):
+        return self._reunir(self._nodos, self.celda, x - r, y - r, x + r, y + r)
+
+    def arcos_cerca(self, x, y, r):
+        return self._reunir(self._arcos, self.celda_arcos, x - r, y - r, x + r, y + r)
+
+    def nodos_en(self, x0, y0, x1, y1):
+        return self._reunir(self._nodos, self.celda, x0, y0, x1, y1)
+
+    def arcos_en(self, x0, y0, x1, y1):
+        return self._reunir(self._arcos, self.celda_arcos, x0, y0, x1, y1)
+
+
+def _capacidad(x):
+    """int si el valor es entero (se conserva exacto aun por encima de 2**53), si no float."""
+    if isinstance(x, str):
+        try:
+            return int(x)
+        except ValueError:
+            x = float(x)
+    if isinstance(x, int):
+        return x
+    x = float(x)
+    return int(x) if x.is_integer() else x
+
+
+def avisar_consola(titulo, mensaje):
+    """Avisador por defecto del modelo: escribe la advertencia en stderr."""
+    print(f"[ADVERTENCIA] {titulo}: {mensaje}", file=sys.stderr)
+
+
+class ModeloGrafo:
+    """Nodos en lista y arcos en un almacen indexado.
+
+    Cada arco vive en una ranura de `_ranuras` ((u,v,cap) o None si fue borrado) y su costo
+    por unidad en la misma posicion de `_costos`; `_indice` mapea (u,v) a su ranura y
+    `_salientes[u]` / `_entrantes[v]` dan la adyacencia por nodo.
+    Agregar, actualizar y borrar un arco es O(1); borrar un nodo es O(grado). Las ranuras
+    borradas se compactan cuando superan la mitad del almacen.
+
+    `version` sube con cada cambio que afecta al flujo (mover o renombrar nodos no cuenta); un
+    calculo en segundo plano la compara al terminar para descartar resultados viejos.
+    """
+
+    def __init__(self, avisar=None):
+        # avisar(titulo, mensaje): gancho para advertencias (la interfaz pasa messagebox.showwarning)
+        self.avisar = avisar or avisar_consola
+        self.nodos = []          # [(x,y,nombre)] coords de mundo
+        self.nombre_a_id = {}
+        self.siguiente_idx_nombre = 0
+        self._espacial = None    # IndiceEspacial, se arma en la primera consulta
+        self.version = 0
+        self.arcos = []          # [(u,v,cap)] (ver propiedad)
+
+    # almacen de arcos
+    @property
+    def arcos(self):
+        """Arcos vivos [(u,v,cap)] en orden de insercion. Es una vista cacheada: no modificarla."""
+        if self._cache_arcos is None:
+            self._cache_arcos = [a for a in self._ranuras if a is not None]
+        return self._cache_arcos
+
+    @arcos.setter
+    def arcos(self, lista):
+        """Reemplaza los arcos por [(u,v,cap)] o [(u,v,cap,costo)]."""
+        self._ranuras = []
+        self._costos = []
+        self._indice = {}
+        self._salientes = [dict() for _ in self.nodos]
+        self._entrantes = [dict() for _ in self.nodos]
+        self._borrados = 0
+        self._cache_arcos = None
+        self._espacial = None
+        self.version += 1
+        for a in lista:
+            self._poner(a[0], a[1], _capacidad(a[2]), float(a[3]) if len(a) > 3 else 0.0)
+
+    def _poner(self, u, v, c, costo=0.0):
+        r = len(self._ranuras)
+        self._ranuras.append((u, v, c))
+        self._costos.append(costo)
+        self._indice[(u, v)] = r
+        self._salientes[u][v] = r
+        self._entrantes[v][u] = r
+        self._cache_arcos = None
+        self.version += 1
+
+    def _quitar(self, u, v):
+        if self._espacial is not None: self._espacial.quitar_arco(u, v)
+        r = self._indice.pop((u, v))
+        del self._salientes[u][v]
+        del self._entrantes[v][u]
+        self._ranuras[r] = None
+        self._borrados += 1
+        self._cache_arcos = None
+        self.version += 1
+        if self._borrados > 64 and self._borrados * 2 > len(self._ranuras):
+            self._compactar()
+
+    def _compactar(self):
+        ie = self._espacial       # las claves (u,v) no cambian: el indice espacial sigue valido
+        self.arcos = [(*a, w) for a, w in zip(self._ranuras, self._costos) if a is not None]
+        self._espacial = ie
+
+    # indice espacial: se mantiene incrementalmente una vez creado
+    def indice_espacial(self):
+        if self._espacial is None:
+            nodos = self.nodos; arcos = self.arcos
+            # celda de arcos ~ un cuarto del largo medio (muestra de hasta 1000 arcos)
+            muestra = arcos[::max(1, len(arcos) // 1000)]
+            largo = sum(math.hypot(nodos[u][0] - nodos[v][0], nodos[u][1] - nodos[v][1])
+                        for (u, v, _) in muestra) / max(1, len(muestra))
+            ie = IndiceEspacial(celda_arcos=max(4*RADIO_NODO, largo / 4))
+            for nid, (x, y, _) in enumerate(nodos):
+                ie.poner_nodo(nid, x, y)
+            for (u, v, _) in arcos:
+                self._espacial_arco(ie, u, v)
+            self._espacial = ie
+        return self._espacial
+
+    def _espacial_arco(self, ie, u, v):
+        x1, y1, _ = self.nodos[u]; x2, y2, _ = self.nodos[v]
+        ie.poner_arco(u, v, x1, y1, x2, y2)
+
+    def _espacial_nodo_y_arcos(self, nid):
+        ie = self._espacial
+        x, y, _ = self.nodos[nid]
+        ie.poner_nodo(nid, x, y)
+        for v in self._salientes[nid]: self._espacial_arco(ie, nid, v)
+        for u in self._entrantes[nid]: self._espacial_arco(ie, u, nid)
+
+    @property
+    def num_arcos(self):
+        return len(self._indice)
+
+    def capacidad(self, u, v):
+        r = self._indice.get((u, v))
+        return None if r is None else self._ranuras[r][2]
+
+    def costo(self, u, v):
+        r = self._indice.get((u, v))
+        return None if r is None else self._costos[r]
+
+    @property
+    def costos(self):
+        """Costo por unidad de cada arco, alineado con `arcos`."""
+        return [w for a, w in zip(self._ranuras, self._costos) if a is not None]
+
+    @property
+    def tiene_costos(self):
+        return any(w for a, w in zip(self._ranuras, self._costos) if a is not None)
+
+    def salientes(self, u):
+        """[(v, cap)] de los arcos que salen de u."""
+        return [(v, self._ranuras[r][2]) for v, r in self._salientes[u].items()]
+
+    def entrantes(self, v):
+        """[(u, cap)] de los arcos que llegan a v."""
+        return [(u, self._ranuras[r][2]) for u, r in self._entrantes[v].items()]
+
+    # nodos
+    def agregar_nodo(self, x, y, nombre=None):
+        if nombre is None:
+            nombre = f"N{self.siguiente_idx_nombre}"; self.siguiente_idx_nombre += 1
+        if nombre in self.nombre_a_id:
+            raise ValueError("Nombre ya existe")
+        nid = len(self.nodos)
+        self.nodos.append((x, y, nombre))
+        self.nombre_a_id[nombre] = nid
+        self.version += 1
+        self._salientes.append(dict()); self._entrantes.append(dict())
+        if self._espacial is not None: self._espacial.poner_nodo(nid, x, y)
+        return nid
+
+    def renombrar_nodo(self, nid, nuevo):
+        if nuevo in self.nombre_a_id and self.nombre_a_id[nuevo] != nid:
+            raise ValueError("Nombre de nodo ya en uso")
+        x, y, _ = self.nodos[nid]
+        viejo = self.nodos[nid][2]
+        self.nodos[nid] = (x, y, nuevo)
+        del self.nombre_a_id[viejo]
+        self.nombre_a_id[nuevo] = nid
+
+    def mover_nodo(self, nid, x, y):
+        n = self.nodos[nid]; self.nodos[nid] = (x, y, n[2])
+        if self._espacial is not None: self._espacial_nodo_y_arcos(nid)
+
+    def eliminar_nodo(self, nid):
+        """Borra nid y sus arcos. El ultimo nodo pasa a ocupar el id nid (solo se renumeran
+        sus arcos); devuelve el id anterior de ese nodo, o None si nid era el ultimo."""
+        for v in list(self._salientes[nid]): self._quitar(nid, v)
+        for u in list(self._entrantes[nid]): self._quitar(u, nid)
+        del self.nombre_a_id[self.nodos[nid][2]]
+        ultimo = len(self.nodos) - 1
+        ie = self._espacial
+        if ie is not None:
+            ie.quitar_nodo(nid)
+            if nid != ultimo:
+                ie.quitar_nodo(ultimo)
+                for v in self._salientes[ultimo]: ie.quitar_arco(ultimo, v)
+                for u in self._entrantes[ultimo]: ie.quitar_arco(u, ultimo)
+        self.version += 1
+        if nid == ultimo:
+            self.nodos.pop(); self._salientes.pop(); self._entrantes.pop()
+            return None
+        self.nodos[nid] = self.nodos.pop()
+        self.nombre_a_id[self.nodos[nid][2]] = nid
+        sal = self._salientes.pop(); ent = self._entrantes.pop()
+        self._salientes[nid] = sal; self._entrantes[nid] = ent
+        for v, r in sal.items():
+            c = self._ranuras[r][2]
+            self._ranuras[r] = (nid, v, c)
+            del self._indice[(ultimo, v)]; self._indice[(nid, v)] = r
+            del self._entrantes[v][ultimo]; self._entrantes[v][nid] = r
+        for u, r in ent.items():
+            c = self._ranuras[r][2]
+            self._ranuras[r] = (u, nid, c)
+            del self._indice[(u, ultimo)]; self._indice[(u, nid)] = r
+            del self._salientes[u][ultimo]; self._salientes[u][nid] = r
+        self._cache_arcos = None
+        if ie is not None: self._espacial_nodo_y_arcos(nid)
+        return ultimo
+
+    # arcos
+    def agregar_arco(self, u, v, cap, costo=None):
+        """costo: por unidad de flujo (>= 0); None deja el del arco existente o 0."""
+        if u == v:
+            raise ValueError("No se permiten lazos")
+        cap = _capacidad(cap)
+        if cap <= 0:
+            raise ValueError("La capacidad debe ser > 0")
+        if costo is not None and float(costo) < 0:
+            raise ValueError("El costo debe ser >= 0")
+
+        # Bloquear u→v y v→u simultáneos
+        if (v, u) in self._indice:
+            raise ValueError(
+                f"Ya existe el arco {self.nodos[v][2]} → {self.nodos[u][2]}. "
+                "No se permiten arcos en ambos sentidos entre los mismos nodos."
+            )
+
+        # Acumular si u→v ya existe
+        r = self._indice.get((u, v))
+        if r is not None:
+            self._ranuras[r] = (u, v, self._ranuras[r][2] + cap)
+            if costo is not None: self._costos[r] = float(costo)
+            self._cache_arcos = None
+            self.version += 1
+            return
+        self._poner(u, v, cap, 0.0 if costo is None else float(costo))
+        if self._espacial is not None: self._espacial_arco(self._espacial, u, v)
+
+    def actualizar_capacidad(self, u, v, nueva_cap):
+        r = self._indice.get((u, v))
+        if r is None:
+            return False
+        self._ranuras[r] = (u, v, _capacidad(nueva_cap))
+        self._cache_arcos = None
+        self.version += 1
+        return True
+
+    def actualizar_costo(self, u, v, costo):
+        if float(costo) < 0:
+            raise ValueError("El costo debe ser >= 0")
+        r = self._indice.get((u, v))
+        if r is None:
+            return False
+        self._costos[r] = float(costo)
+        self.version += 1
+        return True
+
+    def eliminar_arco(self, u, v):
+        if (u, v) in self._indice:
+            self._quitar(u, v)
+
+    def instantanea(self):
+        """Copia inmutable de nodos y arcos como io_grafo.GrafoCompacto (arreglos planos), para
+        resolver en otro hilo mientras el modelo se sigue editando; `version` queda en la copia."""
+        from io_grafo import GrafoCompacto
+        from motor_flujo import _enteras
+        g = GrafoCompacto()
+        g.nombres = [nm for _, _, nm in self.nodos]
+        g.x = array("d", (x for x, _, _ in self.nodos)); g.y = array("d", (y for _, y, _ in self.nodos))
+        arcos = self.arcos
+        g.u = array("i", (u for u, _, _ in arcos)); g.v = array("i", (v for _, v, _ in arcos))
+        caps = [c for _, _, c in arcos]
+        # capacidades enteras en i64 como al cargar un archivo: el motor resuelve en modo entero exacto
+        g.cap = array("q", map(int, caps)) if _enteras(caps) else array("d", caps); g.costo = array("d", self.costos)
+        g.version = self.version
+        return g.terminar()
+
+    def exportar_json(self, path):
+        datos = {
+            "nodos":[{"id":i,"nombre":nm,"x":x,"y":y} for i,(x,y,nm) in enumerate(self.nodos)],
+            # "costo" solo en arcos con costo: los archivos sin costos no cambian
+            "arcos":[{"u":u,"v":v,"capacidad":c, **({"costo":w} if w else {})}
+                     for (u,v,c), w in zip(self.arcos, self.costos)],
+        }
+        with open(path,"w",encoding="utf-8") as f: json.dump(datos,f,indent=2,ensure_ascii=False)
+
+    def importar_json(self, path):
+        # lectura en streaming con indice hash (ver io_grafo); acumula duplicados y descarta opuestos
+        from io_grafo import cargar_json_streaming
+        self.cargar_compacto(cargar_json_streaming(path))
+
+    def exportar_binario(self, path):
+        # formato compacto de io_grafo (.mfb): arreglos de ancho fijo en vez de un dict por arco
+        from io_grafo import guardar_binario
+        guardar_binario(self.instantanea(), path)
+
+    def importar_binario(self, path):
+        from io_grafo import cargar_binario
+        self.cargar_compacto(cargar_binario(path))
+
+    def cargar_compacto(self, g):
+        """Reemplaza el contenido por un io_grafo.GrafoCompacto ya depurado."""
+        self.nodos, self.nombre_a_id = [], {}
+        self.arcos = []
+        for nombre, x, y in zip(g.nombres, g.x, g.y):
+            self.agregar_nodo(x, y, nombre)
+        self.arcos = zip(g.u, g.v, g.cap, g.costo)
+
+        self.siguiente_idx_nombre = 0
+        for _,_,nombre in self.nodos:
+            if nombre.startswith("N"):
+                try: self.siguiente_idx_nombre = max(self.siguiente_idx_nombre, int(nombre[1:])+1)
+                except: pass
+
+        if g.opuestos_eliminados:
+            self.avisar(
+                "Arcos opuestos eliminados",
+                "Se detectaron arcos en ambos sentidos entre los mismos nodos y fueron eliminados "
+                "(se conservó el primero encontrado)."
+            )
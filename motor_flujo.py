@@ -0,0 +1,1207 @@
+"""Motores de flujo maximo sin dependencias de interfaz (Edmonds–Karp, Dinic, push-relabel,
+costo minimo)."""
+import time
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+
+TOLERANCIA = 1e-12          # tolerancia relativa del modo flotante (umbral = TOLERANCIA * capacidad maxima)
+MAX_ENTERO = 1 << 63        # capacidades enteras por debajo de esto caben en array('q')
+
+
+def _enteras(xs):
+    return all(map(float.is_integer, map(float, xs))) and max(xs, default=0) < MAX_ENTERO
+
+
+def _tipo(xs):
+    """Typecode de un array o formato de un memoryview (p. ej. arreglos mapeados de io_grafo)."""
+    return xs.typecode if isinstance(xs, array) else xs.format
+
+
+class GrafoResidual:
+    """Red residual compacta en formato CSR sobre array('i')/array('d').
+
+    Los arcos de entrada se acumulan en (_u, _v, _c) y `construir` los ordena por fila:
+    la fila de u es destino[inicio[u]:inicio[u+1]]. Cada arco i ocupa la ranura
+    ranura[i] y su reverso la ranura rev[ranura[i]]; empujar f sobre la ranura e es
+    cap[e] -= f; cap[rev[e]] += f.
+
+    Si todas las capacidades son enteras, `construir` pasa _c y cap a array('q') (modo
+    entero, aritmetica exacta); una capacidad no entera posterior lo devuelve a array('d').
+    Ninguna ranura supera la capacidad de su arco, asi que int64 no desborda.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self._u = array("i"); self._v = array("i"); self._c = array("q")   # "d" con la primera no entera
+        self._ajenos = False            # arreglos adoptados: se copian antes de modificarlos
+        self.inicio = self.destino = self.cap = self.rev = self.ranura = None
+
+    @property
+    def m(self):
+        return len(self._u)
+
+    @property
+    def construido(self):
+        return self.inicio is not None
+
+    def agregar_arco(self, u, v, cap):
+        if not (0 <= u < self.n and 0 <= v < self.n):
+            raise IndexError("Nodo fuera de rango")
+        self.propios()
+        cap = self.numero(cap)      # puede cambiar _c de modo entero a flotante
+        self._u.append(u); self._v.append(v); self._c.append(cap)
+        self.inicio = None
+        return len(self._u) - 1
+
+    def propios(self):
+        """Copia los arreglos adoptados con cargar_arreglos antes de la primera modificacion."""
+        if self._ajenos:
+            self._u, self._v, self._c = array("i", self._u), array("i", self._v), array(_tipo(self._c), self._c)
+            self._ajenos = False
+
+    @property
+    def entero(self):
+        return _tipo(self._c) == "q"
+
+    def numero(self, c):
+        """c en el tipo de los arreglos; una capacidad no entera pasa el grafo a modo flotante."""
+        if not self.entero:
+            return float(c)
+        if float(c).is_integer() and c < MAX_ENTERO:
+            return int(c)
+        self._c = array("d", self._c); self._ajenos = False
+        if self.cap is not None: self.cap = array("d", self.cap)
+        return float(c)
+
+    def cargar_arreglos(self, us, vs, cs):
+        """Adopta arreglos de arcos ya armados (array o memoryview, p. ej. de io_grafo) sin copiarlos ni crear tuplas."""
+        if self.m:
+            raise ValueError("cargar_arreglos requiere un grafo sin arcos")
+        if len(us) != len(vs) or len(us) != len(cs):
+            raise ValueError("Los arreglos u, v y capacidad deben tener el mismo largo")
+        if len(us) and (min(us) < 0 or min(vs) < 0 or max(us) >= self.n or max(vs) >= self.n):
+            raise IndexError("Nodo fuera de rango")
+        self._u, self._v, self._c = us, vs, cs
+        self._ajenos = True
+        self.inicio = None
+
+    def agregar_nodo(self):
+        self.n += 1
+        self.inicio = None
+        return self.n - 1
+
+    def construir(self):
+        """Ordena los arcos por fila. Si ya habia un residual construido, conserva el flujo de cada arco."""
+        flujos = None
+        if self.ranura is not None:
+            cap, ranura, cs = self.cap, self.ranura, self._c
+            flujos = array(_tipo(cs), (cs[i] - cap[ranura[i]] for i in range(len(ranura))))
+        if not self.entero and _enteras(self._c) and (flujos is None or _enteras(flujos)):
+            self._c = array("q", map(int, self._c))      # _u y _v pueden seguir siendo adoptados
+            if flujos is not None: flujos = array("q", map(int, flujos))
+        n, m = self.n, self.m
+        us, vs, cs = self._u, self._v, self._c
+        inicio = array("i", bytes(4*(n + 1)))
+        for u in us: inicio[u + 1] += 1
+        for v in vs: inicio[v + 1] += 1
+        for i in range(n): inicio[i + 1] += inicio[i]
+        pos = array("i", inicio)
+        destino = array("i", bytes(8*m)); rev = array("i", bytes(8*m))
+        cap = array(_tipo(cs), bytes(16*m)); ranura = array("i", bytes(4*m))
+        for i in range(m):
+            u = us[i]; v = vs[i]
+            a = pos[u]; pos[u] = a + 1
+            b = pos[v]; pos[v] = b + 1
+            destino[a] = v; destino[b] = u
+            rev[a] = b; rev[b] = a
+            cap[a] = cs[i]
+            ranura[i] = a
+        if flujos:
+            for i, f in enumerate(flujos):
+                if f:
+                    a = ranura[i]; cap[a] -= f; cap[rev[a]] += f
+        self.inicio, self.destino, self.cap, self.rev, self.ranura = inicio, destino, cap, rev, ranura
+
+    def reiniciar_flujo(self):
+        cap = self.cap
+        for e in range(len(cap)): cap[e] = 0
+        for i, c in enumerate(self._c): cap[self.ranura[i]] = c
+
+    def cola(self, e):
+        return self.destino[self.rev[e]]
+
+    def empujar(self, e, f):
+        self.cap[e] -= f
+        self.cap[self.rev[e]] += f
+
+    def flujo_arco(self, i):
+        return self._c[i] - self.cap[self.ranura[i]]
+
+    def mapa_flujo(self):
+        mapa = {}
+        cap, ranura, cs = self.cap, self.ranura, self._c
+        for i, (u, v) in enumerate(zip(self._u, self._v)):
+            if cs[i] <= 0:
+                continue    # arco eliminado en caliente (capacidad 0)
+            mapa[(u, v)] = mapa.get((u, v), 0) + (cs[i] - cap[ranura[i]])
+        return mapa
+
+    def fila(self, u):
+        """Adaptador: capacidades residuales de u como dict {v: cap} (suma arcos paralelos)."""
+        d = {}
+        destino, cap = self.destino, self.cap
+        for e in range(self.inicio[u], self.inicio[u + 1]):
+            v = destino[e]; d[v] = d.get(v, 0.0) + cap[e]
+        return d
+
+
+class VistaResidual:
+    """Adaptador de solo lectura: se comporta como la antigua lista de dicts `residual[u][v]`."""
+
+    def __init__(self, grafo):
+        self.grafo = grafo
+
+    def __len__(self):
+        return self.grafo.n
+
+    def __getitem__(self, u):
+        if not 0 <= u < self.grafo.n:
+            raise IndexError(u)
+        return self.grafo.fila(u)
+
+    def __iter__(self):
+        return (self.grafo.fila(u) for u in range(self.grafo.n))
+
+
+class KernelBFS:
+    """BFS por frontera sobre un GrafoResidual con buffers preasignados y reutilizables.
+
+    `marca` guarda un sello por busqueda, asi que no se limpia entre llamadas; `padre_arco`
+    guarda la ranura por la que se llego a cada nodo y `cola` es la frontera (cabeza/fin).
+    """
+
+    def __init__(self, grafo):
+        n = grafo.n
+        self.grafo = grafo
+        self.marca = [0]*n
+        self.sello = 0
+        self.padre_arco = [-1]*n
+        self.cola = [0]*n
+        self.fin = 0
+        self.visitas = 0        # nodos extraidos de la frontera (acumulado; Dinic y push-relabel suman sus BFS)
+
+    def _explorar(self, s, t, umbral):
+        g = self.grafo
+        inicio, destino, cap = g.inicio, g.destino, g.cap
+        self.sello += 1
+        sello = self.sello; marca = self.marca; padre = self.padre_arco; cola = self.cola
+        marca[s] = sello; cola[0] = s
+        cabeza, fin = 0, 1
+        while cabeza < fin:
+            u = cola[cabeza]; cabeza += 1
+            for e in range(inicio[u], inicio[u + 1]):
+                v = destino[e]
+                if marca[v] != sello and cap[e] > umbral:
+                    marca[v] = sello; padre[v] = e
+                    if v == t:
+                        self.visitas += cabeza; self.fin = fin
+                        return True
+                    cola[fin] = v; fin += 1
+        self.visitas += cabeza; self.fin = fin
+        return False
+
+    def camino(self, s, t, umbral=1e-12):
+        """Camino s→t mas corto (en arcos) como lista de ranuras; None si t no es alcanzable."""
+        if not self._explorar(s, t, umbral):
+            return None
+        destino, rev, padre = self.grafo.destino, self.grafo.rev, self.padre_arco
+        camino = []
+        x = t
+        while x != s:
+            e = padre[x]
+            camino.append(e)
+            x = destino[rev[e]]
+        camino.reverse()
+        return camino
+
+    def alcanzables(self, s, umbral=1e-12):
+        """Modo conjunto alcanzable (lado S del corte minimo)."""
+        self._explorar(s, -1, umbral)
+        return set(self.cola[:self.fin])
+
+    def visitado(self, v):
+        return self.marca[v] == self.sello
+
+
+class CalculoCancelado(Exception):
+    """maximo_flujo interrumpido con ControlCalculo.cancelar()."""
+
+
+class ControlCalculo:
+    """Progreso y cancelacion de una resolucion que corre en otro hilo (motor.control).
+
+    El motor suma cada aumento (`aumentos`, `valor`) y, si `cancelado`, lanza CalculoCancelado
+    tras dejar el flujo consistente; el otro hilo solo lee campos y llama a cancelar().
+    """
+
+    def __init__(self):
+        self.cancelado = False
+        self.aumentos = 0
+        self.valor = 0              # flujo enviado hasta ahora (push-relabel: lo que ya llego a t)
+        self.inicio = time.perf_counter()
+
+    def cancelar(self):
+        self.cancelado = True
+
+    def transcurrido(self):
+        return time.perf_counter() - self.inicio
+
+    def avanzar(self, cuello):
+        self.aumentos += 1; self.valor += cuello
+        if self.cancelado:
+            raise CalculoCancelado()
+
+
+class RegistroIteraciones:
+    """Bitacora de aumentos de maximo_flujo segun una politica (`modo`):
+
+    "no" no guarda nada; "resumen" solo cuenta aumentos (`cantidad`) y suma cuellos (`total`);
+    "ultimas" guarda los caminos de los ultimos `limite` aumentos; "completo" los guarda todos.
+    Los caminos se guardan como arreglos de ids de nodo (`nodos(i)`, `entradas()`); iterar o
+    indexar produce los dicts {"camino": [(u,v), ...], "cuello": c} de siempre.
+    """
+    MODOS = ("no", "resumen", "ultimas", "completo")
+
+    def __init__(self, modo="completo", limite=1000):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de registro desconocido: {modo}")
+        self.modo = modo; self.limite = limite
+        self.guarda_caminos = modo in ("ultimas", "completo")
+        self.clear()
+
+    def clear(self):
+        self.cantidad = 0; self.total = 0.0
+        if self.modo == "completo":
+            # camino i: _nodos[_inicio[i]:_inicio[i+1]]
+            self._nodos = array("i"); self._inicio = array("i", [0]); self._cuellos = array("d")
+        elif self.modo == "ultimas":
+            self._anillo = deque(maxlen=self.limite)
+
+    def agregar(self, nodos, cuello):
+        if self.modo == "no":
+            return
+        self.cantidad += 1; self.total += cuello
+        if self.modo == "completo":
+            self._nodos.extend(nodos); self._inicio.append(len(self._nodos)); self._cuellos.append(cuello)
+        elif self.modo == "ultimas":
+            self._anillo.append((array("i", nodos), cuello))
+
+    def __len__(self):
+        if self.modo == "completo": return len(self._cuellos)
+        if self.modo == "ultimas": return len(self._anillo)
+        return 0
+
+    def nodos(self, i):
+        if self.modo == "ultimas": return self._anillo[i][0]
+        i = range(len(self))[i]
+        return self._nodos[self._inicio[i]:self._inicio[i + 1]]
+
+    def cuello(self, i):
+        if self.modo == "ultimas": return self._anillo[i][1]
+        return self._cuellos[i]
+
+    def entradas(self):
+        """(nodos, cuello) de cada camino guardado, en orden, sin armar tuplas de arcos."""
+        if self.modo == "ultimas":
+            return iter(self._anillo)
+        return ((self.nodos(i), self._cuellos[i]) for i in range(len(self)))
+
+    def __getitem__(self, i):
+        nodos = self.nodos(i)
+        return {"camino": list(zip(nodos, nodos[1:])), "cuello": self.cuello(i)}
+
+    def __iter__(self):
+        for nodos, cuello in self.entradas():
+            yield {"camino": list(zip(nodos, nodos[1:])), "cuello": cuello}
+
+
+def _con_topes(nodos):
+    if isinstance(nodos, dict):
+        return {int(v): (tope if tope is None or isinstance(tope, int) else float(tope)) for v, tope in nodos.items()}
+    return {int(v): None for v in nodos}
+
+
+class MotorFlujo:
+    """Interfaz comun de los motores: agregar_arco + maximo_flujo(s, t) -> (valor_total, mapa_flujo, iteraciones).
+
+    `iteraciones` es un RegistroIteraciones con la politica `registro` ("completo" por defecto;
+    "ultimas" guarda solo las ultimas `limite_registro`).
+
+    Con capacidades enteras el grafo trabaja en modo entero y `umbral` es 0 (comparaciones
+    exactas); si no, `umbral` = tolerancia * capacidad maxima, para que los restos de redondeo
+    en capacidades grandes no cuenten como residual."""
+    nombre = None
+
+    def __init__(self, n, registro="completo", limite_registro=1000, tolerancia=TOLERANCIA):
+        self.n = n
+        self.registro = registro
+        self.limite_registro = limite_registro
+        self.tolerancia = tolerancia
+        self.umbral = 0.0               # residual minimo para usar un arco (ver _fijar_umbral)
+        self.grafo = GrafoResidual(n)
+        self.kernel = None
+        self._st = None                 # (s, t) del flujo que guarda el residual
+        self._arcos_uv = None           # (u, v) -> [indices de arco], se crea al editar
+        self._super = None              # (n original, super-fuente, super-sumidero) del modo multiple
+        self._topes_super = {}          # (u, v) -> capacidad de los arcos auxiliares vigentes
+        self._sin_tope = (set(), set())   # fuentes y sumideros sin tope de la ultima llamada
+        self._alcanzados = None         # nodos que alcanzo la busqueda final fallida (lado S del corte)
+        self._valor = 0.0               # valor_total de la ultima resolucion
+        self.control = None             # ControlCalculo opcional (progreso y cancelacion)
+
+    def agregar_arco(self, u, v, cap):
+        if cap <= 0:
+            raise ValueError("La capacidad debe ser > 0")
+        self._alcanzados = None
+        if self._arcos_uv is not None and (u, v) in self._arcos_uv:
+            # ya resuelto: subir la capacidad del arco existente evita reconstruir el CSR
+            i = self._arcos_uv[(u, v)][0]
+            self._fijar_capacidad_arco(i, self.grafo._c[i] + cap)
+            return
+        i = self.grafo.agregar_arco(u, v, cap)
+        if self._arcos_uv is not None:
+            self._arcos_uv[(u, v)] = [i]
+
+    def cargar_arreglos(self, us, vs, cs):
+        if len(cs) and min(cs) <= 0:
+            raise ValueError("La capacidad debe ser > 0")
+        self.grafo.cargar_arreglos(us, vs, cs)
+
+    @property
+    def residual(self):
+        return VistaResidual(self._preparar())
+
+    @property
+    def original(self):
+        original = [dict() for _ in range(self.n)]
+        for u, v, c in zip(self.grafo._u, self.grafo._v, self.grafo._c):
+            original[u][v] = original[u].get(v, 0.0) + c
+        return original
+
+    def maximo_flujo(self, s, t):
+        raise NotImplementedError
+
+    def _mismo_nodo(self, s):
+        # s == t: flujo 0 sin recorrer nada; queda registrado para que el corte sea el vacio
+        self._preparar(s, s)
+        self._valor = 0.0
+        return 0.0, {}, self._nuevo_registro()
+
+    def _preparar(self, s=None, t=None):
+        g = self.grafo
+        if not g.construido:
+            g.construir()
+            self.kernel = KernelBFS(g)
+            self._fijar_umbral()
+        if s is not None:
+            self._fijar_umbral()
+            # el flujo guardado solo sirve como punto de partida para el mismo par s-t
+            if self._st is not None and self._st != (s, t):
+                g.reiniciar_flujo()
+            if self.control is not None:
+                self.control.valor = self._flujo_saliente(s) if self._st == (s, t) else 0
+            self._st = (s, t)
+            self._alcanzados = None
+        return g
+
+    def _flujo_saliente(self, s):
+        g = self.grafo; neto = 0
+        for i, (u, v) in enumerate(zip(g._u, g._v)):
+            if u == s: neto += g.flujo_arco(i)
+            elif v == s: neto -= g.flujo_arco(i)
+        return neto
+
+    def _fijar_umbral(self):
+        g = self.grafo
+        self.umbral = 0 if g.entero else self.tolerancia * max(g._c, default=0.0)
+
+    # re-solucion incremental: las ediciones conservan el flujo del residual y el
+    # siguiente maximo_flujo(s, t) solo busca lo que falta
+    def agregar_nodo(self):
+        self.n = self.grafo.agregar_nodo() + 1
+        return self.n - 1
+
+    def actualizar_capacidad(self, u, v, nueva_cap):
+        """Fija la capacidad de u→v; si queda por debajo de su flujo, solo se devuelve el exceso."""
+        if nueva_cap < 0:
+            raise ValueError("La capacidad debe ser >= 0")
+        if self._arcos_uv is None:
+            self._arcos_uv = {}
+            for i, (a, b) in enumerate(zip(self.grafo._u, self.grafo._v)):
+                self._arcos_uv.setdefault((a, b), []).append(i)
+        ids = self._arcos_uv.get((u, v))
+        if not ids:
+            return False
+        for k, i in enumerate(ids):
+            self._fijar_capacidad_arco(i, nueva_cap if k == 0 else 0)
+        return True
+
+    def eliminar_arco(self, u, v):
+        # el arco queda en el CSR con capacidad 0
+        return self.actualizar_capacidad(u, v, 0)
+
+    def reiniciar_flujo(self):
+        if self.grafo.construido: self.grafo.reiniciar_flujo()
+        self._st = None; self._alcanzados = None
+
+    def _fijar_capacidad_arco(self, i, c):
+        g = self._preparar()
+        self._alcanzados = None
+        g.propios()
+        c = g.numero(c)
+        if not g.entero: self.umbral = max(self.umbral, self.tolerancia * c)
+        a = g.ranura[i]
+        f = g._c[i] - g.cap[a]
+        g._c[i] = c
+        if f <= c + self.umbral:
+            g.cap[a] = max(0, c - f)
+            return
+        exceso = f - c
+        g.cap[a] = 0; g.cap[g.rev[a]] = c
+        self._reparar_exceso(g.cola(a), g.destino[a], exceso)
+
+    def _reparar_exceso(self, u, v, d):
+        # tras bajar u→v, u tiene d de mas y v d de menos: primero desviar u⇝v por el
+        # residual; lo que no se pueda, devolverlo u⇝s y retirarlo t⇝v
+        s, t = self._st if self._st is not None else (None, None)
+        eps = self.umbral
+        d -= self._aumentar_entre(u, v, d)
+        if d <= eps:
+            return
+        falta_u = 0 if u in (s, t) else d - self._aumentar_entre(u, s, d)
+        falta_v = 0 if v in (s, t) else d - self._aumentar_entre(t, v, d)
+        if falta_u > eps or falta_v > eps:
+            # no deberia ocurrir con un flujo valido; se parte de cero antes que dejarlo inconsistente
+            self.reiniciar_flujo()
+
+    def _aumentar_entre(self, x, y, limite):
+        if x is None or y is None or x == y:
+            return 0.0
+        g = self.grafo
+        total = 0
+        while limite - total > self.umbral:
+            camino = self.kernel.camino(x, y, self.umbral)
+            if not camino:
+                break
+            f = min(min(g.cap[e] for e in camino), limite - total)
+            for e in camino:
+                g.empujar(e, f)
+            total += f
+        return total
+
+    def _mapa_y_valor(self, s):
+        mapa_flujo = self.grafo.mapa_flujo()
+        # neto saliente de s (los arcos que entran a s no cuentan como flujo enviado)
+        valor_total = sum(f for (u, v), f in mapa_flujo.items() if u == s) \
+            - sum(f for (u, v), f in mapa_flujo.items() if v == s)
+        self._valor = valor_total
+        return valor_total, mapa_flujo
+
+    def _camino_en_tuplas(self, ranuras):
+        g = self.grafo
+        return [(g.cola(e), g.destino[e]) for e in ranuras]
+
+    def _nuevo_registro(self):
+        return RegistroIteraciones(self.registro, self.limite_registro)
+
+    def _registrar(self, registro, ranuras, cuello):
+        if self.control is not None:
+            self.control.avanzar(cuello)     # despues del aumento: el flujo queda valido
+        if registro.guarda_caminos:
+            g = self.grafo; destino = g.destino
+            nodos = [g.cola(ranuras[0])]
+            nodos.extend(destino[e] for e in ranuras)
+            registro.agregar(nodos, cuello)
+        else:
+            registro.agregar((), cuello)
+
+    # varias fuentes y sumideros: super-fuente S* -> fuentes y sumideros -> super-sumidero T*
+    def maximo_flujo_multiple(self, fuentes, sumideros):
+        """Flujo maximo de varias fuentes a varios sumideros en una sola resolucion.
+
+        fuentes / sumideros: {nodo: tope} con la oferta o demanda maxima de cada nodo (None = sin
+        tope) o un iterable de nodos sin tope. Agrega (una sola vez) una super-fuente y un
+        super-sumidero internos; llamadas siguientes solo reajustan sus arcos y parten del flujo
+        anterior. Devuelve (valor_total, mapa_flujo, iteraciones) sin nodos ni arcos auxiliares.
+        """
+        fuentes = _con_topes(fuentes); sumideros = _con_topes(sumideros)
+        if not fuentes or not sumideros:
+            raise ValueError("Se necesita al menos una fuente y un sumidero")
+        if fuentes.keys() & sumideros.keys():
+            raise ValueError("Un nodo no puede ser fuente y sumidero a la vez")
+        if self._super is None:
+            n0 = self.n
+            self._super = (n0, self.agregar_nodo(), self.agregar_nodo())
+        n0, S, T = self._super
+        if any(not 0 <= x < n0 for x in (*fuentes, *sumideros)):
+            raise IndexError("Nodo fuera de rango")
+
+        # sin tope: lo que permitan los arcos del nodo
+        g = self.grafo
+        sale = dict.fromkeys(fuentes, 0); entra = dict.fromkeys(sumideros, 0)     # int: no saca al grafo del modo entero
+        for u, v, c in zip(g._u, g._v, g._c):
+            if u in sale: sale[u] += c
+            if v in entra: entra[v] += c
+        topes = {}
+        for f, tope in fuentes.items(): topes[(S, f)] = sale[f] if tope is None else tope
+        for d, tope in sumideros.items(): topes[(d, T)] = entra[d] if tope is None else tope
+        for arco in self._topes_super.keys() - topes.keys():
+            topes[arco] = 0
+        for (u, v), c in topes.items():
+            if (u, v) in self._topes_super:
+                self.actualizar_capacidad(u, v, c)
+            elif c > 0:
+                self.agregar_arco(u, v, c)
+        self._topes_super = {a: c for a, c in topes.items() if c > 0 or a in self._topes_super}
+        self._sin_tope = ({f for f, t in fuentes.items() if t is None},
+                          {d for d, t in sumideros.items() if t is None})
+
+        valor_total, mapa_flujo, registro = self.maximo_flujo(S, T)
+        mapa_flujo = {(u, v): f for (u, v), f in mapa_flujo.items() if u < n0 and v < n0}
+        iteraciones = self._nuevo_registro()
+        for nodos, cuello in registro.entradas():
+            iteraciones.agregar(nodos[1:-1], cuello)
+        iteraciones.cantidad, iteraciones.total = registro.cantidad, registro.total
+        return valor_total, mapa_flujo, iteraciones
+
+    def alcanzables_desde_fuentes(self):
+        """Lado fuente del corte minimo de la ultima maximo_flujo_multiple (sin nodos auxiliares).
+
+        Las fuentes sin tope quedan siempre del lado fuente y los sumideros sin tope del otro
+        lado: si su arco auxiliar se satura, cortar sus arcos reales cuesta lo mismo.
+        """
+        return self.lado_fuente()
+
+    def lado_fuente(self):
+        """Lado S del corte minimo de la ultima resolucion (sin nodos auxiliares del modo multiple).
+
+        Reusa los nodos que alcanzo la busqueda final del motor (la que ya no encontro camino);
+        solo si no la hay (push-relabel o una edicion posterior) recorre el residual otra vez.
+        """
+        if self._st is None:
+            raise ValueError("Primero resuelve el flujo maximo")
+        s, t = self._st
+        if s == t:
+            return set()            # s y t no se pueden separar: corte vacio de capacidad 0
+        alcanzados = self._alcanzados
+        if alcanzados is None:
+            alcanzados = KernelBFS(self._preparar()).alcanzables(s, self.umbral)
+        if self._super is None or self._st != self._super[1:]:
+            return set(alcanzados)
+        n0 = self._super[0]
+        libres_f, libres_d = self._sin_tope
+        return ({v for v in alcanzados if v < n0} | libres_f) - libres_d
+
+    def corte_minimo(self):
+        """CorteMinimo de la ultima resolucion: particion, arcos cortados y capacidad."""
+        lado = self.lado_fuente()
+        g = self._preparar()
+        n = self.n if self._super is None else self._super[0]
+        en_s = bytearray(self.n)
+        for v in lado: en_s[v] = 1
+        arcos = {}
+        for i, (u, v) in enumerate(zip(g._u, g._v)):
+            if u < n and v < n and en_s[u] and not en_s[v] and g._c[i] > 0:
+                a = arcos.get((u, v))
+                c, f = g._c[i], g.flujo_arco(i)
+                arcos[(u, v)] = (c, f) if a is None else (a[0] + c, a[1] + f)
+        topes = []
+        if self._super is not None and self._st == self._super[1:]:
+            # arcos auxiliares del corte: oferta de una fuente fuera de S o demanda de un sumidero en S
+            _, S, T = self._super
+            for (u, v), c in self._topes_super.items():
+                if c > 0 and ((u == S and not en_s[v]) or (v == T and en_s[u])):
+                    topes.append(("oferta", v, c) if u == S else ("demanda", u, c))
+        return CorteMinimo(lado, n, [(u, v, c, f) for (u, v), (c, f) in arcos.items()], self._valor, topes)
+
+    @staticmethod
+    def alcanzables_en_residual(residual, s):
+        if isinstance(residual, VistaResidual):
+            residual = residual.grafo
+        if isinstance(residual, GrafoResidual):
+            return KernelBFS(residual).alcanzables(s)
+        n = len(residual)
+        vis = [False]*n
+        q = deque([s]); vis[s] = True
+        while q:
+            u = q.popleft()
+            for v, cap in residual[u].items():
+                if not vis[v] and cap > 1e-12:
+                    vis[v] = True; q.append(v)
+        return {i for i,ok in enumerate(vis) if ok}
+
+
+class FlujoMaximoEK(MotorFlujo):
+    nombre = "ek"
+
+    def _bfs(self, s, t):
+        return self.kernel.camino(s, t, self.umbral)
+
+    def maximo_flujo(self, s, t):
+        if s == t:
+            return self._mismo_nodo(s)
+        g = self._preparar(s, t)
+        iteraciones = self._nuevo_registro()
+        while True:
+            camino = self._bfs(s, t)
+            if not camino:
+                self._alcanzados = self.kernel.cola[:self.kernel.fin]
+                break
+            cuello = min(g.cap[e] for e in camino)
+            for e in camino:
+                g.empujar(e, cuello)
+            self._registrar(iteraciones, camino, cuello)
+        valor_total, mapa_flujo = self._mapa_y_valor(s)
+        return valor_total, mapa_flujo, iteraciones
+
+
+class FlujoMaximoEscalado(FlujoMaximoEK):
+    """Edmonds–Karp con escalado de capacidades (modo entero): la fase Δ solo aumenta por
+    arcos con residual >= Δ, con Δ = potencias de 2 decrecientes. Primero van los caminos
+    anchos y hay O(m log U) aumentos por fase en vez de depender de la forma del grafo. Con
+    capacidades no enteras solo corre la fase final (= EK)."""
+    nombre = "escalado"
+
+    def maximo_flujo(self, s, t):
+        if s == t:
+            return self._mismo_nodo(s)
+        g = self._preparar(s, t)
+        iteraciones = self._nuevo_registro()
+        umbrales = []
+        if g.entero and g.m:
+            delta = 1 << (max(max(g._c), 1).bit_length() - 1)
+            while delta > 1:
+                umbrales.append(delta - 1); delta >>= 1      # cap > Δ-1  <=>  cap >= Δ
+        umbrales.append(self.umbral)
+        for umbral in umbrales:
+            while True:
+                camino = self.kernel.camino(s, t, umbral)
+                if not camino:
+                    break
+                cuello = min(g.cap[e] for e in camino)
+                for e in camino:
+                    g.empujar(e, cuello)
+                self._registrar(iteraciones, camino, cuello)
+        self._alcanzados = self.kernel.cola[:self.kernel.fin]
+        valor_total, mapa_flujo = self._mapa_y_valor(s)
+        return valor_total, mapa_flujo, iteraciones
+
+
+class FlujoMaximoDinic(MotorFlujo):
+    """Dinic: grafo de niveles (BFS desde s) + flujo bloqueante con punteros de arco actual."""
+    nombre = "dinic"
+
+    def _niveles(self, s, t):
+        g = self.grafo; eps = self.umbral
+        inicio, destino, cap = g.inicio, g.destino, g.cap
+        nivel = [-1]*self.n
+        nivel[s] = 0
+        q = deque([s]); visitas = 0
+        while q:
+            u = q.popleft(); visitas += 1
+            for e in range(inicio[u], inicio[u + 1]):
+                v = destino[e]
+                if nivel[v] < 0 and cap[e] > eps:
+                    nivel[v] = nivel[u] + 1
+                    q.append(v)
+        self.kernel.visitas += visitas
+        if nivel[t] < 0:
+            self._alcanzados = [v for v in range(self.n) if nivel[v] >= 0]
+            return None
+        return nivel
+
+    def _flujo_bloqueante(self, s, t, nivel, iteraciones):
+        g = self.grafo; eps = self.umbral
+        inicio, destino, cap, rev = g.inicio, g.destino, g.cap, g.rev
+        ptr = array("i", inicio)
+        while True:
+            # dfs iterativo: avanza por arcos admisibles, retrocede en callejones sin salida
+            camino = []
+            u = s
+            while u != t:
+                i = ptr[u]; fin = inicio[u + 1]
+                while i < fin:
+                    if nivel[destino[i]] == nivel[u] + 1 and cap[i] > eps:
+                        break
+                    i += 1
+                ptr[u] = i
+                if i < fin:
+                    camino.append(i); u = destino[i]
+                    continue
+                if u == s:
+                    return
+                nivel[u] = -1
+                e = camino.pop()
+                u = destino[rev[e]]
+                ptr[u] += 1
+            cuello = min(cap[e] for e in camino)
+            for e in camino:
+                cap[e] -= cuello
+                cap[rev[e]] += cuello
+            self._registrar(iteraciones, camino, cuello)
+
+    def maximo_flujo(self, s, t):
+        if s == t:
+            return self._mismo_nodo(s)
+        self._preparar(s, t)
+        iteraciones = self._nuevo_registro()
+        while True:
+            nivel = self._niveles(s, t)
+            if nivel is None:
+                break
+            self._flujo_bloqueante(s, t, nivel, iteraciones)
+        valor_total, mapa_flujo = self._mapa_y_valor(s)
+        return valor_total, mapa_flujo, iteraciones
+
+
+class FlujoMaximoPushRelabel(MotorFlujo):
+    """Push-relabel de etiqueta mas alta con heuristicas de hueco (gap) y reetiquetado global.
+
+    No trabaja con caminos aumentantes, por lo que el registro de iteraciones queda vacio.
+    Un preflujo a medias no es un flujo: si se cancela, el residual vuelve a flujo cero.
+    """
+    nombre = "push_relabel"
+
+    def _reetiquetado_global(self, s, t, h):
+        # distancias inversas en el residual: hacia t (< n) o, si no llega, hacia s (>= n)
+        n = self.n; g = self.grafo; eps = self.umbral
+        inicio, destino, cap, rev = g.inicio, g.destino, g.cap, g.rev
+        for i in range(n): h[i] = 2*n
+        visitas = 0
+        for raiz, base in ((t, 0), (s, n)):
+            h[raiz] = base
+            q = deque([raiz])
+            while q:
+                v = q.popleft(); visitas += 1
+                for e in range(inicio[v], inicio[v + 1]):
+                    u = destino[e]
+                    if h[u] == 2*n and cap[rev[e]] > eps:
+                        h[u] = h[v] + 1
+                        q.append(u)
+        self.kernel.visitas += visitas
+
+    def maximo_flujo(self, s, t):
+        if s == t:
+            return self._mismo_nodo(s)
+        n = self.n; g = self._preparar(s, t); eps = self.umbral
+        inicio, destino, cap, rev = g.inicio, g.destino, g.cap, g.rev
+        h = [0]*n; exceso = [0]*n; ptr = array("i", inicio)
+        for e in range(inicio[s], inicio[s + 1]):
+            c = cap[e]
+            if c > eps:
+                v = destino[e]
+                cap[e] = 0; cap[rev[e]] += c
+                exceso[v] += c; exceso[s] -= c
+
+        def reconstruir():
+            self._reetiquetado_global(s, t, h)
+            cubetas = [[] for _ in range(2*n + 1)]
+            cuenta = [0]*(2*n + 1)
+            for u in range(n):
+                cuenta[h[u]] += 1
+                if u != s and u != t and exceso[u] > eps and h[u] < 2*n:
+                    cubetas[h[u]].append(u)
+            return cubetas, cuenta
+
+        cubetas, cuenta = reconstruir()
+        alto = 2*n - 1
+        reetiquetados = 0
+        control = self.control
+        while alto >= 0:
+            if not cubetas[alto]:
+                alto -= 1; continue
+            if control is not None:
+                control.valor = exceso[t]
+                if control.cancelado:
+                    self.reiniciar_flujo()
+                    raise CalculoCancelado()
+            u = cubetas[alto].pop()
+            if h[u] != alto or exceso[u] <= eps:
+                continue
+            # descarga de u
+            fin = inicio[u + 1]
+            while exceso[u] > eps:
+                if ptr[u] == fin:
+                    viejo = h[u]
+                    nuevo = 2*n
+                    for e in range(inicio[u], fin):
+                        if cap[e] > eps and h[destino[e]] + 1 < nuevo:
+                            nuevo = h[destino[e]] + 1
+                    cuenta[viejo] -= 1
+                    h[u] = nuevo; cuenta[nuevo] += 1
+                    ptr[u] = inicio[u]
+                    reetiquetados += 1
+                    if cuenta[viejo] == 0 and viejo < n:
+                        # hueco: lo que quede por encima ya no alcanza t
+                        for w in range(n):
+                            if viejo < h[w] < n:
+                                cuenta[h[w]] -= 1; h[w] = n + 1; cuenta[n + 1] += 1; ptr[w] = inicio[w]
+                                if w != u and exceso[w] > eps:
+                                    cubetas[n + 1].append(w); alto = max(alto, n + 1)
+                    if h[u] >= 2*n:
+                        break
+                    continue
+                e = ptr[u]
+                c = cap[e]; v = destino[e]
+                if c > eps and h[u] == h[v] + 1:
+                    d = exceso[u] if exceso[u] < c else c
+                    cap[e] = c - d; cap[rev[e]] += d
+                    exceso[u] -= d
+                    if v != s and v != t and exceso[v] <= eps:
+                        cubetas[h[v]].append(v)
+                    exceso[v] += d
+                else:
+                    ptr[u] = e + 1
+            if exceso[u] > eps and h[u] < 2*n:
+                cubetas[h[u]].append(u)
+            alto = max(alto, h[u]) if h[u] < 2*n else alto
+            if reetiquetados >= n:
+                reetiquetados = 0
+                cubetas, cuenta = reconstruir()
+                for w in range(n): ptr[w] = inicio[w]
+                alto = 2*n - 1
+        valor_total, mapa_flujo = self._mapa_y_valor(s)
+        return valor_total, mapa_flujo, self._nuevo_registro()
+
+
+class FlujoCostoMinimo(MotorFlujo):
+    """Flujo maximo de costo minimo (primal-dual): caminos mas cortos sucesivos con potenciales.
+
+    Cada fase corre un Dijkstra con costos reducidos c(u,v) + pot[u] - pot[v] (>= 0) y suma
+    las distancias a los potenciales; luego satura con flujo bloqueante (como Dinic) el
+    subgrafo de arcos de costo reducido 0, asi cada Dijkstra sirve para muchos aumentos.
+    Los costos por unidad van en agregar_arco(u, v, cap, costo) y deben ser >= 0. Tras
+    maximo_flujo, `costo_total` tiene el costo del flujo. No reusa el flujo anterior: un flujo
+    editado en caliente no tiene por que ser de costo minimo.
+    """
+    nombre = "costo_minimo"
+
+    def __init__(self, n, registro="completo", limite_registro=1000, tolerancia=TOLERANCIA):
+        super().__init__(n, registro, limite_registro, tolerancia)
+        self.costos = array("d")        # costo por unidad del arco i del grafo
+        self.costo_total = 0.0
+        self.fases = 0                  # Dijkstra de la ultima resolucion
+
+    def agregar_arco(self, u, v, cap, costo=None):
+        """costo: por unidad (>= 0); None deja 0 en un arco nuevo.
+
+        Tras resolver, u→v se fusiona con el arco existente (ver MotorFlujo.agregar_arco): como en
+        ModeloGrafo.agregar_arco, un costo dado reemplaza el de ese arco y None lo conserva. El
+        flujo guardado no se reusa (maximo_flujo parte de cero), asi que el siguiente calculo ya
+        es de costo minimo con el costo nuevo."""
+        if costo is not None and costo < 0:
+            raise ValueError("El costo debe ser >= 0")
+        m = self.grafo.m
+        super().agregar_arco(u, v, cap)
+        if self.grafo.m > m:
+            self.costos.append(0.0 if costo is None else float(costo))
+        elif costo is not None:
+            for i in self._arcos_uv[(u, v)]:
+                self.costos[i] = float(costo)
+
+    def cargar_arreglos(self, us, vs, cs, costos=None):
+        super().cargar_arreglos(us, vs, cs)
+        if costos is not None and len(costos) and min(costos) < 0:
+            raise ValueError("El costo debe ser >= 0")
+        self.costos = array("d", costos) if costos is not None else array("d", bytes(8*len(us)))
+
+    def _costos_por_ranura(self, g):
+        costo = array("d", bytes(8*len(g.cap)))
+        ranura, rev = g.ranura, g.rev
+        for i, w in enumerate(self.costos):
+            a = ranura[i]; costo[a] = w; costo[rev[a]] = -w
+        return costo
+
+    def _potenciales(self, s, t, costo, pot):
+        """Dijkstra hasta sacar t; suma a pot la distancia de los nodos cerrados y dist(t) al resto."""
+        g = self.grafo; n = self.n; eps = self.umbral
+        inicio, destino, cap = g.inicio, g.destino, g.cap
+        inf = float("inf")
+        dist = [inf]*n; cerrado = bytearray(n)
+        dist[s] = 0.0
+        monticulo = [(0.0, s)]
+        while monticulo:
+            d, u = heappop(monticulo)
+            if cerrado[u]:
+                continue
+            cerrado[u] = 1
+            if u == t:
+                break
+            base = d + pot[u]
+            for e in range(inicio[u], inicio[u + 1]):
+                if cap[e] > eps:
+                    v = destino[e]
+                    if not cerrado[v]:
+                        nd = base + costo[e] - pot[v]
+                        if nd < dist[v]:
+                            dist[v] = nd; heappush(monticulo, (nd, v))
+        if not cerrado[t]:
+            self._alcanzados = [v for v in range(n) if cerrado[v]]
+            return False
+        dt = dist[t]
+        for v in range(n):
+            pot[v] += dist[v] if cerrado[v] else dt
+        return True
+
+    def _niveles(self, s, t, costo, pot, tol):
+        g = self.grafo; eps = self.umbral
+        inicio, destino, cap = g.inicio, g.destino, g.cap
+        nivel = [-1]*self.n
+        nivel[s] = 0
+        q = deque([s])
+        while q:
+            u = q.popleft()
+            pu = pot[u]
+            for e in range(inicio[u], inicio[u + 1]):
+                v = destino[e]
+                if nivel[v] < 0 and cap[e] > eps and costo[e] + pu - pot[v] <= tol:
+                    nivel[v] = nivel[u] + 1
+                    q.append(v)
+        return nivel if nivel[t] >= 0 else None
+
+    def _flujo_bloqueante(self, s, t, nivel, costo, pot, tol, iteraciones):
+        g = self.grafo; eps = self.umbral
+        inicio, destino, cap, rev = g.inicio, g.destino, g.cap, g.rev
+        ptr = array("i", inicio)
+        while True:
+            camino = []
+            u = s
+            while u != t:
+                i = ptr[u]; fin = inicio[u + 1]; pu = pot[u]
+                while i < fin:
+                    v = destino[i]
+                    if nivel[v] == nivel[u] + 1 and cap[i] > eps and costo[i] + pu - pot[v] <= tol:
+                        break
+                    i += 1
+                ptr[u] = i
+                if i < fin:
+                    camino.append(i); u = destino[i]
+                    continue
+                if u == s:
+                    return
+                nivel[u] = -1
+                e = camino.pop()
+                u = destino[rev[e]]
+                ptr[u] += 1
+            cuello = min(cap[e] for e in camino)
+            for e in camino:
+                cap[e] -= cuello
+                cap[rev[e]] += cuello
+            self._registrar(iteraciones, camino, cuello)
+
+    def maximo_flujo(self, s, t):
+        self.costo_total = 0.0
+        if s == t:
+            return self._mismo_nodo(s)
+        g = self._preparar(s, t)
+        g.reiniciar_flujo()
+        costo = self._costos_por_ranura(g)
+        tol = 1e-9 * (1.0 + max(self.costos, default=0.0))
+        pot = [0.0]*self.n          # costos >= 0: los potenciales nulos ya son validos
+        iteraciones = self._nuevo_registro()
+        self.fases = 0
+        while self._potenciales(s, t, costo, pot):
+            self.fases += 1
+            while True:
+                nivel = self._niveles(s, t, costo, pot, tol)
+                if nivel is None:
+                    break
+                self._flujo_bloqueante(s, t, nivel, costo, pot, tol, iteraciones)
+        self.costo_total = sum(w * g.flujo_arco(i) for i, w in enumerate(self.costos) if w)
+        valor_total, mapa_flujo = self._mapa_y_valor(s)
+        return valor_total, mapa_flujo, iteraciones
+
+    def flujo_costo_minimo(self, s, t):
+        """(valor_total, costo_total, mapa_flujo, iteraciones)."""
+        valor_total, mapa_flujo, iteraciones = self.maximo_flujo(s, t)
+        return valor_total, self.costo_total, mapa_flujo, iteraciones
+
+
+class CorteMinimo:
+    """Corte minimo s-t de una resolucion (ver MotorFlujo.corte_minimo).
+
+    `S` es el lado fuente y `T` el resto de los n nodos. `arcos` tiene [(u, v, capacidad, flujo)]
+    de los arcos S→T; en un corte minimo todos van saturados. `topes` lista los topes de
+    oferta/demanda cortados en el modo multiple como (tipo, nodo, tope). `capacidad` suma
+    ambos y, por flujo maximo = corte minimo, debe coincidir con `valor` (`consistente`).
+    """
+
+    def __init__(self, S, n, arcos, valor, topes=()):
+        self.S = set(S)
+        self.n = n
+        self.arcos = sorted(arcos)
+        self.topes = list(topes)
+        self.valor = valor
+        self.capacidad = sum(a[2] for a in self.arcos) + sum(t[2] for t in self.topes)
+
+    @property
+    def T(self):
+        return set(range(self.n)) - self.S
+
+    @property
+    def pares(self):
+        """{(u, v)} de los arcos cortados, para consultas de pertenencia."""
+        return {(u, v) for u, v, _, _ in self.arcos}
+
+    def diferencia(self):
+        return self.capacidad - self.valor
+
+    def consistente(self, tolerancia=1e-9):
+        """True si la capacidad del corte iguala al flujo y todos los arcos cortados van saturados."""
+        tol = tolerancia * max(1.0, abs(self.valor))
+        return (abs(self.diferencia()) <= tol
+                and all(abs(c - f) <= tol for _, _, c, f in self.arcos))
+
+
+class IndiceAcumulado:
+    """Flujo acumulado por arco a lo largo de la bitacora de iteraciones, armado una sola vez.
+
+    Cada arco (u,v) que aparece en algun camino tiene un numero k = posicion[(u,v)];
+    totales[inicio[k]:inicio[k+1]] son sus acumulados tras cada iteracion que lo uso, en orden.
+    """
+
+    def __init__(self, iteraciones=()):
+        if isinstance(iteraciones, RegistroIteraciones):
+            entradas = iteraciones.entradas
+        else:
+            def entradas():
+                for it in iteraciones:
+                    camino = it["camino"]
+                    yield ([camino[0][0]] + [v for _, v in camino] if camino else []), it["cuello"]
+        posicion = {}; cuenta = []
+        for nodos, _ in entradas():
+            for a in zip(nodos, nodos[1:]):
+                k = posicion.get(a)
+                if k is None:
+                    k = posicion[a] = len(cuenta); cuenta.append(0)
+                cuenta[k] += 1
+        inicio = array("i", bytes(4*(len(cuenta) + 1)))
+        for k, c in enumerate(cuenta):
+            inicio[k + 1] = inicio[k] + c
+        totales = array("d", bytes(8*inicio[-1]))
+        sig = array("i", inicio[:-1])
+        acumulado = array("d", bytes(8*len(cuenta)))
+        total = 0.0
+        for nodos, c in entradas():
+            total += c
+            for a in zip(nodos, nodos[1:]):
+                k = posicion[a]
+                acumulado[k] += c
+                totales[sig[k]] = acumulado[k]; sig[k] += 1
+        self.posicion, self.inicio, self.totales = posicion, inicio, totales
+        if isinstance(iteraciones, RegistroIteraciones):
+            total = iteraciones.total      # incluye los aumentos que el registro no guardo
+        self.total = total                 # suma de los cuellos de todas las iteraciones
+
+    def de(self, u, v):
+        """Acumulados de u→v tras cada iteracion que lo uso (vacio si ninguna)."""
+        k = self.posicion.get((u, v))
+        if k is None:
+            return ()
+        return self.totales[self.inicio[k]:self.inicio[k + 1]]
+
+    def acumulado(self, u, v):
+        k = self.posicion.get((u, v))
+        return self.totales[self.inicio[k + 1] - 1] if k is not None else 0.0
+
+
+def descomponer_flujo(mapa_flujo, s, t, umbral=1e-12):
+    """Descompone un flujo {(u,v): f} en caminos y ciclos, con a lo sumo un registro por arco.
+
+    s y t pueden ser un nodo o un conjunto de nodos (varias fuentes / sumideros).
+    Devuelve [{"tipo": "camino" | "ciclo", "nodos": [v0, v1, ...], "flujo": f}]; un ciclo repite
+    su primer nodo al final. Cada registro agota al menos un arco y cada recorrido cuesta O(V)
+    mas el avance de punteros por arco: O(V·E) en total.
+    """
+    fuentes = set(s) if isinstance(s, (set, frozenset, dict, list, tuple)) else {s}
+    sumideros = set(t) if isinstance(t, (set, frozenset, dict, list, tuple)) else {t}
+    salida = {}
+    balance = {}                    # enteros en modo entero: los cuellos quedan exactos
+    for (u, v), f in mapa_flujo.items():
+        if f > umbral:
+            salida.setdefault(u, []).append([v, f])
+            balance[u] = balance.get(u, 0) - f
+            balance[v] = balance.get(v, 0) + f
+    # fuente y sumidero virtuales (-1, -2) con la oferta y la demanda netas de cada nodo
+    S, T = -1, -2
+    salida[S] = [[x, -balance[x]] for x in fuentes if -balance.get(x, 0) > umbral]
+    for x in sumideros:
+        if balance.get(x, 0) > umbral:
+            salida.setdefault(x, []).append([T, balance[x]])
+    ptr = dict.fromkeys(salida, 0)
+
+    def siguiente(u):
+        arcos = salida.get(u)
+        if arcos is None:
+            return None
+        i = ptr[u]
+        while i < len(arcos) and arcos[i][1] <= umbral:
+            i += 1
+        ptr[u] = i
+        return arcos[i] if i < len(arcos) else None
+
+    registros = []
+    for origen in [S, *salida]:      # primero los caminos desde la fuente virtual
+        while siguiente(origen) is not None:
+            camino = [origen]; arcos = []; pos = {origen: 0}
+            while camino[-1] != T:
+                a = siguiente(camino[-1])
+                if a is None:
+                    break
+                v = a[0]
+                i = pos.get(v)
+                if i is not None:
+                    # se cerro un ciclo: se descuenta y el recorrido sigue desde v
+                    ciclo = arcos[i:] + [a]
+                    f = min(x[1] for x in ciclo)
+                    for x in ciclo: x[1] -= f
+                    registros.append({"tipo": "ciclo", "nodos": camino[i:] + [v], "flujo": f})
+                    for w in camino[i + 1:]: del pos[w]
+                    del camino[i + 1:]; del arcos[i:]
+                    continue
+                pos[v] = len(camino); camino.append(v); arcos.append(a)
+            if not arcos:
+                continue
+            f = min(x[1] for x in arcos)
+            for x in arcos: x[1] -= f
+            nodos = [v for v in camino if v >= 0]
+            if len(nodos) > 1:
+                registros.append({"tipo": "camino", "nodos": nodos, "flujo": f})
+    return registros
+
+
+MOTORES = {
+    "ek": FlujoMaximoEK,
+    "escalado": FlujoMaximoEscalado,
+    "dinic": FlujoMaximoDinic,
+    "push_relabel": FlujoMaximoPushRelabel,
+    "costo_minimo": FlujoCostoMinimo,
+}
+
+def elegir_motor(n, m):
+    """Criterio de "auto": EK en grafos chicos (bitacora legible), push-relabel en densos, Dinic en el resto."""
+    if m <= 2000:
+        return "ek"
+    if m >= n*n // 4:
+        return "push_relabel"
+    return "dinic"
+
+def crear_motor(nombre, n, m=0, registro="completo", limite_registro=1000, tolerancia=TOLERANCIA):
+    """registro: politica de la bitacora de iteraciones (ver RegistroIteraciones); tolerancia:
+    tolerancia relativa del modo flotante (ver MotorFlujo)."""
+    if nombre in (None, "", "auto"):
+        nombre = elegir_motor(n, m)
+    if nombre not in MOTORES:
+        raise ValueError(f"Motor desconocido: {nombre}")
+    return MOTORES[nombre](n, registro, limite_registro, tolerancia)
@@ -0,0 +1,155 @@
+"""Tablas virtuales sobre ttk.Treeview para modelos grandes (sin importar tkinter).
+
+El Treeview tiene alto fijo y solo guarda las filas de la ventana visible: desplazar cambia
+`inicio` y reescribe esos items, y un refresco solo toca las filas cuyos valores cambiaron.
+Los datos vienen de un callback fila(i); el orden por columna y los filtros son indices
+precalculados que se reusan mientras no cambie la `version` de los datos.
+"""
+
+
+class TablaVirtual:
+    """Ventana de `alto` filas sobre n filas de datos.
+
+    cargar(n, fila, version, claves): fila(i) -> tupla de valores de la fila de datos i;
+    claves: {columna: clave(i)} para ordenar al hacer clic en el encabezado. Mientras
+    `version` no cambie se conservan las permutaciones de orden ya calculadas.
+    """
+
+    def __init__(self, arbol, barra=None, alto=None):
+        self.arbol = arbol
+        self.barra = barra
+        self.alto = alto or int(arbol.cget("height"))
+        self.n = 0
+        self._fila = lambda i: ()
+        self._version = None
+        self.claves = {}
+        self.columna = None             # columna de orden (None = orden de los datos)
+        self.descendente = False
+        self.filtro = None              # conjunto de filas de datos visibles (None = todas)
+        self._ordenes = {}              # columna -> permutacion ordenada (para esta version)
+        self._vista = None              # filas de datos en orden de pantalla (se arma al pedirla)
+        self.inicio = 0
+        self._items = []                # iids de la ventana, en orden
+        self._valores = []              # valores mostrados por item (para el diff)
+        self._titulos = {}
+        for col in arbol["columns"]:
+            self._titulos[col] = arbol.heading(col, "text")
+            arbol.heading(col, command=lambda c=col: self.alternar_orden(c))
+        arbol.bind("<MouseWheel>", lambda e: self._rueda(-1 if e.delta > 0 else 1))
+        arbol.bind("<Button-4>", lambda e: self._rueda(-1))
+        arbol.bind("<Button-5>", lambda e: self._rueda(1))
+        if barra is not None:
+            barra.configure(command=self._barra)
+
+    # datos
+    def cargar(self, n, fila, version=None, claves=None):
+        """Nuevos datos. Con la misma `version` que antes se conservan orden y filtro ya armados."""
+        if version is None or version != self._version:
+            self._ordenes = {}
+            self._vista = None
+        self.n = n; self._fila = fila; self._version = version
+        if claves is not None:
+            self.claves = claves
+        if self.columna is not None and self.columna not in self.claves:
+            self.columna = None; self._vista = None
+        self.refrescar()
+
+    def invalidar(self):
+        """Los datos cambiaron sin cambiar de version (p. ej. nombres): rehace orden y vista."""
+        self._ordenes = {}; self._vista = None
+
+    def filtrar(self, filas):
+        """filas: conjunto de filas de datos a mostrar (None = todas)."""
+        if filas is None and self.filtro is None:
+            return
+        self.filtro = None if filas is None else set(filas)
+        self._vista = None; self.inicio = 0
+        self.refrescar()
+
+    def alternar_orden(self, columna):
+        """Clic en el encabezado: ascendente, descendente y otra vez orden de los datos."""
+        if columna not in self.claves:
+            return
+        if self.columna != columna:
+            self.columna, self.descendente = columna, False
+        elif not self.descendente:
+            self.descendente = True
+        else:
+            self.columna = None
+        for col, txt in self._titulos.items():
+            marca = ("  ▼" if self.descendente else "  ▲") if col == self.columna else ""
+            self.arbol.heading(col, text=txt + marca)
+        self._vista = None
+        self.refrescar()
+
+    def _orden(self, columna):
+        orden = self._ordenes.get(columna)
+        if orden is None:
+            orden = self._ordenes[columna] = sorted(range(self.n), key=self.claves[columna])
+        return orden
+
+    @property
+    def vista(self):
+        if self._vista is None:
+            if self.columna is None:
+                orden = range(self.n)
+            else:
+                orden = self._orden(self.columna)
+                if self.descendente: orden = orden[::-1]
+            filtro = self.filtro
+            if filtro is None:
+                self._vista = orden
+            elif self.columna is None:
+                self._vista = sorted(i for i in filtro if i < self.n)
+            else:
+                self._vista = [i for i in orden if i in filtro]
+        return self._vista
+
+    def __len__(self):
+        return len(self.vista)
+
+    # ventana
+    def refrescar(self):
+        """Reescribe solo los items de la ventana cuyos valores cambiaron."""
+        vista = self.vista
+        total = len(vista)
+        self.inicio = max(0, min(self.inicio, total - self.alto))
+        k_fin = min(self.alto, total - self.inicio)
+        arbol, items, valores = self.arbol, self._items, self._valores
+        while len(items) > k_fin:
+            arbol.delete(items.pop()); valores.pop()
+        for k in range(k_fin):
+            vals = tuple(self._fila(vista[self.inicio + k]))
+            if k == len(items):
+                items.append(arbol.insert("", "end", values=vals)); valores.append(vals)
+            elif valores[k] != vals:
+                arbol.item(items[k], values=vals); valores[k] = vals
+        if self.barra is not None:
+            if total:
+                self.barra.set(self.inicio / total, (self.inicio + k_fin) / total)
+            else:
+                self.barra.set(0.0, 1.0)
+
+    def desplazar(self, filas):
+        viejo = self.inicio
+        self.inicio = max(0, min(self.inicio + filas, len(self.vista) - self.alto))
+        if self.inicio != viejo:
+            self.refrescar()
+
+    def _rueda(self, sentido):
+        self.desplazar(3*sentido)
+        return "break"
+
+    def _barra(self, accion, cantidad, unidad=None):
+        # protocolo de yscrollcommand: ("moveto", fraccion) o ("scroll", n, "units"|"pages")
+        if accion == "moveto":
+            self.desplazar(int(float(cantidad) * len(self.vista)) - self.inicio)
+        else:
+            self.desplazar(int(cantidad) * (self.alto if unidad == "pages" else 1))
+
+    def fila_de_item(self, iid):
+        """Fila de datos que muestra el item iid (None si no es de la ventana)."""
+        try:
+            return self.vista[self.inicio + self._items.index(iid)]
+        except ValueError:
+            return None
@@ -0,0 +1,52 @@
+import csv
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arbol_cortes import ArbolGomoryHu
+from motor_flujo import crear_motor
+
+
+class TestMatriz(unittest.TestCase):
+    def test_enteros_grandes_sin_redondear(self):
+        grande = 2**60 + 1
+        arbol = ArbolGomoryHu(3, [(0, 1, grande), (1, 2, 1234567)], procesos=1)
+        self.assertEqual(arbol.peso.typecode, "q")
+        self.assertEqual(arbol.corte(0, 1), grande)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "m.csv")
+            arbol.exportar_matriz_csv(path, ["a", "b", "c"])
+            with open(path, encoding="utf-8", newline="") as f:
+                filas = list(csv.reader(f))
+        self.assertEqual(filas[1], ["a", "", str(grande), "1234567"])
+
+
+class TestPool(unittest.TestCase):
+    def test_pool_igual_que_un_proceso(self):
+        r = random.Random(3)
+        n = 24
+        arcos = {}
+        for _ in range(70):
+            u, v = r.sample(range(n), 2)
+            if (v, u) not in arcos: arcos[(u, v)] = r.randint(1, 20)
+        arcos = [(u, v, c) for (u, v), c in arcos.items()]
+        uno = ArbolGomoryHu(n, arcos, motor="dinic", procesos=1)
+        pool = ArbolGomoryHu(n, arcos, motor="dinic", procesos=2)
+        self.assertEqual(list(uno.padre), list(pool.padre))
+        self.assertEqual(list(uno.peso), list(pool.peso))
+        self.assertGreaterEqual(pool.resoluciones, n - 1)
+        for s in range(n):
+            for t in range(s + 1, n):
+                mo = crear_motor("dinic", n, 2*len(arcos), registro="no")
+                for u, v, c in arcos:
+                    mo.agregar_arco(u, v, c); mo.agregar_arco(v, u, c)
+                with self.subTest(s=s, t=t):
+                    self.assertEqual(pool.corte(s, t), mo.maximo_flujo(s, t)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import csv
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli_flujo import resolver_grafo, resultado_a_csv
+from io_grafo import GrafoCompacto
+
+
+class TestCSV(unittest.TestCase):
+    def test_valores_sin_redondear(self):
+        g = GrafoCompacto()
+        for nm in ("s", "a", "b", "t"): g.agregar_nodo(nm, 0.0, 0.0)
+        g.agregar_arco(0, 1, 1234567); g.agregar_arco(1, 3, 2**60 + 1)
+        g.agregar_arco(0, 2, 3); g.agregar_arco(2, 3, 2)
+        res = resolver_grafo(g.terminar(), ["s"], ["t"], rutas=True)
+        filas = list(csv.reader(io.StringIO(resultado_a_csv(res))))
+        self.assertEqual(filas[1:3], [["s", "a", "1234567", "1234567"], ["a", "t", str(2**60 + 1), "1234567"]])
+        self.assertIn(["Flujo máximo total", "1234569"], filas)
+        self.assertIn(["Capacidad del corte", "1234569"], filas)
+        self.assertIn(["camino", "s → a → t", "1234567"], filas)
+
+
+if __name__ == "__main__":
+    unittest.main()
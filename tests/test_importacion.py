@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sys.modules["tkinter"] = None hace fallar cualquier `import tkinter`, como en un Python sin Tk
+SIN_TK = """
+import sys
+sys.modules["tkinter"] = None
+import {modulo}
+print(" ".join(m for m in ("tkinter", "multiprocessing") if sys.modules.get(m) is not None))
+"""
+
+
+def _importar(modulo):
+    # proceso aparte: los modulos ya importados en este no cuentan
+    res = subprocess.run([sys.executable, "-c", SIN_TK.format(modulo=modulo)], cwd=RAIZ,
+                         capture_output=True, text=True, timeout=60)
+    return res.returncode, res.stdout.split(), res.stderr
+
+
+class TestImportacionSinTk(unittest.TestCase):
+    def test_modulos_sin_interfaz(self):
+        for modulo in ("flujo_maximo_logistica", "motor_flujo", "cli_flujo"):
+            with self.subTest(modulo=modulo):
+                rc, cargados, err = _importar(modulo)
+                self.assertEqual(rc, 0, err)
+                self.assertNotIn("tkinter", cargados)
+
+    def test_punto_de_entrada_liviano(self):
+        # ArbolGomoryHu y su pool de procesos se cargan solo al pedirlos
+        rc, cargados, err = _importar("flujo_maximo_logistica")
+        self.assertEqual(rc, 0, err)
+        self.assertEqual(cargados, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
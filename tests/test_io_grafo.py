@@ -0,0 +1,98 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from io_grafo import GrafoCompacto, cargar_json_streaming, convertir, exportar_flujo, guardar_binario
+from motor_flujo import IndiceAcumulado, descomponer_flujo
+
+
+def _escribir(directorio, datos):
+    path = os.path.join(directorio, "g.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(datos, f)
+    return path
+
+
+class TestCargaJSON(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.nodos = [{"nombre": nm, "x": 0, "y": 0} for nm in "abc"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_nodo_fuera_de_rango(self):
+        for u, v in ((0, -1), (-2, 1), (0, 3)):
+            with self.subTest(u=u, v=v):
+                path = _escribir(self.tmp.name, {"nodos": self.nodos, "arcos": [
+                    {"u": 0, "v": 1, "capacidad": 3}, {"u": u, "v": v, "capacidad": 2}]})
+                with self.assertRaises(ValueError):
+                    cargar_json_streaming(path)
+
+    def test_arcos_antes_que_nodos(self):
+        path = _escribir(self.tmp.name, {"arcos": [{"u": 0, "v": 2, "capacidad": 3}, {"u": 0, "v": 2, "capacidad": 2}],
+                                         "nodos": self.nodos})
+        g = cargar_json_streaming(path)
+        self.assertEqual((list(g.u), list(g.v), list(g.cap)), ([0], [2], [5]))
+
+
+class TestConversion(unittest.TestCase):
+    def test_binario_a_json_conserva_enteros_grandes(self):
+        g = GrafoCompacto()
+        for nm in "abc": g.agregar_nodo(nm, 0.0, 0.0)
+        g.agregar_arco(0, 1, 2**60 + 1); g.agregar_arco(1, 2, 7, 2.5)
+        with tempfile.TemporaryDirectory() as tmp:
+            mfb, js = os.path.join(tmp, "g.mfb"), os.path.join(tmp, "g.json")
+            guardar_binario(g.terminar(), mfb)
+            convertir(mfb, js)
+            h = cargar_json_streaming(js)
+            self.assertEqual(list(h.cap), [2**60 + 1, 7])
+            self.assertEqual(list(h.costo), [0.0, 2.5])
+            self.assertEqual(h.nombres, ["a", "b", "c"])
+
+
+class TestExportacionFlujo(unittest.TestCase):
+    def setUp(self):
+        g = GrafoCompacto()
+        for nm in ("s", "a", "b", "t"): g.agregar_nodo(nm, 0.0, 0.0)
+        for u, v, c in ((0, 1, 3), (0, 2, 2), (1, 3, 2), (2, 3, 3), (1, 2, 1)): g.agregar_arco(u, v, c)
+        self.g = g.terminar()
+        self.motor = self.g.a_motor("ek")
+        self.valor, mapa, its = self.motor.maximo_flujo(0, 3)
+        self.acum = IndiceAcumulado(its)
+        self.rutas = descomponer_flujo(mapa, 0, 3)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_csv_con_aumentos_y_rutas(self):
+        path = os.path.join(self.tmp.name, "f.csv")
+        k = exportar_flujo(path, self.motor, self.g.nombres, acumulados=self.acum, rutas=self.rutas,
+                           resumen={"flujo_maximo": self.valor}, bloque=2)
+        with open(path, encoding="utf-8", newline="") as f:
+            filas = list(csv.reader(f))
+        self.assertEqual(filas[0], ["u", "v", "capacidad", "flujo", "aumentos", "acumulado_aumentos"])
+        self.assertEqual(filas[k + 1:k + 3], [[], ["tipo", "ruta", "flujo"]])
+        rutas = filas[k + 3:k + 3 + len(self.rutas)]
+        self.assertEqual(sum(float(r[2]) for r in rutas), self.valor)
+        self.assertEqual(filas[k + 3 + len(self.rutas):], [[], ["flujo_maximo", str(self.valor)]])
+
+    def test_jsonl_con_aumentos_y_rutas(self):
+        path = os.path.join(self.tmp.name, "f.jsonl")
+        exportar_flujo(path, self.motor, self.g.nombres, acumulados=self.acum, rutas=iter(self.rutas))
+        with open(path, encoding="utf-8") as f:
+            objs = [json.loads(linea) for linea in f]
+        arcos = [o for o in objs if "u" in o]
+        rutas = [o["ruta"] for o in objs if "ruta" in o]
+        self.assertEqual(sum(o["aumentos"] for o in arcos), sum(len(self.acum.de(u, v)) for u, v in self.acum.posicion))
+        self.assertEqual([r["nodos"] for r in rutas], [[self.g.nombres[v] for v in r["nodos"]] for r in self.rutas])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelo_grafo import ModeloGrafo
+
+GRANDE = 2**53 + 1      # el primer entero que un float no representa
+
+
+class TestCapacidadesEnteras(unittest.TestCase):
+    def test_importar_resolver_y_exportar_exacto(self):
+        datos = {"nodos": [{"nombre": nm, "x": 0, "y": 0} for nm in "sat"],
+                 "arcos": [{"u": 0, "v": 1, "capacidad": GRANDE}, {"u": 1, "v": 2, "capacidad": GRANDE},
+                           {"u": 0, "v": 2, "capacidad": 3}]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "g.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(datos, f)
+            m = ModeloGrafo()
+            m.importar_json(path)
+            self.assertEqual(m.capacidad(0, 1), GRANDE)
+            g = m.instantanea()
+            self.assertEqual(g.cap.typecode, "q")
+            self.assertEqual(g.a_motor("dinic").maximo_flujo(0, 2)[0], GRANDE + 3)
+            m.exportar_json(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual([a["capacidad"] for a in json.load(f)["arcos"]], [GRANDE, GRANDE, 3])
+
+    def test_ediciones(self):
+        m = ModeloGrafo()
+        for i in range(3): m.agregar_nodo(0.0, 0.0, f"N{i}")
+        m.agregar_arco(0, 1, 2.0); m.agregar_arco(0, 1, str(GRANDE)); m.agregar_arco(1, 2, 2.5)
+        m.actualizar_capacidad(1, 2, "7")
+        self.assertEqual(m.arcos, [(0, 1, GRANDE + 2), (1, 2, 7)])
+        self.assertIsInstance(m.arcos[1][2], int)
+
+
+if __name__ == "__main__":
+    unittest.main()
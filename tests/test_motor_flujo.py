@@ -0,0 +1,208 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_flujo import MOTORES, FlujoCostoMinimo, crear_motor, descomponer_flujo
+
+
+def _motor(nombre):
+    mo = crear_motor(nombre, 3, 2, registro="no")
+    mo.agregar_arco(0, 1, 5); mo.agregar_arco(1, 2, 3)
+    return mo
+
+
+class TestOrigenIgualDestino(unittest.TestCase):
+    def test_flujo_cero_y_corte_vacio(self):
+        for nombre in MOTORES:
+            with self.subTest(motor=nombre):
+                mo = _motor(nombre)
+                self.assertEqual(mo.maximo_flujo(0, 2)[0], 3)
+                valor, mapa, _ = mo.maximo_flujo(1, 1)
+                self.assertEqual((valor, mapa), (0, {}))
+                corte = mo.corte_minimo()
+                self.assertEqual((corte.S, corte.arcos, corte.capacidad), (set(), [], 0))
+                self.assertTrue(corte.consistente())
+                # el par anterior se vuelve a resolver desde cero
+                self.assertEqual(mo.maximo_flujo(0, 2)[0], 3)
+                self.assertEqual(mo.corte_minimo().S, {0, 1})
+
+
+class TestCostoAlFusionar(unittest.TestCase):
+    def test_costo_dado_reemplaza_y_none_conserva(self):
+        mo = FlujoCostoMinimo(3, registro="no")
+        mo.agregar_arco(0, 1, 2, 5); mo.agregar_arco(0, 2, 2, 1); mo.agregar_arco(2, 1, 2, 1)
+        self.assertEqual(mo.flujo_costo_minimo(0, 1)[:2], (4, 14))
+        mo.actualizar_capacidad(2, 1, 2)        # crea el indice (u, v): los siguientes arcos se fusionan
+        mo.agregar_arco(0, 1, 1, 0)
+        self.assertEqual(mo.flujo_costo_minimo(0, 1)[:2], (5, 4))
+        mo.agregar_arco(0, 1, 1)
+        self.assertEqual(mo.flujo_costo_minimo(0, 1)[:2], (6, 4))
+        self.assertEqual(mo.costos[0], 0)
+
+
+class TestModoEntero(unittest.TestCase):
+    C = 2**60 + 1
+
+    def test_descomposicion_exacta(self):
+        mo = crear_motor("dinic", 3, 2)
+        mo.agregar_arco(0, 1, self.C); mo.agregar_arco(1, 2, self.C)
+        _, mapa, _ = mo.maximo_flujo(0, 2)
+        self.assertEqual(descomponer_flujo(mapa, 0, 2), [{"tipo": "camino", "nodos": [0, 1, 2], "flujo": self.C}])
+
+    def test_multiple_exacto(self):
+        mo = crear_motor("dinic", 4, 3)
+        mo.agregar_arco(0, 2, self.C); mo.agregar_arco(1, 2, self.C); mo.agregar_arco(2, 3, 2*self.C + 5)
+        valor, mapa, _ = mo.maximo_flujo_multiple([0, 1], [3])
+        self.assertTrue(mo.grafo.entero)
+        self.assertEqual(valor, 2*self.C)
+        rutas = descomponer_flujo(mapa, {0, 1}, {3})
+        self.assertEqual(sorted(r["flujo"] for r in rutas), [self.C, self.C])
+
+
+def _resolver(nombre, n, arcos, s, t):
+    mo = crear_motor(nombre, n, len(arcos), registro="no")
+    for u, v, c in arcos: mo.agregar_arco(u, v, c)
+    return mo, mo.maximo_flujo(s, t)
+
+
+class TestEdicionEnCaliente(unittest.TestCase):
+    """Cada edicion tras resolver, re-resuelta sobre el flujo anterior, contra una resolucion desde cero."""
+    # 0→1→3 y 0→2→3 con 1→2 de puente; el maximo (6) satura 1→3 y 2→3
+    ARCOS = [(0, 1, 3), (1, 3, 3), (0, 2, 3), (2, 3, 3), (1, 2, 2)]
+
+    def _comparar(self, mo, n, arcos, s=0, t=3):
+        valor, mapa, _ = mo.maximo_flujo(s, t)
+        esperado = _resolver(mo.nombre, n, arcos, s, t)[1][0]
+        self.assertEqual(valor, esperado)
+        cap = {}
+        for u, v, c in arcos: cap[(u, v)] = cap.get((u, v), 0) + c
+        neto = [0]*n
+        for (u, v), f in mapa.items():
+            self.assertLessEqual(f, cap.get((u, v), 0))
+            neto[u] -= f; neto[v] += f
+        self.assertEqual([x for i, x in enumerate(neto) if i not in (s, t)], [0]*(n - 2))
+        self.assertEqual(neto[t], valor)
+        corte = mo.corte_minimo()
+        self.assertEqual(corte.capacidad, valor)
+        self.assertTrue(corte.consistente())
+
+    def _editar(self, cambios):
+        arcos = [(u, v, cambios.get((u, v), c)) for u, v, c in self.ARCOS]
+        return [a for a in arcos if a[2] > 0]
+
+    def test_subir_capacidad(self):
+        for nombre in MOTORES:
+            with self.subTest(motor=nombre):
+                mo, (valor, _, _) = _resolver(nombre, 4, self.ARCOS, 0, 3)
+                self.assertEqual(valor, 6)
+                mo.actualizar_capacidad(0, 1, 5); mo.actualizar_capacidad(1, 3, 6)
+                self._comparar(mo, 4, self._editar({(0, 1): 5, (1, 3): 6}))
+
+    def test_bajar_con_desvio(self):
+        # 1→3 y 1→2→3 compiten por lo que llega a 1: se baja el que mas lleva y el resto se desvia
+        arcos = [(0, 1, 4), (1, 3, 4), (1, 2, 4), (2, 3, 4)]
+        for nombre in MOTORES:
+            with self.subTest(motor=nombre):
+                mo, (valor, mapa, _) = _resolver(nombre, 4, arcos, 0, 3)
+                self.assertEqual(valor, 4)
+                arco = max([(1, 3), (2, 3)], key=lambda a: mapa.get(a, 0))
+                self.assertGreater(mapa[arco], 1)
+                mo.actualizar_capacidad(*arco, 1)
+                # el exceso se desvio sin devolver nada: el flujo sigue siendo maximo
+                self.assertEqual(mo._flujo_saliente(0), 4)
+                self._comparar(mo, 4, [(u, v, 1 if (u, v) == arco else c) for u, v, c in arcos])
+
+    def test_bajar_sin_desvio(self):
+        # 2→3 esta saturado: el exceso de 1→3 vuelve por 1⇝0 y se retira de 3
+        for nombre in MOTORES:
+            with self.subTest(motor=nombre):
+                mo, _ = _resolver(nombre, 4, self.ARCOS, 0, 3)
+                mo.actualizar_capacidad(1, 3, 1)
+                self.assertEqual(mo._flujo_saliente(0), 4)
+                self._comparar(mo, 4, self._editar({(1, 3): 1}))
+
+    def test_eliminar_arco(self):
+        for nombre in MOTORES:
+            with self.subTest(motor=nombre):
+                mo, _ = _resolver(nombre, 4, self.ARCOS, 0, 3)
+                self.assertTrue(mo.eliminar_arco(2, 3))
+                self.assertFalse(mo.eliminar_arco(3, 2))
+                self._comparar(mo, 4, self._editar({(2, 3): 0}))
+
+    def test_nodo_y_arcos_nuevos(self):
+        for nombre in MOTORES:
+            for indice in (False, True):
+                with self.subTest(motor=nombre, indice=indice):
+                    mo, _ = _resolver(nombre, 4, self.ARCOS, 0, 3)
+                    if indice:
+                        mo.actualizar_capacidad(1, 2, 2)     # crea el indice (u, v): 0→1 se fusiona
+                    x = mo.agregar_nodo()
+                    mo.agregar_arco(0, x, 4); mo.agregar_arco(x, 3, 2); mo.agregar_arco(0, 1, 1)
+                    self._comparar(mo, 5, self.ARCOS + [(0, 4, 4), (4, 3, 2), (0, 1, 1)])
+
+
+def _super_manual(nombre, n, arcos, fuentes, sumideros):
+    """Valor de referencia: super-fuente n y super-sumidero n+1 armados a mano (None = suma de los arcos)."""
+    extra = [(n, f, sum(c for u, _, c in arcos if u == f) if tope is None else tope) for f, tope in fuentes.items()]
+    extra += [(d, n + 1, sum(c for _, v, c in arcos if v == d) if tope is None else tope) for d, tope in sumideros.items()]
+    return _resolver(nombre, n + 2, arcos + [a for a in extra if a[2] > 0], n, n + 1)[1][0]
+
+
+class TestMultiple(unittest.TestCase):
+    # fuentes 0 y 1, sumideros 4 y 5
+    ARCOS = [(0, 2, 5), (1, 2, 4), (1, 3, 3), (2, 3, 2), (2, 4, 4), (3, 5, 6), (2, 5, 1)]
+
+    def _comparar(self, mo, fuentes, sumideros, arcos=ARCOS, n=6):
+        valor, mapa, _ = mo.maximo_flujo_multiple(fuentes, sumideros)
+        self.assertEqual(valor, _super_manual(mo.nombre, n, arcos, fuentes, sumideros))
+        self.assertTrue(all(u < n and v < n for u, v in mapa))
+        corte = mo.corte_minimo()
+        self.assertEqual(corte.valor, valor)
+        self.assertTrue(corte.consistente())
+        return corte
+
+    def test_topes_y_sin_tope(self):
+        casos = [({0: 3, 1: None}, {4: 2, 5: None}), ({0: None, 1: None}, {4: None, 5: None}),
+                 ({0: 2, 1: 1}, {4: 10, 5: 1}), ({1: None}, {5: 4})]
+        for nombre in MOTORES:
+            for fuentes, sumideros in casos:
+                with self.subTest(motor=nombre, fuentes=fuentes, sumideros=sumideros):
+                    mo, _ = _resolver(nombre, 6, self.ARCOS, 0, 4)
+                    self._comparar(mo, fuentes, sumideros)
+                    if all(t is None for t in (*fuentes.values(), *sumideros.values())):
+                        # un iterable de nodos equivale a todos sin tope
+                        self.assertEqual(mo.maximo_flujo_multiple(list(fuentes), list(sumideros))[0],
+                                         _super_manual(nombre, 6, self.ARCOS, fuentes, sumideros))
+
+    def test_segunda_llamada_reajusta(self):
+        # el mismo motor va cambiando topes, fuentes y sumideros: solo se reajustan los arcos auxiliares
+        pasos = [({0: 3, 1: None}, {4: 2, 5: None}), ({0: None, 1: 1}, {4: None, 5: 2}),
+                 ({0: 1}, {4: None, 5: None}), ({0: None, 1: None}, {5: 3}), ({0: 3, 1: None}, {4: 2, 5: None})]
+        for nombre in MOTORES:
+            with self.subTest(motor=nombre):
+                mo = _resolver(nombre, 6, self.ARCOS, 0, 4)[0]
+                for fuentes, sumideros in pasos:
+                    self._comparar(mo, fuentes, sumideros)
+                self.assertEqual(mo.n, 8)       # los nodos auxiliares se agregan una sola vez
+                self.assertEqual(mo.corte_minimo().n, 6)
+
+    def test_fuente_sin_tope_del_lado_fuente(self):
+        # 0→2 satura junto con S*→0: sin tope 0 queda en S y se cortan sus arcos reales;
+        # con tope el corte es la oferta de 0
+        arcos = [(0, 2, 5), (2, 4, 10)]
+        for nombre in MOTORES:
+            with self.subTest(motor=nombre):
+                mo = _resolver(nombre, 5, arcos, 0, 4)[0]
+                corte = self._comparar(mo, {0: None}, {4: None}, arcos, 5)
+                self.assertIn(0, corte.S)
+                self.assertNotIn(4, corte.S)
+                self.assertEqual((corte.arcos, corte.topes), ([(0, 2, 5, 5)], []))
+                corte = self._comparar(mo, {0: 3}, {4: None}, arcos, 5)
+                self.assertNotIn(0, corte.S)
+                self.assertEqual((corte.arcos, corte.topes), ([], [("oferta", 0, 3)]))
+
+
+if __name__ == "__main__":
+    unittest.main()